@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Charger les variables d'environnement depuis .env
 load_dotenv()
@@ -68,12 +69,39 @@ TEMPLATES = [
 WSGI_APPLICATION = 'backend_project.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=sqlite (défaut, une seule machine) ou postgres (production)
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'audio_recorder'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Connexions persistantes (secondes), vérifiées avant réutilisation
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            # Derrière PgBouncer en mode transaction, les curseurs serveur ne survivent pas
+            'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_PGBOUNCER', '0') == '1',
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            # Moteur Django + PRAGMA par connexion (voir backend_project/sqlite/base.py)
+            'ENGINE': 'backend_project.sqlite',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+
+# Réglages appliqués à chaque connexion SQLite
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+SQLITE_TRANSACTION_MODE = os.getenv('SQLITE_TRANSACTION_MODE', 'IMMEDIATE')
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -137,16 +165,56 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = DEBUG  # Permettre toutes les origines en développement
 
-# Celery a été supprimé - les tâches sont maintenant synchrones
+# En-têtes du protocole d'upload reprenable (/api/uploads/)
+CORS_ALLOW_HEADERS = list(default_headers) + ['upload-offset', 'upload-length', 'upload-checksum', 'tus-resumable']
+CORS_EXPOSE_HEADERS = ['upload-offset', 'upload-length', 'tus-resumable', 'tus-max-size', 'location']
+
+# Celery a été supprimé - les tâches passent par la file ProcessingJob (manage.py run_workers)
+PROCESSING_QUEUE_MAX_PENDING = int(os.getenv('PROCESSING_QUEUE_MAX_PENDING', '200'))
+PROCESSING_JOB_MAX_ATTEMPTS = int(os.getenv('PROCESSING_JOB_MAX_ATTEMPTS', '3'))
+PROCESSING_RETRY_BACKOFF_SECONDS = int(os.getenv('PROCESSING_RETRY_BACKOFF_SECONDS', '30'))
+
+# Analyse VAD parallèle des longs enregistrements (1 = désactivée)
+# Approchée : les bornes des segments peuvent bouger de quelques trames (voir vad.classify_pcm_file_parallel)
+VAD_PARALLEL_WORKERS = int(os.getenv('VAD_PARALLEL_WORKERS', '1'))
+VAD_PARALLEL_MIN_SECONDS = int(os.getenv('VAD_PARALLEL_MIN_SECONDS', '1800'))
+
+# Cache des décisions VAD (nombre maximal d'entrées, éviction LRU)
+VAD_CACHE_MAX_ENTRIES = int(os.getenv('VAD_CACHE_MAX_ENTRIES', '5000'))
+
+# Uploads reprenables (/api/uploads/) : taille maximale et durée de vie d'un upload inachevé
+UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', str(20 * 1024 ** 3)))
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv('UPLOAD_SESSION_TTL_HOURS', '24'))
+
+# Durée de cache navigateur des pics de forme d'onde (secondes) ; 0 = revalidation
+# systématique par ETag (304), les pics changeant après un trim ou un retraitement
+PEAKS_CACHE_MAX_AGE = int(os.getenv('PEAKS_CACHE_MAX_AGE', '0'))
+
+# Jeton du scraper Prometheus pour /api/metrics (Authorization: Bearer ...) ;
+# sans jeton, l'endpoint n'est servi qu'avec DEBUG
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Envoi des fichiers audio délégué au reverse proxy: '' (Django), 'x-accel' (nginx) ou 'x-sendfile' (Apache)
+# En mode x-accel, MEDIA_OFFLOAD_PREFIX est une location `internal` de nginx pointant sur MEDIA_ROOT
+MEDIA_OFFLOAD = os.getenv('MEDIA_OFFLOAD', '')
+MEDIA_OFFLOAD_PREFIX = os.getenv('MEDIA_OFFLOAD_PREFIX', '/protected-media/')
 
 # Email Configuration (for alerts)
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST', '')
 EMAIL_PORT = int(os.getenv('EMAIL_PORT', '587'))
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv('EMAIL_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_PASS', '')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER or 'noreply@example.com'
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '30'))
+
+# Alertes: envoyées par manage.py send_alerts, regroupées par utilisateur sur une fenêtre (secondes)
+ALERT_DIGEST_WINDOW_SECONDS = int(os.getenv('ALERT_DIGEST_WINDOW_SECONDS', '300'))
+ALERT_MAX_ATTEMPTS = int(os.getenv('ALERT_MAX_ATTEMPTS', '5'))
+ALERT_RETRY_BACKOFF_SECONDS = int(os.getenv('ALERT_RETRY_BACKOFF_SECONDS', '60'))
+ALERT_MAX_SILENCES_LISTED = int(os.getenv('ALERT_MAX_SILENCES_LISTED', '20'))
+ALERT_RETENTION_DAYS = int(os.getenv('ALERT_RETENTION_DAYS', '30'))
 
 # Allowed audio formats for upload
 ALLOWED_AUDIO_FORMATS = ['mp3', 'wav', 'ogg', 'm4a', 'flac', 'webm']
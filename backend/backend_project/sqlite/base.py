@@ -0,0 +1,43 @@
+"""
+Moteur SQLite du profil « une seule machine » (DB_ENGINE=sqlite)
+
+Identique au moteur Django, avec des réglages appliqués à chaque connexion
+pour que les workers de traitement et l'API écrivent en même temps sans
+« database is locked » :
+- journal WAL : les lectures ne bloquent plus les écritures
+- synchronous=NORMAL : un fsync par checkpoint plutôt que par transaction
+- busy_timeout : une écriture attend le verrou au lieu d'échouer
+- BEGIN IMMEDIATE : les transactions (atomic) prennent le verrou d'écriture
+  dès le début. Une transaction différée qui lit puis écrit (update_or_create)
+  échoue sinon immédiatement, sans attendre busy_timeout, si une autre
+  connexion a écrit entre-temps.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+
+JOURNAL_MODES = {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'}
+SYNCHRONOUS_MODES = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+TRANSACTION_MODES = {'DEFERRED', 'IMMEDIATE', 'EXCLUSIVE'}
+
+
+def setting_choice(name, choices):
+    """Valeur d'un réglage SQLITE_* (en majuscules), parmi les valeurs autorisées"""
+    value = getattr(settings, name).upper()
+    if value not in choices:
+        raise ImproperlyConfigured(f"{name} doit valoir {', '.join(sorted(choices))} (reçu: {value})")
+    return value
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        conn.execute(f"PRAGMA journal_mode = {setting_choice('SQLITE_JOURNAL_MODE', JOURNAL_MODES)}")
+        conn.execute(f"PRAGMA synchronous = {setting_choice('SQLITE_SYNCHRONOUS', SYNCHRONOUS_MODES)}")
+        conn.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f"BEGIN {setting_choice('SQLITE_TRANSACTION_MODE', TRANSACTION_MODES)}")
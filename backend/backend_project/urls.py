@@ -2,9 +2,9 @@
 URL configuration for backend_project project.
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+from recordings.media import serve_media
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 urlpatterns = [
@@ -16,6 +16,8 @@ urlpatterns = [
     path('api/', include('recordings.urls')),
 ]
 
-# Servir les fichiers médias en développement
+# Servir les fichiers médias en développement (avec support Range pour le lecteur)
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media),
+    ]
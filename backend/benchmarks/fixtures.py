@@ -0,0 +1,38 @@
+"""
+Fixtures audio synthétiques pour les benchmarks (NumPy, sans réseau)
+
+Le générateur est partagé avec les tests (recordings/tests/audio.py). Le
+fichier est écrit segment par segment : la mémoire utilisée ne dépend pas de
+la durée (8 h = 920 Mo de WAV). Les fixtures sont mises en cache par durée,
+graine et version.
+"""
+import os
+from recordings.tests.audio import SAMPLE_RATE, generate_speech_wav  # noqa: F401 (SAMPLE_RATE : run.py)
+
+
+FIXTURE_VERSION = 1
+
+# Durées proposées par le runner (secondes)
+SIZES = {
+    '1m': 60,
+    '1h': 3600,
+    '8h': 8 * 3600,
+}
+
+
+def fixture_path(directory, label, seed=0):
+    """Chemin de la fixture d'une durée (la version invalide les anciens fichiers)"""
+    return os.path.join(directory, f"speech-{label}-v{FIXTURE_VERSION}-s{seed}.wav")
+
+
+def ensure_fixture(directory, label, seed=0):
+    """Génère la fixture si elle n'existe pas encore ; retourne son chemin"""
+    path = fixture_path(directory, label, seed)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        generate_speech_wav(tmp_path, SIZES[label], seed=seed)
+        os.replace(tmp_path, path)
+    return path
+
+
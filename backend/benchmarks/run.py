@@ -0,0 +1,342 @@
+"""
+Benchmarks du pipeline de traitement audio
+
+Mesure les étapes du traitement sur des fixtures synthétiques (voir
+fixtures.py) ainsi que les endpoints les plus sollicités, puis écrit les
+résultats en JSON pour comparer deux commits.
+
+Usage (depuis backend/):
+    python -m benchmarks.run --sizes 1m,1h --output bench.json
+    python -m benchmarks.run --output new.json --compare bench.json --threshold 0.15
+
+Les benchmarks utilisent une base SQLite et un MEDIA_ROOT temporaires : la
+base configurée (DB_ENGINE, DB_NAME) n'est jamais modifiée. Avec --compare,
+le code de sortie vaut 1 si la médiane d'un benchmark dépasse celle de la
+référence de plus de --threshold (0.2 = +20 %).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from . import fixtures
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, 'fixtures')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline de traitement audio")
+    parser.add_argument('--sizes', default='1m,1h',
+                        help=f"Durées des fixtures audio ({', '.join(fixtures.SIZES)})")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Nombre de mesures par benchmark (médiane et minimum rapportés)")
+    parser.add_argument('--only', default='',
+                        help="Ne lance que les benchmarks dont le nom contient ce texte")
+    parser.add_argument('--recordings', type=int, default=5000,
+                        help="Nombre d'enregistrements en base pour les benchmarks d'API")
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR,
+                        help="Dossier des fixtures générées (réutilisées d'une exécution à l'autre)")
+    parser.add_argument('--output', help="Fichier JSON de résultats")
+    parser.add_argument('--compare', help="Fichier JSON de référence (exécution précédente)")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Ralentissement toléré par rapport à la référence (0.2 = +20 %%)")
+    args = parser.parse_args(argv)
+    args.sizes = [size for size in args.sizes.split(',') if size]
+    unknown = [size for size in args.sizes if size not in fixtures.SIZES]
+    if unknown:
+        parser.error(f"Durée inconnue: {', '.join(unknown)}")
+    return args
+
+
+def setup_django(work_dir):
+    """Initialise Django sur une base SQLite temporaire (avant tout import de modèle)"""
+    os.environ['DB_ENGINE'] = 'sqlite'
+    os.environ['DB_NAME'] = os.path.join(work_dir, 'bench.sqlite3')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_project.settings')
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def measure(fn, repeat, setup=None, number=1):
+    """
+    Chronomètre fn (horloge monotone haute résolution) repeat fois
+    setup() prépare chaque mesure hors chronomètre ; son résultat est passé à fn
+    number: appels par mesure, pour les opérations très courtes
+    """
+    timings = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(state)
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'runs': repeat,
+        'number': number,
+    }
+
+
+class Suite:
+    """Benchmarks exécutés sur une base et un MEDIA_ROOT temporaires"""
+
+    def __init__(self, args, work_dir):
+        self.args = args
+        self.work_dir = work_dir
+        self.media_root = os.path.join(work_dir, 'media')
+        self.results = {}
+
+    def selected(self, name):
+        return self.args.only in name
+
+    def run(self, name, fn, setup=None, number=1, audio_seconds=None):
+        if not self.selected(name):
+            return
+        print(f"→ {name}", flush=True)
+        result = measure(fn, self.args.repeat, setup, number)
+        if audio_seconds:
+            result['audio_seconds'] = audio_seconds
+            result['x_realtime'] = audio_seconds / result['median'] if result['median'] else None
+        self.results[name] = result
+        print(f"  médiane {format_seconds(result['median'])}, min {format_seconds(result['min'])}", flush=True)
+
+    def run_all(self):
+        from django.contrib.auth.models import User
+        from django.test.utils import override_settings
+
+        with override_settings(
+            MEDIA_ROOT=self.media_root,
+            # Comme en production : pas de journal des requêtes SQL
+            DEBUG=False,
+            SECURE_SSL_REDIRECT=False,
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        ):
+            self.user = User.objects.create_user('bench', 'bench@example.com')
+            for label in self.args.sizes:
+                path = fixtures.ensure_fixture(self.args.fixtures_dir, label)
+                self.audio_benchmarks(label, path, fixtures.SIZES[label])
+            self.api_benchmarks()
+        return self.results
+
+    def new_recording(self, source_path, **fields):
+        """Copie la fixture dans MEDIA_ROOT et crée l'enregistrement correspondant"""
+        from recordings.models import Recording
+        name = f"recordings/bench_{time.monotonic_ns()}.wav"
+        destination = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(source_path, destination)
+        return Recording.objects.create(
+            user=self.user, title='bench', file=name, format='wav',
+            codec='pcm_s16le', sample_rate=fixtures.SAMPLE_RATE, channels=1, **fields
+        )
+
+    def audio_benchmarks(self, label, path, seconds):
+        from recordings import tasks
+        from recordings.models import VadCache
+
+        # Décodage ffmpeg en flux + VAD (chemin utilisé par process_recording)
+        self.run(
+            f'analyze_audio_file[{label}]',
+            lambda _: tasks.analyze_audio_file(path),
+            audio_seconds=seconds,
+        )
+
+        report = tasks.analyze_audio_file(path)['report']
+        self.run(
+            f'detect_unnatural_silences[{label}]',
+            lambda _: tasks.detect_unnatural_silences(report),
+            number=100,
+        )
+
+        def fresh_recording():
+            # Sans cache VAD : le traitement complet est mesuré
+            VadCache.objects.all().delete()
+            return self.new_recording(path)
+
+        self.run(
+            f'process_recording[{label}]',
+            lambda recording: tasks.process_recording(recording.id),
+            setup=fresh_recording,
+            audio_seconds=seconds,
+        )
+
+        def processed_recording():
+            recording = self.new_recording(path, duration_seconds=seconds)
+            tasks.save_analysis(recording, report, ['duration_seconds'])
+            return recording
+
+        self.run(
+            f'trim_recording_task[{label}]',
+            lambda recording: tasks.trim_recording_task(recording.id, seconds * 0.1, seconds * 0.9),
+            setup=processed_recording,
+        )
+
+    def api_benchmarks(self):
+        from django.test import Client, RequestFactory
+        from rest_framework.request import Request
+        from rest_framework_simplejwt.tokens import AccessToken
+        from recordings.models import Recording
+        from recordings.serializers import RecordingListSerializer
+        from recordings.stats import rebuild_daily_stats
+
+        if not any(self.selected(name) for name in ('stats_endpoint', 'list_endpoint', 'list_serialization')):
+            return
+        populate_recordings(self.user, self.args.recordings)
+        rebuild_daily_stats(self.user.id)
+
+        client = Client(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.user)))
+
+        def get(url):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url}: HTTP {response.status_code}")
+            return response
+
+        # Premier appel hors mesure (imports, compilation des URL)
+        get('/api/recordings/stats/')
+        self.run('stats_endpoint', lambda _: get('/api/recordings/stats/'), number=20)
+        self.run('stats_endpoint[bucket=day]', lambda _: get('/api/recordings/stats/?bucket=day'), number=20)
+        self.run('list_endpoint', lambda _: get('/api/recordings/'), number=20)
+
+        request = Request(RequestFactory().get('/api/recordings/'))
+        page = list(Recording.objects.filter(user=self.user).select_related('user').defer('vad_report', 'vad_state')[:100])
+        self.run(
+            'list_serialization[100]',
+            lambda _: RecordingListSerializer(page, many=True, context={'request': request}).data,
+            number=20,
+        )
+
+
+def populate_recordings(user, count):
+    """Enregistrements traités factices (bulk_create, sans fichier ni signal)"""
+    from datetime import timedelta
+    from django.utils import timezone as django_timezone
+    from recordings.models import Recording
+
+    types = [choice for choice, _ in Recording.TYPE_CHOICES]
+    now = django_timezone.now()
+    recordings = [
+        Recording(
+            user=user,
+            title=f'bench {i}',
+            type=types[i % len(types)],
+            file=f'recordings/bench_{i}.wav',
+            format='wav',
+            duration_seconds=3600.0,
+            silence_percentage=12.5,
+            total_silence_seconds=450.0,
+            unnatural_silence_count=i % 3,
+            flagged=i % 3 > 0,
+            vad_report={'total_duration': 3600.0, 'silence_percentage': 12.5, 'total_silence_seconds': 450.0},
+        )
+        for i in range(count)
+    ]
+    created = Recording.objects.bulk_create(recordings, batch_size=1000)
+    # Répartit les enregistrements sur 90 jours (created_at est auto_now_add)
+    for i, recording in enumerate(created):
+        recording.created_at = now - timedelta(hours=i * 90 * 24 / max(count, 1))
+    Recording.objects.bulk_update(created, ['created_at'], batch_size=1000)
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def environment():
+    """Contexte de la mesure (commit, machine, versions)"""
+    import numpy as np
+
+    def command_output(command):
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, cwd=BENCHMARKS_DIR, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return output.stdout.strip().splitlines()[0] if output.returncode == 0 and output.stdout.strip() else None
+
+    return {
+        'commit': command_output(['git', 'rev-parse', '--short', 'HEAD']),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'ffmpeg': command_output(['ffmpeg', '-version']),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare les médianes à celles de la référence
+    Retourne la liste des benchmarks en régression
+    """
+    regressions = []
+    print(f"\n{'benchmark':<40} {'référence':>12} {'actuel':>12} {'écart':>8}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<40} {'-':>12} {format_seconds(result['median']):>12} {'nouveau':>8}")
+            continue
+        change = result['median'] / previous['median'] - 1 if previous['median'] else 0.0
+        marker = ''
+        if change > threshold:
+            regressions.append(name)
+            marker = '  ✗ régression'
+        print(
+            f"{name:<40} {format_seconds(previous['median']):>12} "
+            f"{format_seconds(result['median']):>12} {change:>+8.1%}{marker}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    work_dir = tempfile.mkdtemp(prefix='bench-')
+    try:
+        setup_django(work_dir)
+        results = Suite(args, work_dir).run_all()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = {
+        'environment': environment(),
+        'settings': {'sizes': args.sizes, 'repeat': args.repeat, 'recordings': args.recordings},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+        print(f"\nRésultats écrits dans {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline.get('results', {}), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Alertes email (blancs non naturels) : boîte d'envoi et envoi groupé
+
+- enqueue_alert() est appelé par le traitement : une simple insertion, aucun
+  accès SMTP (une panne du serveur mail ne ralentit plus les jobs VAD)
+- deliver_alerts() (manage.py send_alerts) regroupe les alertes en attente
+  d'un utilisateur en un seul email récapitulatif, une fois la fenêtre
+  ALERT_DIGEST_WINDOW_SECONDS écoulée depuis la plus ancienne, et ouvre une
+  seule connexion par serveur SMTP (get_connection + send_messages)
+- En cas d'échec, l'alerte est replanifiée avec un backoff exponentiel
+  jusqu'à ALERT_MAX_ATTEMPTS tentatives
+"""
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Min
+from django.utils import timezone
+from .models import Alert, UserSettings
+from .workers import worker_process_alive
+import socket
+
+
+def smtp_config(user):
+    """
+    Serveur SMTP utilisé pour les alertes d'un utilisateur : ses propres
+    paramètres, à défaut la configuration globale
+    Retourne None si les alertes sont désactivées
+    """
+    try:
+        user_settings = user.user_settings
+    except UserSettings.DoesNotExist:
+        user_settings = None
+
+    if user_settings is None:
+        config = {
+            'host': settings.EMAIL_HOST,
+            'port': settings.EMAIL_PORT,
+            'username': settings.EMAIL_HOST_USER,
+            'password': settings.EMAIL_HOST_PASSWORD,
+        }
+    elif user_settings.email_alerts_enabled:
+        config = {
+            'host': user_settings.email_host or settings.EMAIL_HOST,
+            'port': user_settings.email_port or settings.EMAIL_PORT,
+            'username': user_settings.email_user or settings.EMAIL_HOST_USER,
+            'password': user_settings.email_password or settings.EMAIL_HOST_PASSWORD,
+        }
+    else:
+        return None
+
+    if not config['host']:
+        return None
+    return config
+
+
+def enqueue_alert(recording, unnatural_silences, replace_pending=False):
+    """
+    Ajoute une alerte dans la boîte d'envoi si l'utilisateur les a activées
+
+    replace_pending: unnatural_silences est la liste complète des blancs de
+    l'enregistrement (nouveau traitement) : les alertes encore en attente
+    pour cet enregistrement sont supprimées, elles ne sont pas listées deux
+    fois. Avec une liste vide, elles sont seulement supprimées.
+    """
+    if replace_pending:
+        Alert.objects.filter(recording=recording, status='pending').delete()
+    if not unnatural_silences:
+        return None
+
+    user = recording.user
+    if smtp_config(user) is None:
+        print(f"Alertes email désactivées pour l'enregistrement {recording.id}")
+        return None
+    if not user.email:
+        print(f"Pas d'email pour l'utilisateur {user.username}")
+        return None
+
+    return Alert.objects.create(
+        user=user,
+        recording=recording,
+        recording_title=recording.title or '',
+        recording_type=recording.type,
+        recording_created_at=recording.created_at,
+        silences=unnatural_silences,
+    )
+
+
+def format_time(seconds):
+    """Position dans l'enregistrement au format H:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def build_digest(user, alerts, from_email):
+    """
+    Email récapitulatif des alertes d'un utilisateur (regroupées par enregistrement)
+    Un blanc signalé par plusieurs alertes (silence en cours d'une capture
+    puis clos) n'est listé qu'une fois, avec sa version la plus récente
+    """
+    by_recording = {}
+    for alert in alerts:
+        key = alert.recording_id or f"alert-{alert.id}"
+        if key not in by_recording:
+            by_recording[key] = (alert, {})
+        for silence in alert.silences:
+            by_recording[key][1][round(silence['start'], 3)] = silence
+
+    if len(by_recording) == 1:
+        first = next(iter(by_recording.values()))[0]
+        subject = f'Alerte: Blancs détectés dans {first.recording_title or "enregistrement"}'
+    else:
+        subject = f'Alerte: Blancs détectés dans {len(by_recording)} enregistrements'
+
+    lines = ["Des blancs non naturels ont été détectés:", ""]
+    max_listed = settings.ALERT_MAX_SILENCES_LISTED
+    for alert, silences in by_recording.values():
+        silences = sorted(silences.values(), key=lambda silence: silence['start'])
+        lines.append(f"Titre: {alert.recording_title or 'Sans titre'}")
+        lines.append(f"Type: {alert.recording_type}")
+        lines.append(f"Date: {alert.recording_created_at}")
+        lines.append(f"Blancs détectés ({len(silences)}):")
+        for silence in silences[:max_listed]:
+            lines.append(
+                f"  - {format_time(silence['start'])} → {format_time(silence['end'])} "
+                f"({silence['duration']:.1f} s) {silence.get('reason', '')}".rstrip()
+            )
+        if len(silences) > max_listed:
+            lines.append(f"  ... et {len(silences) - max_listed} autres")
+        lines.append("")
+
+    return EmailMessage(subject, "\n".join(lines), from_email, [user.email])
+
+
+def claim_alerts(worker_name, now, max_users):
+    """
+    Réserve les alertes prêtes à partir, regroupées par utilisateur
+    Un utilisateur est prêt quand sa plus ancienne alerte en attente a
+    dépassé la fenêtre de regroupement
+    Retourne {user_id: [Alert]}
+    """
+    window = timedelta(seconds=settings.ALERT_DIGEST_WINDOW_SECONDS)
+    ready = Alert.objects.filter(status='pending', next_attempt_at__lte=now)
+    user_ids = list(
+        ready.values('user_id')
+        .annotate(oldest=Min('created_at'))
+        .filter(oldest__lte=now - window)
+        .order_by('oldest')
+        .values_list('user_id', flat=True)[:max_users]
+    )
+    if not user_ids:
+        return {}
+
+    ids = list(ready.filter(user_id__in=user_ids).values_list('id', flat=True))
+    # UPDATE conditionnel: une alerte n'est prise que par un seul worker
+    Alert.objects.filter(id__in=ids, status='pending').update(
+        status='sending',
+        worker=worker_name,
+        attempts=F('attempts') + 1,
+    )
+    claimed = (
+        Alert.objects.filter(id__in=ids, status='sending', worker=worker_name)
+        .select_related('user', 'user__user_settings')
+        .order_by('created_at')
+    )
+    by_user = defaultdict(list)
+    for alert in claimed:
+        by_user[alert.user_id].append(alert)
+    return by_user
+
+
+def mark_sent(alerts, now):
+    Alert.objects.filter(id__in=[alert.id for alert in alerts]).update(
+        status='sent', sent_at=now, last_error='', worker=''
+    )
+
+
+def mark_failed(alerts, error, now, retry=True):
+    """
+    Enregistre l'échec d'envoi et replanifie les alertes avec un backoff
+    exponentiel tant que ALERT_MAX_ATTEMPTS n'est pas atteint
+    Retourne (replanifiées, abandonnées)
+    """
+    for alert in alerts:
+        alert.last_error = str(error)
+        alert.worker = ''
+        if retry and alert.attempts < settings.ALERT_MAX_ATTEMPTS:
+            alert.status = 'pending'
+            delay = settings.ALERT_RETRY_BACKOFF_SECONDS * (2 ** (alert.attempts - 1))
+            alert.next_attempt_at = now + timedelta(seconds=delay)
+        else:
+            alert.status = 'failed'
+    Alert.objects.bulk_update(alerts, ['status', 'next_attempt_at', 'last_error', 'worker'])
+    retried = sum(alert.status == 'pending' for alert in alerts)
+    return retried, len(alerts) - retried
+
+
+def deliver_alerts(worker_name, now=None, max_users=200):
+    """
+    Envoie les emails récapitulatifs prêts
+
+    Returns:
+        dict: emails (envoyés), alerts (envoyées), retried, failed
+    """
+    now = now or timezone.now()
+    stats = {'emails': 0, 'alerts': 0, 'retried': 0, 'failed': 0}
+    by_user = claim_alerts(worker_name, now, max_users)
+
+    # Regroupement par serveur SMTP: une connexion pour tous ses destinataires
+    by_server = defaultdict(list)
+    for alerts in by_user.values():
+        user = alerts[0].user
+        config = smtp_config(user)
+        if config is None or not user.email:
+            _count_failures(stats, mark_failed(alerts, "Alertes désactivées ou utilisateur sans email", now, retry=False))
+            continue
+        key = (config['host'], config['port'], config['username'], config['password'])
+        from_email = config['username'] or settings.DEFAULT_FROM_EMAIL
+        by_server[key].append((build_digest(user, alerts, from_email), alerts))
+
+    for (host, port, username, password), batch in by_server.items():
+        connection = get_connection(
+            host=host, port=port, username=username, password=password,
+            timeout=settings.EMAIL_TIMEOUT, fail_silently=False,
+        )
+        try:
+            connection.open()
+        except OSError as e:
+            print(f"Serveur SMTP {host}:{port} injoignable: {str(e)}")
+            for _, alerts in batch:
+                _count_failures(stats, mark_failed(alerts, e, now))
+            continue
+
+        try:
+            for message, alerts in batch:
+                try:
+                    # La connexion étant déjà ouverte, send_messages ne la referme pas
+                    connection.send_messages([message])
+                except Exception as e:
+                    print(f"Erreur lors de l'envoi de l'email à {message.to[0]}: {str(e)}")
+                    _count_failures(stats, mark_failed(alerts, e, now))
+                    # Session SMTP possiblement dans un état incohérent: on repart d'une connexion neuve
+                    connection.close()
+                    connection.open()
+                    continue
+                mark_sent(alerts, now)
+                stats['emails'] += 1
+                stats['alerts'] += len(alerts)
+        except OSError as e:
+            # Reconnexion impossible: les emails restants seront retentés
+            print(f"Serveur SMTP {host}:{port} injoignable: {str(e)}")
+        finally:
+            connection.close()
+
+    # Alertes réservées mais non traitées (reconnexion impossible)
+    leftover = list(Alert.objects.filter(status='sending', worker=worker_name))
+    if leftover:
+        _count_failures(stats, mark_failed(leftover, "Connexion SMTP perdue", now))
+
+    return stats
+
+
+def _count_failures(stats, counts):
+    retried, failed = counts
+    stats['retried'] += retried
+    stats['failed'] += failed
+
+
+def requeue_stale_alerts(hostname=None):
+    """
+    Remet en attente les alertes 'sending' laissées par un worker arrêté
+    brutalement sur cet hôte (processus hôte:pid disparu)
+    """
+    hostname = hostname or socket.gethostname()
+    workers = Alert.objects.filter(
+        status='sending', worker__startswith=f"{hostname}:"
+    ).values_list('worker', flat=True).distinct()
+    stale = [worker for worker in workers if not worker_process_alive(worker)]
+    if not stale:
+        return 0
+    return Alert.objects.filter(
+        status='sending', worker__in=stale
+    ).update(status='pending', worker='', next_attempt_at=timezone.now())
+
+
+def purge_old_alerts():
+    """Supprime les alertes envoyées ou abandonnées depuis plus de ALERT_RETENTION_DAYS jours"""
+    cutoff = timezone.now() - timedelta(days=settings.ALERT_RETENTION_DAYS)
+    deleted, _ = Alert.objects.filter(status__in=['sent', 'failed'], created_at__lt=cutoff).delete()
+    return deleted
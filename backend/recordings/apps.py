@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class RecordingsConfig(AppConfig):
     name = 'recordings'
+
+    def ready(self):
+        # Mise à jour des statistiques journalières (RecordingDailyStats)
+        from . import signals  # noqa: F401
@@ -0,0 +1,166 @@
+"""
+File d'attente des traitements, persistée en base (modèle ProcessingJob)
+Les vues enfilent des jobs, `manage.py run_workers` les exécute dans un pool de processus.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .models import ProcessingJob
+from .tasks import process_recording, split_recording, trim_recording_task
+from .workers import worker_process_alive
+import socket
+import os
+
+
+# Fonctions exécutées pour chaque type de job: handler(recording_id, **payload)
+JOB_HANDLERS = {
+    'process': process_recording,
+    'trim': trim_recording_task,
+    'split': split_recording,
+}
+
+
+class QueueFull(Exception):
+    """La file d'attente a atteint PROCESSING_QUEUE_MAX_PENDING jobs en attente"""
+
+
+def default_worker_name():
+    """Identifiant du worker courant (hôte:pid)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def pending_jobs_count():
+    """Nombre de jobs en attente ou en cours"""
+    return ProcessingJob.objects.filter(status__in=['pending', 'running']).count()
+
+
+def queue_is_full():
+    """Vérifie si la file d'attente a atteint sa capacité maximale"""
+    return pending_jobs_count() >= settings.PROCESSING_QUEUE_MAX_PENDING
+
+
+def enqueue_job(recording, kind='process', payload=None, force=False):
+    """
+    Ajoute un job dans la file d'attente
+
+    Args:
+        recording: Enregistrement concerné
+        kind: Type de job ('process', 'trim', 'split')
+        payload: Arguments passés à la tâche
+        force: Ignore la limite de la file (job déjà accepté par l'API)
+
+    Raises:
+        QueueFull: si la file est pleine et force=False
+    """
+    if kind == 'process':
+        # Un seul traitement en attente par enregistrement
+        existing = ProcessingJob.objects.filter(
+            recording=recording, kind='process', status='pending'
+        ).first()
+        if existing:
+            return existing
+
+    if not force and queue_is_full():
+        raise QueueFull(f"{settings.PROCESSING_QUEUE_MAX_PENDING} jobs déjà en attente")
+
+    return ProcessingJob.objects.create(
+        recording=recording,
+        kind=kind,
+        payload=payload or {},
+        max_attempts=settings.PROCESSING_JOB_MAX_ATTEMPTS,
+    )
+
+
+def claim_next_job(worker_name):
+    """
+    Réserve le prochain job prêt à démarrer (FIFO)
+    Les enregistrements ayant déjà un job en cours sont ignorés : deux jobs
+    ne traitent jamais le même enregistrement en même temps
+    Retourne None si aucun job n'est disponible
+    """
+    now = timezone.now()
+    busy = ProcessingJob.objects.filter(status='running').values('recording_id')
+    candidates = ProcessingJob.objects.filter(
+        status='pending', run_after__lte=now
+    ).exclude(recording_id__in=busy).order_by('run_after', 'id').values_list('id', flat=True)[:10]
+
+    for job_id in candidates:
+        # UPDATE conditionnel: un seul worker peut passer le job en 'running',
+        # et seulement si aucun autre job n'a démarré sur l'enregistrement entre-temps
+        claimed = ProcessingJob.objects.filter(id=job_id, status='pending').exclude(
+            recording_id__in=busy
+        ).update(
+            status='running',
+            worker=worker_name,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return ProcessingJob.objects.get(id=job_id)
+    return None
+
+
+def complete_job(job):
+    """Marque un job comme terminé"""
+    ProcessingJob.objects.filter(id=job.id).update(
+        status='done',
+        finished_at=timezone.now(),
+        last_error='',
+    )
+
+
+def fail_job(job, error):
+    """
+    Enregistre l'échec d'un job et le replanifie avec un backoff exponentiel
+    tant que max_attempts n'est pas atteint
+    """
+    job.refresh_from_db()
+    now = timezone.now()
+    if job.attempts < job.max_attempts:
+        delay = settings.PROCESSING_RETRY_BACKOFF_SECONDS * (2 ** (job.attempts - 1))
+        ProcessingJob.objects.filter(id=job.id).update(
+            status='pending',
+            run_after=now + timedelta(seconds=delay),
+            last_error=str(error),
+            worker='',
+        )
+        return 'pending'
+
+    ProcessingJob.objects.filter(id=job.id).update(
+        status='failed',
+        finished_at=now,
+        last_error=str(error),
+    )
+    return 'failed'
+
+
+def requeue_stale_jobs(hostname=None):
+    """
+    Remet en attente les jobs 'running' laissés par un worker arrêté brutalement
+    sur cet hôte (redémarrage, crash)
+    Seuls les jobs dont le processus worker (hôte:pid) n'existe plus sont
+    concernés : ceux des autres workers actifs sur le même hôte sont conservés
+    """
+    hostname = hostname or socket.gethostname()
+    workers = ProcessingJob.objects.filter(
+        status='running', worker__startswith=f"{hostname}:"
+    ).values_list('worker', flat=True).distinct()
+    stale = [worker for worker in workers if not worker_process_alive(worker)]
+    if not stale:
+        return 0
+    return ProcessingJob.objects.filter(
+        status='running', worker__in=stale
+    ).update(status='pending', worker='', run_after=timezone.now())
+
+
+def run_job(job_id):
+    """
+    Exécute un job (appelé dans un processus du pool)
+    Les exceptions remontent au dispatcher qui gère les retries
+    """
+    job = ProcessingJob.objects.get(id=job_id)
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        raise ValueError(f"Type de job inconnu: {job.kind}")
+    handler(job.recording_id, **job.payload)
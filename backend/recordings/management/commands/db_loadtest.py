@@ -0,0 +1,121 @@
+"""
+Mesure la concurrence d'écriture supportée par la base configurée
+
+Chaque thread (une connexion) simule un worker de traitement : création d'un
+enregistrement, sauvegarde du rapport VAD (save_analysis), lecture de la liste.
+À lancer avec chaque profil pour comparer (DB_ENGINE, SQLITE_JOURNAL_MODE...).
+
+Usage: python manage.py db_loadtest [--threads 1,4,8,16] [--duration 10]
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from recordings.models import Recording
+from recordings.tasks import save_analysis
+import time
+
+
+LOADTEST_USERNAME = '__db_loadtest__'
+
+
+def fake_vad_report(segments=200):
+    """Rapport VAD de taille réaliste (un objet par segment)"""
+    return {
+        'total_duration': segments * 10.0,
+        'silence_percentage': 12.5,
+        'total_silence_seconds': segments * 1.25,
+        'voice_segments': [{'start': i * 10.0, 'end': i * 10.0 + 8.75} for i in range(segments)],
+        'silence_segments': [{'start': i * 10.0 + 8.75, 'end': (i + 1) * 10.0} for i in range(segments)],
+    }
+
+
+class Command(BaseCommand):
+    help = "Test de charge des écritures concurrentes sur la base de données"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', default='1,4,8,16',
+                            help="Niveaux de concurrence testés (liste séparée par des virgules)")
+        parser.add_argument('--duration', type=float, default=10.0,
+                            help="Durée de chaque palier (secondes)")
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options['threads'].split(',') if level]
+        db = connection.settings_dict
+        self.stdout.write(f"Base: {connection.vendor} ({db['NAME']})")
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                modes = []
+                for pragma in ('journal_mode', 'synchronous', 'busy_timeout'):
+                    cursor.execute(f'PRAGMA {pragma}')
+                    modes.append(f"{pragma}={cursor.fetchone()[0]}")
+            self.stdout.write(', '.join(modes))
+
+        user, _ = User.objects.get_or_create(username=LOADTEST_USERNAME)
+        report = fake_vad_report()
+        try:
+            self.stdout.write(f"{'threads':>8} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'erreurs':>8}")
+            for threads in levels:
+                result = self.run_level(user, threads, options['duration'], report)
+                self.stdout.write(
+                    f"{threads:>8} {result['ops_per_second']:>8.1f} {result['p50']:>8.1f} "
+                    f"{result['p95']:>8.1f} {result['max']:>8.1f} {result['errors']:>8}"
+                )
+                # Erreurs du palier, regroupées par message
+                for message, count in result['error_messages'].most_common():
+                    self.stderr.write(f"{threads:>8} threads: {count} x {message}")
+        finally:
+            # Supprime l'utilisateur de test et ses enregistrements (cascade)
+            user.delete()
+
+    def run_level(self, user, threads, duration, report):
+        """Exécute un palier de charge et agrège les latences de tous les threads"""
+        deadline = time.monotonic() + duration
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(lambda _: self.writer(user, deadline, report), range(threads)))
+
+        latencies = sorted(latency for thread_latencies, _ in results for latency in thread_latencies)
+        error_messages = Counter()
+        for _, thread_errors in results:
+            error_messages.update(thread_errors)
+        errors = sum(error_messages.values())
+        if not latencies:
+            return {
+                'ops_per_second': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0,
+                'errors': errors, 'error_messages': error_messages,
+            }
+        return {
+            'ops_per_second': len(latencies) / duration,
+            'p50': latencies[len(latencies) // 2] * 1000,
+            'p95': latencies[int(len(latencies) * 0.95)] * 1000,
+            'max': latencies[-1] * 1000,
+            'errors': errors,
+            'error_messages': error_messages,
+        }
+
+    def writer(self, user, deadline, report):
+        """
+        Boucle d'un thread : une opération = création + sauvegarde du rapport
+        (comme process_recording) + lecture d'une page de la liste
+        Retourne (latences en secondes, Counter des erreurs par message, par ex.
+        « database is locked ») ; les erreurs sont affichées par handle(), pas
+        depuis les threads
+        """
+        latencies = []
+        errors = Counter()
+        try:
+            while time.monotonic() < deadline:
+                start = time.monotonic()
+                try:
+                    recording = Recording.objects.create(user=user, title='loadtest', file='loadtest.wav')
+                    recording.duration_seconds = report['total_duration']
+                    save_analysis(recording, report, ['duration_seconds'])
+                    list(Recording.objects.filter(user=user).defer('vad_report').order_by('-created_at')[:20])
+                except OperationalError as e:
+                    errors[str(e)] += 1
+                    continue
+                latencies.append(time.monotonic() - start)
+        finally:
+            connection.close()
+        return latencies, errors
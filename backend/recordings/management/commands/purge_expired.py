@@ -0,0 +1,48 @@
+"""
+Supprime les enregistrements dont la date de rétention est dépassée
+et les uploads reprenables abandonnés (session expirée), ainsi que les
+alertes envoyées depuis plus de ALERT_RETENTION_DAYS jours
+
+Usage: python manage.py purge_expired [--batch-size 500] [--workers 8] [--dry-run]
+"""
+from django.core.management.base import BaseCommand
+from recordings.alerts import purge_old_alerts
+from recordings.tasks import purge_expired
+from recordings.uploads import purge_stale_uploads
+import time
+
+
+class Command(BaseCommand):
+    help = "Supprime les enregistrements expirés (retained_until dépassé) et leurs fichiers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help="Nombre d'enregistrements supprimés par requête")
+        parser.add_argument('--workers', type=int, default=8,
+                            help="Nombre de threads de suppression des fichiers")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Affiche ce qui serait supprimé sans rien supprimer")
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        result = purge_expired(
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            dry_run=options['dry_run'],
+        )
+
+        prefix = "[dry-run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{result['recordings']} enregistrements, {result['files']} fichiers, "
+            f"{result['bytes_freed'] / (1024 * 1024):.1f} Mo libérés en {time.monotonic() - start:.2f}s"
+        ))
+        if result['errors']:
+            self.stderr.write(f"{result['errors']} fichiers n'ont pas pu être supprimés")
+
+        if not options['dry_run']:
+            stale = purge_stale_uploads()
+            if stale:
+                self.stdout.write(f"{stale} uploads inachevés supprimés")
+            alerts = purge_old_alerts()
+            if alerts:
+                self.stdout.write(f"{alerts} alertes anciennes supprimées")
@@ -0,0 +1,26 @@
+"""
+Reconstruit la table des statistiques journalières à partir des enregistrements
+
+Usage: python manage.py rebuild_stats [--user alice]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from recordings.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Reconstruit RecordingDailyStats (après import ou modification en masse)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Nom d'utilisateur (défaut: tous les utilisateurs)")
+
+    def handle(self, *args, **options):
+        user_id = None
+        if options['user']:
+            user = get_user_model().objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Utilisateur introuvable: {options['user']}")
+            user_id = user.id
+
+        count = rebuild_daily_stats(user_id)
+        self.stdout.write(self.style.SUCCESS(f"{count} lignes de statistiques journalières reconstruites"))
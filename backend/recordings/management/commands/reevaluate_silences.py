@@ -0,0 +1,44 @@
+"""
+Recalcule les silences anormaux à partir des segments VAD déjà stockés
+
+Usage: python manage.py reevaluate_silences [--user alice] [--threshold 3.0]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from recordings.tasks import reevaluate_silences
+import time
+
+
+class Command(BaseCommand):
+    help = "Recalcule flagged / unnatural_silences sans décoder l'audio"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Nom d'utilisateur (défaut: tous les utilisateurs)")
+        parser.add_argument('--threshold', type=float,
+                            help="Seuil en secondes (défaut: silence_threshold_seconds de chaque utilisateur)")
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Nombre de lignes par lot de bulk_update")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.all()
+        if options['user']:
+            users = users.filter(username=options['user'])
+            if not users.exists():
+                raise CommandError(f"Utilisateur introuvable: {options['user']}")
+
+        start = time.monotonic()
+        totals = {'processed': 0, 'updated': 0, 'flagged': 0}
+        for user in users.filter(recordings__isnull=False).distinct().iterator():
+            result = reevaluate_silences(user.id, options['threshold'], options['batch_size'])
+            for key in totals:
+                totals[key] += result[key]
+            self.stdout.write(
+                f"{user.username}: {result['processed']} analysés, {result['updated']} mis à jour, "
+                f"{result['flagged']} marqués"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['processed']} enregistrements analysés, {totals['updated']} mis à jour "
+            f"en {time.monotonic() - start:.2f}s"
+        ))
@@ -0,0 +1,106 @@
+"""
+Exécute les jobs de traitement en file d'attente dans un pool de processus
+
+Usage: python manage.py run_workers --concurrency 4
+"""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from recordings.jobs import (
+    claim_next_job,
+    complete_job,
+    default_worker_name,
+    fail_job,
+    requeue_stale_jobs,
+)
+from recordings.workers import init_worker, execute_job
+import multiprocessing
+import signal
+import time
+
+
+class Command(BaseCommand):
+    help = "Exécute les jobs de traitement audio (file d'attente ProcessingJob)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2,
+                            help="Nombre de processus de traitement en parallèle")
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help="Délai entre deux consultations de la file (secondes)")
+        parser.add_argument('--once', action='store_true',
+                            help="S'arrête quand la file est vide")
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        poll_interval = options['poll_interval']
+        worker_name = default_worker_name()
+        self.stopping = False
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"{requeued} job(s) interrompu(s) remis en attente")
+
+        self.stdout.write(f"Worker {worker_name} démarré (concurrence: {concurrency})")
+        pool = self._create_pool(concurrency)
+        in_flight = {}
+
+        try:
+            while True:
+                close_old_connections()
+                pool = self._reap(in_flight, pool, concurrency)
+
+                # Remplir le pool sans dépasser la concurrence (backpressure)
+                while not self.stopping and len(in_flight) < concurrency:
+                    job = claim_next_job(worker_name)
+                    if job is None:
+                        break
+                    self.stdout.write(f"→ job #{job.id} ({job.kind}) recording {job.recording_id}")
+                    in_flight[pool.submit(execute_job, job.id)] = job
+
+                if not in_flight:
+                    if self.stopping or options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                wait(list(in_flight), timeout=poll_interval, return_when=FIRST_COMPLETED)
+        finally:
+            pool.shutdown(wait=True)
+
+        self.stdout.write("Worker arrêté")
+
+    def _create_pool(self, concurrency):
+        return ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+        )
+
+    def _reap(self, in_flight, pool, concurrency):
+        """Enregistre le résultat des jobs terminés; recrée le pool s'il est cassé"""
+        broken = False
+        for future in [f for f in in_flight if f.done()]:
+            job = in_flight.pop(future)
+            try:
+                future.result()
+                complete_job(job)
+                self.stdout.write(self.style.SUCCESS(f"✓ job #{job.id} terminé"))
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    broken = True
+                status = fail_job(job, e)
+                self.stderr.write(f"✗ job #{job.id} en erreur ({status}): {e}")
+
+        if broken:
+            pool.shutdown(wait=False)
+            pool = self._create_pool(concurrency)
+        return pool
+
+    def _request_stop(self, signum, frame):
+        """Arrêt propre: termine les jobs en cours sans en prendre de nouveaux"""
+        self.stdout.write("Arrêt demandé, fin des jobs en cours...")
+        self.stopping = True
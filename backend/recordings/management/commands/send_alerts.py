@@ -0,0 +1,54 @@
+"""
+Envoie les alertes email en attente (boîte d'envoi Alert)
+
+Les alertes d'un utilisateur sont regroupées en un email récapitulatif,
+avec une seule connexion par serveur SMTP à chaque passage.
+
+Usage: python manage.py send_alerts [--poll-interval 10] [--once]
+"""
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from recordings.alerts import deliver_alerts, requeue_stale_alerts
+from recordings.jobs import default_worker_name
+import signal
+import time
+
+
+class Command(BaseCommand):
+    help = "Envoie les alertes email en attente (emails récapitulatifs)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=10.0,
+                            help="Délai entre deux consultations de la boîte d'envoi (secondes)")
+        parser.add_argument('--once', action='store_true',
+                            help="Un seul passage puis arrêt")
+
+    def handle(self, *args, **options):
+        worker_name = default_worker_name()
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        requeued = requeue_stale_alerts()
+        if requeued:
+            self.stdout.write(f"{requeued} alerte(s) interrompue(s) remise(s) en attente")
+
+        self.stdout.write(f"Envoi des alertes {worker_name} démarré")
+        while not self.stopping:
+            close_old_connections()
+            stats = deliver_alerts(worker_name)
+            if stats['emails']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✓ {stats['emails']} email(s) envoyé(s) ({stats['alerts']} alertes)"
+                ))
+            if stats['retried'] or stats['failed']:
+                self.stderr.write(f"✗ {stats['retried']} alerte(s) replanifiée(s), {stats['failed']} abandonnée(s)")
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
+
+        self.stdout.write("Envoi des alertes arrêté")
+
+    def _request_stop(self, signum, frame):
+        """Arrêt propre à la fin du passage en cours"""
+        self.stopping = True
@@ -0,0 +1,154 @@
+"""
+Envoi des fichiers audio: requêtes partielles HTTP Range (206), GET conditionnel
+(ETag / Last-Modified) ou délégation au reverse proxy (X-Accel-Redirect / X-Sendfile)
+"""
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from urllib.parse import quote
+import mimetypes
+import os
+import re
+
+
+# Une seule plage est servie ; les requêtes multi-plages reçoivent le fichier complet
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def file_etag(stat):
+    """ETag dérivé de la taille et de la date de modification du fichier"""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    Plage demandée par l'en-tête Range
+    Retourne (début, fin) inclus, None si l'en-tête est ignoré (invalide,
+    multi-plages) ou False si la plage n'est pas satisfiable (416)
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+
+    if first:
+        start = int(first)
+        if start >= size:
+            return False
+        end = int(last) if last else size - 1
+        if end < start:
+            return None
+        return start, min(end, size - 1)
+
+    if last:
+        # Suffixe: les N derniers octets
+        suffix = int(last)
+        if suffix == 0:
+            return False
+        return max(size - suffix, 0), size - 1
+
+    return None
+
+
+def if_range_matches(request, etag, last_modified):
+    """Vérifie l'en-tête If-Range : la plage n'est servie que si le fichier n'a pas changé"""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def iter_file_range(file_path, start, length, chunk_size=CHUNK_SIZE):
+    """Lit length octets de file_path à partir de start, par blocs"""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def offload_response(file_path, content_type):
+    """
+    Réponse vide que le reverse proxy remplace par le fichier
+    (il gère alors lui-même Range et les en-têtes conditionnels)
+    """
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_OFFLOAD == 'x-accel':
+        relative_path = os.path.relpath(file_path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        response['X-Accel-Redirect'] = settings.MEDIA_OFFLOAD_PREFIX.rstrip('/') + '/' + quote(relative_path)
+    else:
+        response['X-Sendfile'] = file_path
+    return response
+
+
+def serve_file(request, file_path, as_attachment=False):
+    """
+    Envoie un fichier en gérant Range, If-Range, If-None-Match et If-Modified-Since
+    Seuls les octets demandés sont lus : un seek dans un long WAV ne coûte que la plage lue.
+    """
+    try:
+        stat = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("Fichier non trouvé")
+
+    size = stat.st_size
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+    content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+
+    # 304 Not Modified / 412 Precondition Failed
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    if response is None and settings.MEDIA_OFFLOAD in ('x-accel', 'x-sendfile'):
+        response = offload_response(file_path, content_type)
+
+    if response is None:
+        byte_range = None
+        range_header = request.headers.get('Range')
+        if range_header and if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(range_header, size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        elif byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                iter_file_range(file_path, start, length), status=206, content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(length)
+        else:
+            response = FileResponse(open(file_path, 'rb'), content_type=content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if as_attachment and response.status_code in (200, 206):
+        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
+    return response
+
+
+def serve_media(request, path):
+    """
+    Sert un fichier de MEDIA_ROOT (lecteur audio du frontend) avec support Range
+    Remplace django.views.static.serve, qui ne gère pas les requêtes partielles.
+    """
+    try:
+        file_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Fichier non trouvé")
+    if os.path.isdir(file_path):
+        raise Http404("Fichier non trouvé")
+    return serve_file(request, file_path)
@@ -0,0 +1,198 @@
+"""
+Mesures du pipeline de traitement et export Prometheus (/api/metrics)
+
+- StageTimer chronomètre les étapes de process_recording (horloge monotone)
+- record_processing() enregistre les mesures de l'enregistrement
+  (ProcessingStats) et les ajoute aux histogrammes cumulés (MetricBucket) :
+  une requête UPDATE par histogramme, les workers étant des processus
+  distincts du serveur web qui exporte les métriques
+- render_metrics() produit le format texte Prometheus
+"""
+from contextlib import contextmanager
+from django.db import transaction
+from django.db.models import Count, F, Q
+from .models import Alert, MetricBucket, ProcessingJob, ProcessingStats
+import os
+import sys
+import time
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+BYTES_BUCKETS = tuple(2 ** power for power in range(20, 35, 2))  # 1 Mio .. 16 Gio
+
+# Histogrammes exportés : nom -> (description, bornes)
+HISTOGRAMS = {
+    'recordings_processing_stage_seconds': (
+        "Durée de chaque étape du traitement d'un enregistrement", SECONDS_BUCKETS
+    ),
+    'recordings_processing_seconds': (
+        "Durée totale du traitement d'un enregistrement", SECONDS_BUCKETS
+    ),
+    'recordings_processing_realtime_factor': (
+        "Temps de traitement divisé par la durée de l'audio",
+        (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2),
+    ),
+    'recordings_processing_bytes_read': (
+        "Octets du fichier source lus par traitement", BYTES_BUCKETS
+    ),
+    'recordings_processing_peak_rss_bytes': (
+        "Pic de mémoire du processus pendant un traitement", BYTES_BUCKETS
+    ),
+}
+
+# (métrique, étape) dont les lignes MetricBucket existent déjà (propre au processus)
+_KNOWN_SERIES = set()
+
+
+def reset_peak_rss():
+    """Remet à zéro le pic de mémoire du processus (Linux : /proc/self/clear_refs)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes():
+    """
+    Pic de mémoire résidente du processus (VmHWM), depuis le dernier
+    reset_peak_rss() ; à défaut, depuis le démarrage du processus
+    Ne compte pas les sous-processus ffmpeg
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sur macOS, en kio ailleurs
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageTimer:
+    """Chronomètre des étapes d'un traitement"""
+
+    def __init__(self):
+        self.stages = {}
+        self.bytes_read = 0
+        self.started = time.monotonic()
+        self.peak_reset = reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.monotonic() - start
+
+    def add_read(self, path):
+        """Compte une lecture complète du fichier"""
+        try:
+            self.bytes_read += os.path.getsize(path)
+        except OSError:
+            pass
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+
+def record_processing(recording, timer, audio_seconds, cache_hit=False):
+    """Enregistre les mesures d'un traitement terminé et met à jour les histogrammes"""
+    total = timer.elapsed()
+    realtime_factor = total / audio_seconds if audio_seconds else None
+    peak = peak_rss_bytes()
+    stages = {name: round(seconds, 6) for name, seconds in timer.stages.items()}
+
+    with transaction.atomic():
+        ProcessingStats.objects.update_or_create(
+            recording_id=recording.id,
+            defaults={
+                'stages': stages,
+                'total_seconds': total,
+                'audio_seconds': audio_seconds or 0.0,
+                'realtime_factor': realtime_factor,
+                'bytes_read': timer.bytes_read,
+                # Sans reset possible, le pic couvre toute la vie du processus : non significatif
+                'peak_rss_bytes': peak if timer.peak_reset else None,
+                'cache_hit': cache_hit,
+            },
+        )
+        for name, seconds in timer.stages.items():
+            observe('recordings_processing_stage_seconds', seconds, stage=name)
+        observe('recordings_processing_seconds', total)
+        if realtime_factor is not None:
+            observe('recordings_processing_realtime_factor', realtime_factor)
+        observe('recordings_processing_bytes_read', timer.bytes_read)
+        if peak is not None and timer.peak_reset:
+            observe('recordings_processing_peak_rss_bytes', peak)
+    return realtime_factor
+
+
+def observe(metric, value, stage=''):
+    """Ajoute une observation à un histogramme (une requête UPDATE)"""
+    if (metric, stage) not in _KNOWN_SERIES:
+        _create_series(metric, stage)
+    MetricBucket.objects.filter(metric=metric, stage=stage).filter(
+        Q(upper__gte=value) | Q(upper__isnull=True)
+    ).update(count=F('count') + 1, sum=F('sum') + value)
+
+
+def _create_series(metric, stage):
+    """Crée les lignes d'un histogramme (bornes + '+Inf') si elles n'existent pas"""
+    _, buckets = HISTOGRAMS[metric]
+    rows = [MetricBucket(metric=metric, stage=stage, le=format_value(upper), upper=upper) for upper in buckets]
+    rows.append(MetricBucket(metric=metric, stage=stage, le='+Inf', upper=None))
+    MetricBucket.objects.bulk_create(rows, ignore_conflicts=True)
+    _KNOWN_SERIES.add((metric, stage))
+
+
+def format_value(value):
+    """Nombre au format Prometheus (entiers sans décimale)"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    """Métriques au format texte d'exposition Prometheus"""
+    lines = []
+    rows = MetricBucket.objects.order_by('metric', 'stage', F('upper').asc(nulls_last=True))
+    series = {}
+    for row in rows:
+        series.setdefault(row.metric, []).append(row)
+
+    for metric, (description, _) in HISTOGRAMS.items():
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} histogram")
+        for row in series.get(metric, []):
+            labels = f'stage="{row.stage}",' if row.stage else ''
+            lines.append(f'{metric}_bucket{{{labels}le="{row.le}"}} {row.count}')
+            if row.upper is None:
+                labels = f'{{stage="{row.stage}"}}' if row.stage else ''
+                lines.append(f"{metric}_sum{labels} {format_value(row.sum)}")
+                lines.append(f"{metric}_count{labels} {row.count}")
+
+    # Profondeur des files (dimensionnement des workers)
+    lines.append("# HELP recordings_processing_jobs Jobs de traitement par statut")
+    lines.append("# TYPE recordings_processing_jobs gauge")
+    jobs = dict(ProcessingJob.objects.values('status').annotate(n=Count('id')).values_list('status', 'n').order_by())
+    for status, _ in ProcessingJob.STATUS_CHOICES:
+        lines.append(f'recordings_processing_jobs{{status="{status}"}} {jobs.get(status, 0)}')
+
+    lines.append("# HELP recordings_alerts Alertes email par statut")
+    lines.append("# TYPE recordings_alerts gauge")
+    alerts = dict(Alert.objects.values('status').annotate(n=Count('id')).values_list('status', 'n').order_by())
+    for status, _ in Alert.STATUS_CHOICES:
+        lines.append(f'recordings_alerts{{status="{status}"}} {alerts.get(status, 0)}')
+
+    return "\n".join(lines) + "\n"
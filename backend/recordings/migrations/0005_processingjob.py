@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0004_alter_usersettings_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('process', 'Traitement'), ('trim', 'Découpage')], default='process', max_length=20)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Arguments de la tâche')),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminé'), ('failed', 'Échoué')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('max_attempts', models.IntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='Date avant laquelle le job ne peut pas démarrer')),
+                ('last_error', models.TextField(blank=True)),
+                ('worker', models.CharField(blank=True, help_text='Worker ayant pris le job', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('recording', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='recordings.recording')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='recordings__status_2aae29_idx')],
+            },
+        ),
+    ]
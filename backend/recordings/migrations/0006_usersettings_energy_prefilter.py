@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0005_processingjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usersettings',
+            name='energy_floor_dbfs',
+            field=models.FloatField(default=-60.0, help_text="Plancher de bruit du pré-filtre d'énergie (dBFS)"),
+        ),
+        migrations.AddField(
+            model_name='usersettings',
+            name='energy_prefilter_enabled',
+            field=models.BooleanField(default=False, help_text='Marque les trames très faibles comme silence sans passer par le VAD'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0006_usersettings_energy_prefilter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recording',
+            name='is_live',
+            field=models.BooleanField(default=False, help_text='Capture en cours: accepte de nouveaux morceaux audio'),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='vad_state',
+            field=models.JSONField(blank=True, default=dict, help_text='État VAD conservé entre deux morceaux'),
+        ),
+    ]
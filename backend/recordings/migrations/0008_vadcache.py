@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:18
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0007_recording_live'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VadCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='Empreinte de (PCM, paramètres VAD)', max_length=64, unique=True)),
+                ('pcm_sha256', models.CharField(db_index=True, max_length=64)),
+                ('sample_rate', models.IntegerField()),
+                ('sensitivity', models.IntegerField()),
+                ('frame_duration_ms', models.IntegerField()),
+                ('energy_floor_dbfs', models.FloatField(blank=True, help_text='Plancher du pré-filtre (vide = désactivé)', null=True)),
+                ('decisions', models.BinaryField()),
+                ('frame_count', models.IntegerField()),
+                ('total_samples', models.BigIntegerField()),
+                ('skipped_frames', models.IntegerField(default=0)),
+                ('hits', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Cache VAD',
+                'verbose_name_plural': 'Cache VAD',
+            },
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='pcm_sha256',
+            field=models.CharField(blank=True, help_text='SHA-256 du PCM 16 kHz mono décodé', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='source_sha256',
+            field=models.CharField(blank=True, db_index=True, help_text='SHA-256 du fichier source', max_length=64),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:23
+
+from django.db import migrations, models
+
+
+def backfill_vad_summary(apps, schema_editor):
+    """Remplit les colonnes de résumé à partir des rapports VAD existants"""
+    Recording = apps.get_model('recordings', 'Recording')
+    fields = ['silence_percentage', 'total_silence_seconds', 'unnatural_silence_count']
+    batch = []
+    for recording in Recording.objects.only('id', 'vad_report').iterator(chunk_size=500):
+        if not recording.vad_report:
+            continue
+        recording.silence_percentage = recording.vad_report.get('silence_percentage', 0)
+        recording.total_silence_seconds = recording.vad_report.get('total_silence_seconds', 0)
+        recording.unnatural_silence_count = len(recording.vad_report.get('unnatural_silences', []))
+        batch.append(recording)
+        if len(batch) >= 500:
+            Recording.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Recording.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0008_vadcache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recording',
+            name='silence_percentage',
+            field=models.FloatField(blank=True, help_text='Pourcentage de silence (null si non analysé)', null=True),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='total_silence_seconds',
+            field=models.FloatField(blank=True, help_text='Durée totale de silence (secondes)', null=True),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='unnatural_silence_count',
+            field=models.IntegerField(default=0, help_text='Nombre de silences non naturels'),
+        ),
+        migrations.RunPython(backfill_vad_summary, migrations.RunPython.noop),
+    ]
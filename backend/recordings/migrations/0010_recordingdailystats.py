@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_daily_stats(apps, schema_editor):
+    """Construit les statistiques journalières des enregistrements existants"""
+    from django.db.models import Count, Q, Sum
+    from django.db.models.functions import Coalesce, TruncDate
+    
+    Recording = apps.get_model('recordings', 'Recording')
+    RecordingDailyStats = apps.get_model('recordings', 'RecordingDailyStats')
+    rows = Recording.objects.annotate(day=TruncDate('created_at')).values('user_id', 'day', 'type').annotate(
+        count=Count('id'),
+        flagged_count=Count('id', filter=Q(flagged=True)),
+        total_duration_seconds=Coalesce(Sum('duration_seconds'), 0.0),
+        total_silence_seconds=Coalesce(Sum('total_silence_seconds'), 0.0),
+    ).order_by()
+    RecordingDailyStats.objects.bulk_create([RecordingDailyStats(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recordings', '0009_recording_vad_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('type', models.CharField(choices=[('antenne', 'Antenne'), ('emission', 'Émission'), ('reunion', 'Réunion')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('flagged_count', models.IntegerField(default=0)),
+                ('total_duration_seconds', models.FloatField(default=0.0)),
+                ('total_silence_seconds', models.FloatField(default=0.0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recording_daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Statistiques journalières',
+                'verbose_name_plural': 'Statistiques journalières',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='recordingdailystats',
+            constraint=models.UniqueConstraint(fields=('user', 'day', 'type'), name='unique_daily_stats'),
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0010_recordingdailystats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='recording',
+            name='recordings__created_0ddc66_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='recording',
+            name='recordings__type_bcebda_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='recording',
+            name='recordings__flagged_28788e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='recording',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='recordings__user_id_03fcc4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recording',
+            index=models.Index(fields=['user', 'type', '-created_at', '-id'], name='recordings__user_id_d59961_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recording',
+            index=models.Index(fields=['user', 'flagged', '-created_at', '-id'], name='recordings__user_id_bc1ca9_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0011_recording_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recording',
+            name='is_split',
+            field=models.BooleanField(default=False, help_text='Découpé en parties (analysées séparément)'),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='offset_seconds',
+            field=models.FloatField(default=0.0, help_text="Position de la partie dans l'enregistrement d'origine (secondes)"),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='parent',
+            field=models.ForeignKey(blank=True, help_text="Enregistrement d'origine (partie issue d'un découpage)", null=True, on_delete=django.db.models.deletion.CASCADE, related_name='parts', to='recordings.recording'),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='part_index',
+            field=models.IntegerField(blank=True, help_text='Numéro de la partie (à partir de 0)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='processingjob',
+            name='kind',
+            field=models.CharField(choices=[('process', 'Traitement'), ('trim', 'Découpage'), ('split', 'Découpage automatique')], default='process', max_length=20),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recordings', '0012_recording_parts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_name', models.CharField(help_text='Chemin du fichier relatif à MEDIA_ROOT', max_length=500)),
+                ('original_name', models.CharField(max_length=255)),
+                ('upload_length', models.BigIntegerField(help_text='Taille totale annoncée (octets)')),
+                ('offset', models.BigIntegerField(default=0, help_text='Octets reçus et synchronisés sur disque')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text="Champs de l'enregistrement à créer")),
+                ('sha256', models.CharField(blank=True, help_text='SHA-256 du fichier complet', max_length=64)),
+                ('status', models.CharField(choices=[('uploading', 'En cours'), ('complete', 'Terminé'), ('aborted', 'Abandonné')], default='uploading', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('expires_at', models.DateTimeField(help_text='Date après laquelle un upload inachevé est supprimé')),
+                ('recording', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload_sessions', to='recordings.recording')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='recordings__status_1d1ca1_idx')],
+            },
+        ),
+    ]
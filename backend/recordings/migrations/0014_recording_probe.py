@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0013_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recording',
+            name='bit_rate',
+            field=models.IntegerField(blank=True, help_text='Débit (bits/s)', null=True),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='channels',
+            field=models.IntegerField(blank=True, help_text='Nombre de canaux', null=True),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='codec',
+            field=models.CharField(blank=True, help_text='Codec audio (vide si non sondé)', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='recording',
+            name='sample_rate',
+            field=models.IntegerField(default=44100, help_text="Taux d'échantillonnage du fichier source (Hz)"),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+SEGMENT_KEYS = ('voice_segments', 'silence_segments')
+
+
+def move_segments(apps, schema_editor):
+    """Déplace les listes de segments de vad_report vers RecordingAnalysis"""
+    Recording = apps.get_model('recordings', 'Recording')
+    RecordingAnalysis = apps.get_model('recordings', 'RecordingAnalysis')
+    recordings, analyses = [], []
+    for recording in Recording.objects.only('id', 'vad_report').iterator(chunk_size=500):
+        report = recording.vad_report or {}
+        if not any(key in report for key in SEGMENT_KEYS):
+            continue
+        analyses.append(RecordingAnalysis(
+            recording_id=recording.id,
+            voice_segments=report.pop('voice_segments', []),
+            silence_segments=report.pop('silence_segments', []),
+        ))
+        recordings.append(recording)
+        if len(recordings) >= 500:
+            RecordingAnalysis.objects.bulk_create(analyses)
+            Recording.objects.bulk_update(recordings, ['vad_report'])
+            recordings, analyses = [], []
+    if recordings:
+        RecordingAnalysis.objects.bulk_create(analyses)
+        Recording.objects.bulk_update(recordings, ['vad_report'])
+
+
+def restore_segments(apps, schema_editor):
+    """Remet les listes de segments dans vad_report"""
+    Recording = apps.get_model('recordings', 'Recording')
+    RecordingAnalysis = apps.get_model('recordings', 'RecordingAnalysis')
+    batch = []
+    for analysis in RecordingAnalysis.objects.select_related('recording').iterator(chunk_size=500):
+        recording = analysis.recording
+        recording.vad_report = dict(recording.vad_report or {})
+        recording.vad_report['voice_segments'] = analysis.voice_segments
+        recording.vad_report['silence_segments'] = analysis.silence_segments
+        batch.append(recording)
+        if len(batch) >= 500:
+            Recording.objects.bulk_update(batch, ['vad_report'])
+            batch = []
+    if batch:
+        Recording.objects.bulk_update(batch, ['vad_report'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0014_recording_probe'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingAnalysis',
+            fields=[
+                ('recording', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='analysis', serialize=False, to='recordings.recording')),
+                ('voice_segments', models.JSONField(blank=True, default=list)),
+                ('silence_segments', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='recording',
+            name='vad_report',
+            field=models.JSONField(blank=True, default=dict, help_text='Résumé du rapport VAD (segments dans RecordingAnalysis)'),
+        ),
+        migrations.RunPython(move_segments, restore_segments),
+    ]
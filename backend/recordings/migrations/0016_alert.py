@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recordings', '0015_recordinganalysis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Alert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recording_title', models.CharField(blank=True, max_length=255)),
+                ('recording_type', models.CharField(blank=True, max_length=20)),
+                ('recording_created_at', models.DateTimeField(blank=True, null=True)),
+                ('silences', models.JSONField(default=list, help_text='Blancs non naturels détectés')),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('sending', "En cours d'envoi"), ('sent', 'Envoyée'), ('failed', 'Échouée')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text="Date avant laquelle l'alerte n'est pas envoyée")),
+                ('last_error', models.TextField(blank=True)),
+                ('worker', models.CharField(blank=True, help_text="Worker ayant pris l'alerte", max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('recording', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='alerts', to='recordings.recording')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='recordings__status_a2d2c2_idx')],
+            },
+        ),
+    ]
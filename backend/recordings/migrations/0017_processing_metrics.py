@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0016_alert'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=100)),
+                ('stage', models.CharField(blank=True, max_length=50)),
+                ('le', models.CharField(help_text="Borne telle qu'exportée ('0.5', '+Inf')", max_length=20)),
+                ('upper', models.FloatField(blank=True, help_text='Borne numérique (NULL pour +Inf)', null=True)),
+                ('count', models.BigIntegerField(default=0)),
+                ('sum', models.FloatField(default=0.0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProcessingStats',
+            fields=[
+                ('recording', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='processing_stats', serialize=False, to='recordings.recording')),
+                ('stages', models.JSONField(blank=True, default=dict, help_text='Durée de chaque étape (secondes)')),
+                ('total_seconds', models.FloatField(default=0.0)),
+                ('audio_seconds', models.FloatField(default=0.0, help_text="Durée de l'audio traité")),
+                ('realtime_factor', models.FloatField(blank=True, help_text="Temps de traitement / durée de l'audio", null=True)),
+                ('bytes_read', models.BigIntegerField(default=0, help_text='Octets du fichier source lus (toutes passes)')),
+                ('peak_rss_bytes', models.BigIntegerField(blank=True, help_text='Pic de mémoire du processus de traitement', null=True)),
+                ('cache_hit', models.BooleanField(default=False, help_text='Décisions VAD reprises du cache')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Mesures de traitement',
+                'verbose_name_plural': 'Mesures de traitement',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='metricbucket',
+            constraint=models.UniqueConstraint(fields=('metric', 'stage', 'le'), name='unique_metric_bucket'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0017_processing_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiveSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('voice', 'Voix'), ('silence', 'Silence')], max_length=10)),
+                ('start', models.FloatField()),
+                ('end', models.FloatField()),
+                ('duration', models.FloatField()),
+                ('recording', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='live_segments', to='recordings.recording')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['recording', 'kind', 'start'], name='recordings__recordi_33b9cd_idx')],
+            },
+        ),
+    ]
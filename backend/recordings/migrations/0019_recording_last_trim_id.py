@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recordings', '0018_live_segments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recording',
+            name='last_trim_id',
+            field=models.CharField(blank=True, help_text='Identifiant du dernier trim enregistré', max_length=32),
+        ),
+    ]
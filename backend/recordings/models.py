@@ -2,6 +2,12 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 import json
+import uuid
+import numpy as np
+
+
+# Listes de segments du rapport VAD, stockées à part dans RecordingAnalysis
+VAD_SEGMENT_KEYS = ('voice_segments', 'silence_segments')
 
 
 class UserSettings(models.Model):
@@ -50,6 +56,8 @@ class UserSettings(models.Model):
     # Détection silence
     vad_sensitivity = models.IntegerField(default=2, help_text="Sensibilité VAD (0-3)")
     silence_threshold_seconds = models.FloatField(default=5.0, help_text="Seuil minimal pour silence anormal (secondes)")
+    energy_prefilter_enabled = models.BooleanField(default=False, help_text="Marque les trames très faibles comme silence sans passer par le VAD")
+    energy_floor_dbfs = models.FloatField(default=-60.0, help_text="Plancher de bruit du pré-filtre d'énergie (dBFS)")
     email_alerts_enabled = models.BooleanField(default=False)
     
     # Email
@@ -96,17 +104,51 @@ class Recording(models.Model):
     # Fichier
     file = models.FileField(upload_to='recordings/', help_text="Fichier audio")
     format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='mp3')
-    sample_rate = models.IntegerField(default=44100, help_text="Taux d'échantillonnage (Hz)")
+    sample_rate = models.IntegerField(default=44100, help_text="Taux d'échantillonnage du fichier source (Hz)")
     duration_seconds = models.FloatField(default=0.0, help_text="Durée en secondes")
     
+    # En-têtes du fichier source, lus à l'upload (voir recordings/probe.py)
+    codec = models.CharField(max_length=50, blank=True, help_text="Codec audio (vide si non sondé)")
+    channels = models.IntegerField(null=True, blank=True, help_text="Nombre de canaux")
+    bit_rate = models.IntegerField(null=True, blank=True, help_text="Débit (bits/s)")
+    
     # Métadonnées
     created_at = models.DateTimeField(auto_now_add=True)
     retained_until = models.DateTimeField(null=True, blank=True, help_text="Date d'expiration automatique")
     
     # Traitement IA
-    vad_report = models.JSONField(default=dict, blank=True, help_text="Rapport de détection de voix (VAD)")
+    vad_report = models.JSONField(default=dict, blank=True, help_text="Résumé du rapport VAD (segments dans RecordingAnalysis)")
     flagged = models.BooleanField(default=False, help_text="Marqué pour révision (blancs détectés, etc.)")
     
+    # Résumé du rapport VAD (servi par la liste sans charger vad_report)
+    silence_percentage = models.FloatField(null=True, blank=True, help_text="Pourcentage de silence (null si non analysé)")
+    total_silence_seconds = models.FloatField(null=True, blank=True, help_text="Durée totale de silence (secondes)")
+    unnatural_silence_count = models.IntegerField(default=0, help_text="Nombre de silences non naturels")
+    
+    # Empreintes pour le cache VAD (voir VadCache)
+    source_sha256 = models.CharField(max_length=64, blank=True, db_index=True, help_text="SHA-256 du fichier source")
+    pcm_sha256 = models.CharField(max_length=64, blank=True, help_text="SHA-256 du PCM 16 kHz mono décodé")
+    
+    # Dernier trim appliqué : un job de trim rejoué ne découpe pas une seconde fois
+    last_trim_id = models.CharField(max_length=32, blank=True, help_text="Identifiant du dernier trim enregistré")
+    
+    # Découpage automatique (UserSettings.auto_split_*) : les parties pointent vers l'original
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='parts',
+        help_text="Enregistrement d'origine (partie issue d'un découpage)"
+    )
+    part_index = models.IntegerField(null=True, blank=True, help_text="Numéro de la partie (à partir de 0)")
+    offset_seconds = models.FloatField(default=0.0, help_text="Position de la partie dans l'enregistrement d'origine (secondes)")
+    is_split = models.BooleanField(default=False, help_text="Découpé en parties (analysées séparément)")
+    
+    # Capture en direct (upload par morceaux)
+    is_live = models.BooleanField(default=False, help_text="Capture en cours: accepte de nouveaux morceaux audio")
+    vad_state = models.JSONField(default=dict, blank=True, help_text="État VAD conservé entre deux morceaux")
+    
     # Utilisateur
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -117,9 +159,10 @@ class Recording(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['-created_at']),
-            models.Index(fields=['type']),
-            models.Index(fields=['flagged']),
+            # Listes par utilisateur (pagination par curseur sur created_at, id)
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['user', 'type', '-created_at', '-id']),
+            models.Index(fields=['user', 'flagged', '-created_at', '-id']),
         ]
     
     def __str__(self):
@@ -131,6 +174,59 @@ class Recording(models.Model):
             return timezone.now() > self.retained_until
         return False
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Type chargé, pour mettre à jour l'ancien bucket statistique si le type change
+        instance._loaded_type = values[field_names.index('type')] if 'type' in field_names else None
+        return instance
+    
+    def update_vad_summary(self):
+        """
+        Recopie le résumé de vad_report dans les colonnes dédiées
+        Retourne la liste des champs modifiés (pour save(update_fields=...))
+        """
+        if self.vad_report:
+            self.silence_percentage = self.vad_report.get('silence_percentage', 0)
+            self.total_silence_seconds = self.vad_report.get('total_silence_seconds', 0)
+            self.unnatural_silence_count = len(self.vad_report.get('unnatural_silences', []))
+        else:
+            self.silence_percentage = None
+            self.total_silence_seconds = None
+            self.unnatural_silence_count = 0
+        return ['silence_percentage', 'total_silence_seconds', 'unnatural_silence_count']
+    
+    def set_vad_report(self, report):
+        """
+        Sépare un rapport VAD complet : le résumé reste dans vad_report, les
+        listes de segments sont retournées pour RecordingAnalysis (None si
+        pas de rapport)
+        """
+        report = report or {}
+        self.vad_report = {key: value for key, value in report.items() if key not in VAD_SEGMENT_KEYS}
+        if not report:
+            return None
+        return {key: report.get(key, []) for key in VAD_SEGMENT_KEYS}
+    
+    def get_full_vad_report(self):
+        """
+        Rapport VAD complet : résumé + segments (RecordingAnalysis, lu à la
+        demande ; LiveSegment pendant une capture en direct)
+        """
+        if not self.vad_report:
+            return {}
+        report = dict(self.vad_report)
+        if self.is_live:
+            report.update(LiveSegment.segment_lists(self.id))
+            return report
+        try:
+            analysis = self.analysis
+        except RecordingAnalysis.DoesNotExist:
+            return report
+        report['voice_segments'] = analysis.voice_segments
+        report['silence_segments'] = analysis.silence_segments
+        return report
+    
     def get_vad_summary(self):
         """Retourne un résumé du rapport VAD"""
         if not self.vad_report:
@@ -172,3 +268,337 @@ class Recording(models.Model):
             filename = filename.replace(key, value)
         
         return filename
+
+
+class RecordingAnalysis(models.Model):
+    """
+    Listes de segments voix / silence du rapport VAD (une ligne par enregistrement)
+    Séparées de Recording pour que les lectures et écritures courantes de la
+    ligne principale restent petites ; lues par /vad/, le trim, la reprise
+    d'une capture en direct et le recalcul des silences
+    """
+    recording = models.OneToOneField(
+        Recording,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='analysis'
+    )
+    voice_segments = models.JSONField(default=list, blank=True)
+    silence_segments = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Analyse de l'enregistrement {self.recording_id}"
+
+
+class LiveSegment(models.Model):
+    """
+    Segment clos d'une capture en direct, inséré par le morceau qui l'a fermé
+    Un morceau n'écrit que ses nouveaux segments (pas les listes complètes) ;
+    les lignes sont regroupées dans RecordingAnalysis à la clôture
+    """
+    KIND_CHOICES = [
+        ('voice', 'Voix'),
+        ('silence', 'Silence'),
+    ]
+    
+    recording = models.ForeignKey(Recording, on_delete=models.CASCADE, related_name='live_segments')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    start = models.FloatField()
+    end = models.FloatField()
+    duration = models.FloatField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['recording', 'kind', 'start']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.start:.2f}-{self.end:.2f}s (recording {self.recording_id})"
+    
+    @classmethod
+    def from_report(cls, recording_id, report):
+        """Lignes (non enregistrées) des segments d'un rapport VAD"""
+        return [
+            cls(recording_id=recording_id, kind=kind, **segment)
+            for kind in ('voice', 'silence')
+            for segment in report.get(f'{kind}_segments', [])
+        ]
+    
+    @classmethod
+    def segment_lists(cls, recording_id):
+        """Listes de segments au format du rapport VAD, triées par début"""
+        lists = {key: [] for key in VAD_SEGMENT_KEYS}
+        rows = cls.objects.filter(recording_id=recording_id).order_by('kind', 'start')
+        for kind, start, end, duration in rows.values_list('kind', 'start', 'end', 'duration'):
+            lists[f'{kind}_segments'].append({'start': start, 'end': end, 'duration': duration})
+        return lists
+
+
+class ProcessingStats(models.Model):
+    """
+    Mesures du dernier traitement d'un enregistrement (process_recording) :
+    durée de chaque étape, facteur temps réel, octets lus, pic mémoire
+    Les mêmes mesures alimentent les histogrammes de /api/metrics (MetricBucket)
+    """
+    recording = models.OneToOneField(
+        Recording,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='processing_stats'
+    )
+    stages = models.JSONField(default=dict, blank=True, help_text="Durée de chaque étape (secondes)")
+    total_seconds = models.FloatField(default=0.0)
+    audio_seconds = models.FloatField(default=0.0, help_text="Durée de l'audio traité")
+    realtime_factor = models.FloatField(null=True, blank=True, help_text="Temps de traitement / durée de l'audio")
+    bytes_read = models.BigIntegerField(default=0, help_text="Octets du fichier source lus (toutes passes)")
+    peak_rss_bytes = models.BigIntegerField(null=True, blank=True, help_text="Pic de mémoire du processus de traitement")
+    cache_hit = models.BooleanField(default=False, help_text="Décisions VAD reprises du cache")
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Mesures de traitement"
+        verbose_name_plural = "Mesures de traitement"
+    
+    def __str__(self):
+        return f"Traitement recording {self.recording_id}: {self.total_seconds:.2f}s"
+
+
+class MetricBucket(models.Model):
+    """
+    Histogrammes cumulés exportés au format Prometheus par /api/metrics
+    Une ligne par (métrique, étape, borne) : count et sum des observations
+    inférieures ou égales à la borne ; la ligne '+Inf' porte les totaux
+    """
+    metric = models.CharField(max_length=100)
+    stage = models.CharField(max_length=50, blank=True)
+    le = models.CharField(max_length=20, help_text="Borne telle qu'exportée ('0.5', '+Inf')")
+    upper = models.FloatField(null=True, blank=True, help_text="Borne numérique (NULL pour +Inf)")
+    count = models.BigIntegerField(default=0)
+    sum = models.FloatField(default=0.0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'stage', 'le'], name='unique_metric_bucket'),
+        ]
+    
+    def __str__(self):
+        return f"{self.metric}{{stage={self.stage}, le={self.le}}}: {self.count}"
+
+
+class VadCache(models.Model):
+    """
+    Cache des décisions VAD trame par trame (1 bit par trame)
+    Clé: empreinte SHA-256 du PCM décodé + paramètres VAD
+    """
+    key = models.CharField(max_length=64, unique=True, help_text="Empreinte de (PCM, paramètres VAD)")
+    pcm_sha256 = models.CharField(max_length=64, db_index=True)
+    sample_rate = models.IntegerField()
+    sensitivity = models.IntegerField()
+    frame_duration_ms = models.IntegerField()
+    energy_floor_dbfs = models.FloatField(null=True, blank=True, help_text="Plancher du pré-filtre (vide = désactivé)")
+    
+    # Décisions VAD compactées avec np.packbits
+    decisions = models.BinaryField()
+    frame_count = models.IntegerField()
+    total_samples = models.BigIntegerField()
+    skipped_frames = models.IntegerField(default=0)
+    
+    hits = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    class Meta:
+        verbose_name = "Cache VAD"
+        verbose_name_plural = "Cache VAD"
+    
+    def __str__(self):
+        return f"VAD {self.pcm_sha256[:12]} (sensibilité {self.sensitivity}, {self.frame_count} trames)"
+    
+    def get_decisions(self):
+        """Décisions VAD sous forme de tableau numpy de booléens"""
+        packed = np.frombuffer(bytes(self.decisions), dtype=np.uint8)
+        return np.unpackbits(packed, count=self.frame_count).astype(bool)
+
+
+class ProcessingJob(models.Model):
+    """
+    File d'attente persistante des traitements audio (exécutée par manage.py run_workers)
+    """
+    
+    KIND_CHOICES = [
+        ('process', 'Traitement'),
+        ('trim', 'Découpage'),
+        ('split', 'Découpage automatique'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'En attente'),
+        ('running', 'En cours'),
+        ('done', 'Terminé'),
+        ('failed', 'Échoué'),
+    ]
+    
+    recording = models.ForeignKey(
+        Recording,
+        on_delete=models.CASCADE,
+        related_name='jobs'
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='process')
+    payload = models.JSONField(default=dict, blank=True, help_text="Arguments de la tâche")
+    
+    # État
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Date avant laquelle le job ne peut pas démarrer")
+    last_error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True, help_text="Worker ayant pris le job")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+    
+    def __str__(self):
+        return f"Job {self.kind} #{self.id} ({self.status}) - recording {self.recording_id}"
+
+
+class RecordingDailyStats(models.Model):
+    """
+    Statistiques agrégées par utilisateur, jour de création et type d'enregistrement
+    Tenues à jour à chaque création / modification / suppression d'enregistrement
+    (voir recordings/stats.py), pour servir le tableau de bord sans parcourir les enregistrements
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='recording_daily_stats'
+    )
+    day = models.DateField()
+    type = models.CharField(max_length=20, choices=Recording.TYPE_CHOICES)
+    
+    count = models.IntegerField(default=0)
+    flagged_count = models.IntegerField(default=0)
+    total_duration_seconds = models.FloatField(default=0.0)
+    total_silence_seconds = models.FloatField(default=0.0)
+    
+    class Meta:
+        ordering = ['-day']
+        verbose_name = "Statistiques journalières"
+        verbose_name_plural = "Statistiques journalières"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day', 'type'], name='unique_daily_stats'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.day} {self.type}: {self.count}"
+
+
+class UploadSession(models.Model):
+    """
+    Upload reprenable (protocole inspiré de tus) : le fichier est écrit morceau
+    par morceau directement à son emplacement final, l'enregistrement n'est
+    créé qu'à la finalisation (voir recordings/uploads.py)
+    """
+    
+    STATUS_CHOICES = [
+        ('uploading', 'En cours'),
+        ('complete', 'Terminé'),
+        ('aborted', 'Abandonné'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    file_name = models.CharField(max_length=500, help_text="Chemin du fichier relatif à MEDIA_ROOT")
+    original_name = models.CharField(max_length=255)
+    upload_length = models.BigIntegerField(help_text="Taille totale annoncée (octets)")
+    offset = models.BigIntegerField(default=0, help_text="Octets reçus et synchronisés sur disque")
+    metadata = models.JSONField(default=dict, blank=True, help_text="Champs de l'enregistrement à créer")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="SHA-256 du fichier complet")
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    recording = models.ForeignKey(
+        Recording,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='upload_sessions'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField(help_text="Date après laquelle un upload inachevé est supprimé")
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"Upload {self.original_name} ({self.offset}/{self.upload_length}) - {self.status}"
+
+
+class Alert(models.Model):
+    """
+    Boîte d'envoi des alertes email (blancs non naturels)
+    
+    Le traitement se contente d'ajouter une ligne : l'envoi est fait par
+    manage.py send_alerts, qui regroupe les alertes d'un utilisateur en un
+    email récapitulatif (voir recordings/alerts.py)
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'En attente'),
+        ('sending', 'En cours d\'envoi'),
+        ('sent', 'Envoyée'),
+        ('failed', 'Échouée'),
+    ]
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='alerts'
+    )
+    recording = models.ForeignKey(
+        Recording,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='alerts'
+    )
+    # Copie au moment de l'alerte: l'envoi ne relit pas l'enregistrement
+    recording_title = models.CharField(max_length=255, blank=True)
+    recording_type = models.CharField(max_length=20, blank=True)
+    recording_created_at = models.DateTimeField(null=True, blank=True)
+    silences = models.JSONField(default=list, help_text="Blancs non naturels détectés")
+    
+    # État
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Date avant laquelle l'alerte n'est pas envoyée")
+    last_error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True, help_text="Worker ayant pris l'alerte")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"Alerte #{self.id} ({self.status}) - {self.user_id}"
@@ -0,0 +1,94 @@
+"""
+Pagination des listes d'enregistrements
+"""
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class RecordingCursorPagination(CursorPagination):
+    """
+    Pagination par curseur (keyset) sur le couple (created_at, id)
+
+    Chaque page est une requête
+    WHERE (created_at, id) < curseur ORDER BY created_at DESC, id DESC LIMIT n,
+    servie par les index composites (user, ..., -created_at, -id), sans OFFSET :
+    la page 5 000 coûte autant que la première.
+
+    Le curseur de DRF ne filtre que sur le premier champ de tri et compense
+    les ex aequo par un offset. Ici la position inclut l'id : elle est unique
+    et l'offset reste toujours nul, même si des enregistrements ont été créés
+    au même instant (import en masse).
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def _get_position_from_instance(self, instance, ordering):
+        return f"{instance.created_at.isoformat()}|{instance.pk}"
+
+    def parse_position(self, position):
+        """Décode une position 'created_at|id'"""
+        created_at, _, pk = position.rpartition('|')
+        try:
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except ValueError:
+            created_at = None
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = self.cursor.reverse, self.cursor.position
+
+        if reverse:
+            queryset = queryset.order_by('created_at', 'id')
+        else:
+            queryset = queryset.order_by('-created_at', '-id')
+
+        if current_position is not None:
+            created_at, pk = self.parse_position(current_position)
+            if reverse:
+                # Page précédente : enregistrements plus récents que la position
+                queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+            else:
+                queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+        # Un élément de plus pour savoir s'il existe une page suivante
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > len(self.page)
+        following_position = (
+            self._get_position_from_instance(results[-1], self.ordering) if has_following_position else None
+        )
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
@@ -0,0 +1,155 @@
+"""
+Pyramide de pics (min/max) pour l'affichage de la forme d'onde
+
+Calculée pendant le décodage ffmpeg de process_recording (mêmes blocs PCM que
+le VAD) et stockée à côté du fichier audio (<nom>.peaks) : le lecteur et la
+modale de découpage chargent quelques kilo-octets au lieu du fichier audio.
+"""
+import os
+import struct
+import numpy as np
+
+
+PEAK_RESOLUTIONS = (100, 10, 1)  # Pics par seconde, du plus fin au plus grossier
+PEAKS_MAGIC = b'PEAK'
+PEAKS_HEADER = struct.Struct('<4sIB3x')  # magic, sample_rate, nombre de niveaux
+PEAKS_LEVEL = struct.Struct('<IQQ')  # pics par seconde, nombre de pics, position des données
+
+
+def peaks_sidecar_path(file_path):
+    """Chemin du fichier de pics associé à un fichier audio"""
+    return os.path.splitext(file_path)[0] + '.peaks'
+
+
+class PeakBuilder:
+    """
+    Calcule les pics min/max d'un flux PCM int16, bloc par bloc
+
+    Le niveau le plus fin (100 pics/s) est calculé sur les échantillons,
+    les niveaux plus grossiers en sont déduits. Les valeurs sont ramenées
+    sur int8 (un couple min/max = 2 octets par pic).
+    """
+
+    def __init__(self, sample_rate, resolutions=PEAK_RESOLUTIONS):
+        self.sample_rate = sample_rate
+        self.resolutions = sorted(resolutions, reverse=True)
+        self.window = sample_rate // self.resolutions[0]
+        self.pending = np.zeros(0, dtype=np.int16)
+        self.minima = []
+        self.maxima = []
+        self.total_samples = 0
+
+    def feed(self, block):
+        """Ajoute un bloc d'échantillons int16"""
+        self.total_samples += len(block)
+        if len(self.pending):
+            block = np.concatenate((self.pending, block))
+        usable = len(block) - len(block) % self.window
+        if usable:
+            windows = block[:usable].reshape(-1, self.window)
+            self.minima.append(windows.min(axis=1))
+            self.maxima.append(windows.max(axis=1))
+        self.pending = block[usable:]
+
+    def levels(self):
+        """Pics de chaque résolution : {pics par seconde: tableau int8 (n, 2)}"""
+        minima = np.concatenate(self.minima) if self.minima else np.zeros(0, dtype=np.int16)
+        maxima = np.concatenate(self.maxima) if self.maxima else np.zeros(0, dtype=np.int16)
+        if len(self.pending):
+            # Dernière fenêtre incomplète
+            minima = np.append(minima, self.pending.min())
+            maxima = np.append(maxima, self.pending.max())
+
+        finest = np.empty((len(minima), 2), dtype=np.int8)
+        finest[:, 0] = minima >> 8
+        finest[:, 1] = maxima >> 8
+        return reduce_levels(finest, self.resolutions)
+
+    def write(self, path):
+        """Écrit la pyramide dans un fichier annexe, remplacé atomiquement"""
+        write_peaks(path, self.levels(), self.sample_rate)
+
+
+def reduce_levels(finest, resolutions=PEAK_RESOLUTIONS):
+    """
+    Déduit les niveaux plus grossiers du niveau le plus fin
+    (la dernière fenêtre incomplète de chaque niveau est conservée)
+    """
+    resolutions = sorted(resolutions, reverse=True)
+    levels = {resolutions[0]: finest}
+    for resolution in resolutions[1:]:
+        factor = resolutions[0] // resolution
+        count = -(-len(finest) // factor)
+        padded = np.pad(finest, ((0, count * factor - len(finest)), (0, 0)), mode='edge') if len(finest) else finest
+        pairs = np.empty((count, 2), dtype=np.int8)
+        pairs[:, 0] = padded[:, 0].reshape(count, factor).min(axis=1)
+        pairs[:, 1] = padded[:, 1].reshape(count, factor).max(axis=1)
+        levels[resolution] = pairs
+    return levels
+
+
+def write_peaks(path, levels, sample_rate):
+    """Écrit les niveaux {pics par seconde: couples min/max} dans un fichier temporaire puis os.replace"""
+    position = PEAKS_HEADER.size + PEAKS_LEVEL.size * len(levels)
+    header = PEAKS_HEADER.pack(PEAKS_MAGIC, sample_rate, len(levels))
+    for resolution, pairs in levels.items():
+        header += PEAKS_LEVEL.pack(resolution, len(pairs), position)
+        position += pairs.nbytes
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for pairs in levels.values():
+            f.write(np.ascontiguousarray(pairs, dtype=np.int8).tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_peaks_index(path):
+    """Niveaux disponibles : (sample_rate, {pics par seconde: (nombre, position)})"""
+    with open(path, 'rb') as f:
+        magic, sample_rate, level_count = PEAKS_HEADER.unpack(f.read(PEAKS_HEADER.size))
+        if magic != PEAKS_MAGIC:
+            raise ValueError(f"Fichier de pics invalide: {path}")
+        index = {}
+        for _ in range(level_count):
+            resolution, count, position = PEAKS_LEVEL.unpack(f.read(PEAKS_LEVEL.size))
+            index[resolution] = (count, position)
+    return sample_rate, index
+
+
+def read_peaks(path, resolution, start=0.0, end=None):
+    """
+    Pics d'un niveau entre start et end (secondes), lus par projection mémoire
+    Retourne (indice du premier pic, tableau int8 (n, 2) de couples min/max)
+    """
+    _, index = read_peaks_index(path)
+    if resolution not in index:
+        raise KeyError(resolution)
+    count, position = index[resolution]
+    first = max(0, min(int(start * resolution), count))
+    last = count if end is None else max(first, min(int(np.ceil(end * resolution)), count))
+    if count == 0 or first == last:
+        return first, np.zeros((0, 2), dtype=np.int8)
+    pairs = np.memmap(path, dtype=np.int8, mode='r', offset=position, shape=(count, 2))
+    return first, np.array(pairs[first:last])
+
+
+def slice_peaks(path, start, end, output_path=None):
+    """
+    Restreint la pyramide à la fenêtre [start, end] (secondes) après un trim :
+    le niveau le plus fin est découpé, les autres en sont recalculés
+    Le résultat remplace path, ou est écrit dans output_path
+    """
+    sample_rate, index = read_peaks_index(path)
+    finest = max(index)
+    _, pairs = read_peaks(path, finest, start, end)
+    write_peaks(output_path or path, reduce_levels(pairs, index.keys()), sample_rate)
+
+
+def compute_file_peaks(blocks, sample_rate, path):
+    """Calcule et écrit les pics d'un flux de blocs PCM (sans analyse VAD)"""
+    builder = PeakBuilder(sample_rate)
+    for block in blocks:
+        builder.feed(block)
+    builder.write(path)
+    return builder
@@ -0,0 +1,87 @@
+"""
+Lecture des en-têtes audio à l'upload (ffprobe, sans décodage)
+
+Le résultat (codec, fréquence d'origine, canaux, débit, durée, conteneur)
+est enregistré sur le Recording : le traitement le réutilise au lieu de
+sonder le fichier une seconde fois.
+"""
+import ffmpeg
+
+
+# Conteneurs ffprobe (format_name) -> Recording.format
+CONTAINER_FORMATS = {
+    'wav': 'wav',
+    'mp3': 'mp3',
+    'ogg': 'ogg',
+    'flac': 'flac',
+    'mov,mp4,m4a,3gp,3g2,mj2': 'm4a',
+    'matroska,webm': 'webm',
+}
+
+# Champs du Recording remplis par apply_probe
+PROBE_FIELDS = ['format', 'codec', 'sample_rate', 'channels', 'bit_rate', 'duration_seconds']
+
+
+class ProbeError(ValueError):
+    """Fichier illisible ou sans piste audio"""
+
+
+def probe_audio(file_path):
+    """
+    Sonde les en-têtes du fichier (première piste audio)
+
+    ffprobe ne lit que l'en-tête et les premières trames (probesize) : la
+    durée est celle annoncée par le conteneur, ou estimée depuis le débit.
+
+    Returns:
+        dict (format, codec, sample_rate, channels, bit_rate, duration), ou
+        None si ffprobe n'est pas installé (le fichier n'est alors pas vérifié)
+
+    Raises:
+        ProbeError: si ffprobe ne reconnaît pas le fichier ou s'il n'a pas de piste audio
+    """
+    try:
+        info = ffmpeg.probe(file_path, select_streams='a:0')
+    except FileNotFoundError:
+        print("ffprobe introuvable: en-têtes audio non vérifiés")
+        return None
+    except ffmpeg.Error as e:
+        message = (e.stderr or b'').decode('utf-8', 'replace').strip().splitlines()
+        raise ProbeError(message[-1] if message else "Fichier audio illisible")
+
+    streams = info.get('streams') or []
+    if not streams:
+        raise ProbeError("Aucune piste audio")
+    stream = streams[0]
+    container = info.get('format', {})
+
+    sample_rate = int(stream.get('sample_rate') or 0)
+    if not sample_rate:
+        raise ProbeError("Fréquence d'échantillonnage inconnue")
+    duration = stream.get('duration') or container.get('duration')
+    bit_rate = stream.get('bit_rate') or container.get('bit_rate')
+
+    return {
+        'format': CONTAINER_FORMATS.get(container.get('format_name')),
+        'codec': stream.get('codec_name', ''),
+        'sample_rate': sample_rate,
+        'channels': int(stream.get('channels') or 0) or None,
+        'bit_rate': int(bit_rate) if bit_rate else None,
+        'duration': float(duration) if duration else 0.0,
+    }
+
+
+def apply_probe(recording, info):
+    """
+    Recopie le résultat de probe_audio sur l'enregistrement
+    Le format détecté remplace celui déclaré par le client
+    Retourne la liste des champs modifiés (pour save(update_fields=...))
+    """
+    if info['format']:
+        recording.format = info['format']
+    recording.codec = info['codec']
+    recording.sample_rate = info['sample_rate']
+    recording.channels = info['channels']
+    recording.bit_rate = info['bit_rate']
+    recording.duration_seconds = info['duration']
+    return list(PROBE_FIELDS)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Recording, UserSettings
+from .models import Recording, UserSettings, ProcessingJob, UploadSession
+from .probe import ProbeError, apply_probe, probe_audio
+import os
+import tempfile
 
 
 class UserSignupSerializer(serializers.ModelSerializer):
@@ -48,12 +51,19 @@ class RecordingSerializer(serializers.ModelSerializer):
         model = Recording
         fields = [
             'id', 'title', 'type', 'custom_name', 'file', 'file_url',
-            'format', 'sample_rate', 'duration_seconds',
+            'format', 'codec', 'sample_rate', 'channels', 'bit_rate', 'duration_seconds',
             'created_at', 'retained_until', 'is_expired',
             'vad_report', 'vad_summary',
-            'flagged', 'user'
+            'silence_percentage', 'total_silence_seconds', 'unnatural_silence_count',
+            'parent', 'part_index', 'offset_seconds', 'is_split',
+            'flagged', 'is_live', 'user'
+        ]
+        read_only_fields = [
+            'id', 'user', 'created_at', 'file_url', 'is_expired', 'vad_summary', 'is_live',
+            'codec', 'channels', 'bit_rate',
+            'silence_percentage', 'total_silence_seconds', 'unnatural_silence_count',
+            'parent', 'part_index', 'offset_seconds', 'is_split'
         ]
-        read_only_fields = ['id', 'user', 'created_at', 'file_url', 'is_expired', 'vad_summary']
     
     def get_file_url(self, obj):
         """Retourne l'URL complète du fichier"""
@@ -84,6 +94,24 @@ class RecordingSerializer(serializers.ModelSerializer):
         return value
 
 
+class RecordingListSerializer(RecordingSerializer):
+    """
+    Serializer compact pour la liste des enregistrements
+    Le rapport VAD complet (un objet par segment) n'est servi que par le détail
+    et par /api/recordings/{id}/vad/ ; la liste expose les colonnes de résumé.
+    """
+    class Meta(RecordingSerializer.Meta):
+        fields = [
+            'id', 'title', 'type', 'custom_name', 'file', 'file_url',
+            'format', 'codec', 'sample_rate', 'channels', 'bit_rate', 'duration_seconds',
+            'created_at', 'retained_until', 'is_expired',
+            'silence_percentage', 'total_silence_seconds', 'unnatural_silence_count',
+            'parent', 'part_index', 'offset_seconds', 'is_split',
+            'flagged', 'is_live', 'user'
+        ]
+        read_only_fields = fields
+
+
 class RecordingCreateSerializer(serializers.ModelSerializer):
     """
     Serializer pour la création d'enregistrements (upload)
@@ -91,11 +119,97 @@ class RecordingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recording
         fields = ['title', 'type', 'custom_name', 'file', 'format', 'retained_until']
+        extra_kwargs = {'format': {'required': False}}
+    
+    def validate_file(self, value):
+        """
+        Valide l'extension puis sonde les en-têtes du fichier (codec, fréquence,
+        canaux, débit, durée) : les fichiers corrompus sont refusés
+        """
+        from django.conf import settings
+        ext = value.name.split('.')[-1].lower()
+        if ext not in settings.ALLOWED_AUDIO_FORMATS:
+            raise serializers.ValidationError(
+                f"Format non autorisé. Formats acceptés: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}"
+            )
+        
+        try:
+            if hasattr(value, 'temporary_file_path'):
+                self.probe = probe_audio(value.temporary_file_path())
+            else:
+                # Petit fichier gardé en mémoire par Django : copie temporaire pour ffprobe
+                with tempfile.NamedTemporaryFile(suffix=f'.{ext}') as tmp:
+                    for chunk in value.chunks():
+                        tmp.write(chunk)
+                    tmp.flush()
+                    self.probe = probe_audio(tmp.name)
+        except ProbeError as e:
+            raise serializers.ValidationError(f"Fichier audio illisible: {e}")
+        finally:
+            value.seek(0)
+        return value
     
     def create(self, validated_data):
         """Crée l'enregistrement et associe l'utilisateur"""
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
+        recording = Recording(**validated_data)
+        if self.probe:
+            apply_probe(recording, self.probe)
+        recording.save()
+        return recording
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    """
+    Serializer pour l'ouverture d'un upload reprenable
+    La taille peut aussi être annoncée par l'en-tête Upload-Length
+    """
+    filename = serializers.CharField(max_length=255)
+    upload_length = serializers.IntegerField(min_value=1)
+    title = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    type = serializers.ChoiceField(choices=Recording.TYPE_CHOICES, required=False)
+    custom_name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    format = serializers.ChoiceField(choices=Recording.FORMAT_CHOICES, required=False)
+    retained_until = serializers.DateTimeField(required=False, allow_null=True)
+    
+    def validate_filename(self, value):
+        """Valide l'extension du fichier annoncé"""
+        from django.conf import settings
+        ext = value.rsplit('.', 1)[-1].lower() if '.' in value else ''
+        if ext not in settings.ALLOWED_AUDIO_FORMATS:
+            raise serializers.ValidationError(
+                f"Format non autorisé. Formats acceptés: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}"
+            )
+        return os.path.basename(value)
+    
+    def validate_upload_length(self, value):
+        """Refuse les fichiers plus gros que UPLOAD_MAX_SIZE"""
+        from django.conf import settings
+        if value > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Taille maximale: {settings.UPLOAD_MAX_SIZE} octets")
+        return value
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour l'état d'un upload reprenable
+    """
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'original_name', 'upload_length', 'offset', 'status', 'sha256',
+            'recording', 'created_at', 'updated_at', 'expires_at'
+        ]
+        read_only_fields = fields
+
+
+class RecordingLiveSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour l'ouverture d'une capture en direct (sans fichier)
+    """
+    class Meta:
+        model = Recording
+        fields = ['title', 'type', 'custom_name']
 
 
 class RecordingTrimSerializer(serializers.Serializer):
@@ -112,6 +226,19 @@ class RecordingTrimSerializer(serializers.Serializer):
         return data
 
 
+class ProcessingJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour l'état des jobs de traitement
+    """
+    class Meta:
+        model = ProcessingJob
+        fields = [
+            'id', 'kind', 'status', 'attempts', 'max_attempts', 'run_after',
+            'last_error', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+
 class UserSettingsSerializer(serializers.ModelSerializer):
     """
     Serializer pour les paramètres utilisateur
@@ -122,6 +249,7 @@ class UserSettingsSerializer(serializers.ModelSerializer):
             'id', 'storage_path', 'default_format', 'default_quality', 'default_sample_rate',
             'default_channels', 'auto_split_enabled', 'auto_split_duration_minutes',
             'retention_days', 'naming_template', 'vad_sensitivity', 'silence_threshold_seconds',
+            'energy_prefilter_enabled', 'energy_floor_dbfs',
             'email_alerts_enabled', 'email_host', 'email_port', 'email_user', 'email_password',
             'updated_at'
         ]
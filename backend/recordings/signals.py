@@ -0,0 +1,53 @@
+"""
+Mise à jour de la table RecordingDailyStats à chaque écriture d'un enregistrement
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Recording
+from .stats import recording_day, refresh_daily_stats
+
+
+# Champs dont dépendent les statistiques journalières
+STATS_FIELDS = {'type', 'flagged', 'duration_seconds', 'total_silence_seconds', 'created_at', 'user', 'is_split'}
+
+_stats_suspended = ContextVar('stats_suspended', default=False)
+
+
+@contextmanager
+def suspended_stats_updates():
+    """
+    Désactive la mise à jour par enregistrement (suppressions en masse) :
+    l'appelant recalcule ensuite une fois chaque bucket concerné
+    """
+    token = _stats_suspended.set(True)
+    try:
+        yield
+    finally:
+        _stats_suspended.reset(token)
+
+
+@receiver(post_save, sender=Recording)
+def recording_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Recalcule le bucket de l'enregistrement (et l'ancien si le type a changé)"""
+    if _stats_suspended.get():
+        return
+    if update_fields is not None and not STATS_FIELDS.intersection(update_fields):
+        return
+    
+    day = recording_day(instance)
+    refresh_daily_stats(instance.user_id, day, instance.type)
+    
+    previous_type = getattr(instance, '_loaded_type', None)
+    if previous_type and previous_type != instance.type:
+        refresh_daily_stats(instance.user_id, day, previous_type)
+    instance._loaded_type = instance.type
+
+
+@receiver(post_delete, sender=Recording)
+def recording_deleted(sender, instance, **kwargs):
+    """Retire l'enregistrement supprimé de son bucket"""
+    if _stats_suspended.get():
+        return
+    refresh_daily_stats(instance.user_id, recording_day(instance), instance.type)
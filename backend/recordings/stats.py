@@ -0,0 +1,136 @@
+"""
+Statistiques des enregistrements, servies depuis la table RecordingDailyStats
+(un enregistrement par utilisateur, jour et type) plutôt que depuis Recording
+
+Un enregistrement découpé (is_split) n'est pas compté : ses parties le sont.
+"""
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncWeek
+from django.utils import timezone
+from .models import Recording, RecordingDailyStats
+
+
+BUCKETS = ('day', 'week')
+
+
+def recording_day(recording):
+    """Jour (fuseau local) du bucket d'un enregistrement"""
+    return timezone.localdate(recording.created_at)
+
+
+def refresh_daily_stats(user_id, day, type):
+    """
+    Recalcule un bucket (utilisateur, jour, type) à partir des enregistrements
+    Une seule requête d'agrégat, bornée aux enregistrements de ce jour
+    """
+    totals = Recording.objects.filter(
+        user_id=user_id, type=type, created_at__date=day, is_split=False
+    ).aggregate(
+        count=Count('id'),
+        flagged_count=Count('id', filter=Q(flagged=True)),
+        total_duration_seconds=Coalesce(Sum('duration_seconds'), 0.0),
+        total_silence_seconds=Coalesce(Sum('total_silence_seconds'), 0.0),
+    )
+    
+    if not totals['count']:
+        RecordingDailyStats.objects.filter(user_id=user_id, day=day, type=type).delete()
+        return None
+    
+    stats, _ = RecordingDailyStats.objects.update_or_create(
+        user_id=user_id, day=day, type=type, defaults=totals
+    )
+    return stats
+
+
+def rebuild_daily_stats(user_id=None):
+    """
+    Reconstruit toute la table (ou les buckets d'un utilisateur) en une requête GROUP BY
+    """
+    recordings = Recording.objects.filter(is_split=False)
+    existing = RecordingDailyStats.objects.all()
+    if user_id is not None:
+        recordings = recordings.filter(user_id=user_id)
+        existing = existing.filter(user_id=user_id)
+    
+    rows = recordings.annotate(day=TruncDate('created_at')).values('user_id', 'day', 'type').annotate(
+        count=Count('id'),
+        flagged_count=Count('id', filter=Q(flagged=True)),
+        total_duration_seconds=Coalesce(Sum('duration_seconds'), 0.0),
+        total_silence_seconds=Coalesce(Sum('total_silence_seconds'), 0.0),
+    ).order_by()
+    
+    existing.delete()
+    created = RecordingDailyStats.objects.bulk_create(
+        [RecordingDailyStats(**row) for row in rows], batch_size=1000
+    )
+    return len(created)
+
+
+def user_summary(user):
+    """Totaux de l'utilisateur : une seule requête d'agrégat conditionnel sur les buckets"""
+    aggregates = {
+        'total': Coalesce(Sum('count'), 0),
+        'flagged': Coalesce(Sum('flagged_count'), 0),
+        'total_duration_seconds': Coalesce(Sum('total_duration_seconds'), 0.0),
+        'total_silence_seconds': Coalesce(Sum('total_silence_seconds'), 0.0),
+    }
+    for type, _ in Recording.TYPE_CHOICES:
+        aggregates[f'type_{type}'] = Coalesce(Sum('count', filter=Q(type=type)), 0)
+    
+    totals = RecordingDailyStats.objects.filter(user=user).aggregate(**aggregates)
+    
+    return {
+        'total': totals['total'],
+        'flagged': totals['flagged'],
+        'flagged_ratio': round(totals['flagged'] / totals['total'], 4) if totals['total'] else 0,
+        'by_type': {type: totals[f'type_{type}'] for type, _ in Recording.TYPE_CHOICES},
+        'total_duration_seconds': totals['total_duration_seconds'],
+        'total_silence_seconds': totals['total_silence_seconds'],
+    }
+
+
+def bucketed_stats(user, bucket='day', start=None, end=None):
+    """
+    Série temporelle par jour ou par semaine : nombre, ratio de marqués,
+    durée et minutes de silence, détail par type
+    """
+    queryset = RecordingDailyStats.objects.filter(user=user)
+    if start:
+        queryset = queryset.filter(day__gte=start)
+    if end:
+        queryset = queryset.filter(day__lte=end)
+    
+    if bucket == 'week':
+        queryset = queryset.annotate(period=TruncWeek('day'))
+    else:
+        queryset = queryset.annotate(period=F('day'))
+    
+    rows = queryset.values('period', 'type').annotate(
+        count=Sum('count'),
+        flagged=Sum('flagged_count'),
+        duration_seconds=Sum('total_duration_seconds'),
+        silence_seconds=Sum('total_silence_seconds'),
+    ).order_by('period', 'type')
+    
+    series = {}
+    for row in rows:
+        period = row['period']
+        entry = series.setdefault(period, {
+            'period': period.isoformat(),
+            'count': 0,
+            'flagged': 0,
+            'duration_seconds': 0.0,
+            'silence_minutes': 0.0,
+            'by_type': {},
+        })
+        entry['count'] += row['count']
+        entry['flagged'] += row['flagged']
+        entry['duration_seconds'] += row['duration_seconds']
+        entry['silence_minutes'] += row['silence_seconds'] / 60
+        entry['by_type'][row['type']] = row['count']
+    
+    for entry in series.values():
+        entry['flagged_ratio'] = round(entry['flagged'] / entry['count'], 4) if entry['count'] else 0
+        entry['silence_minutes'] = round(entry['silence_minutes'], 2)
+    
+    return list(series.values())
@@ -2,27 +2,43 @@
 Fonctions de traitement des enregistrements audio (synchrones, sans Celery)
 Traitement: Normalisation, détection VAD, détection de silences non naturels, alertes email
 """
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from django.utils import timezone
-from django.core.mail import send_mail
 from django.conf import settings
-from .models import Recording, UserSettings
+from django.db import transaction
+from .models import LiveSegment, Recording, RecordingAnalysis, UserSettings
+from . import peaks, vad, vad_cache
+from .alerts import enqueue_alert
+from .metrics import StageTimer, record_processing
+from .probe import ProbeError, apply_probe, probe_audio
+from .signals import suspended_stats_updates
+from .stats import rebuild_daily_stats, recording_day, refresh_daily_stats
+import hashlib
 import os
-import json
-import webrtcvad
+import tempfile
+import uuid
 import numpy as np
 import ffmpeg
-import wave
 
 
-def process_recording(recording_id):
+def process_recording(recording_id, source_sha256=None):
     """
     Traite un enregistrement audio :
-    - Normalisation audio avec ffmpeg
+    - Décodage ffmpeg en PCM 16 kHz mono (pipe, sans fichier intermédiaire)
     - Détection de voix (VAD) avec webrtcvad
+    - Pics de forme d'onde multi-résolution (même passe de décodage)
     - Détection de blancs naturels/non naturels
     - Alertes email pour silences détectés
+    
+    source_sha256: empreinte du fichier déjà calculée (upload reprenable),
+    évite de relire le fichier
+    
+    La durée de chaque étape est enregistrée dans ProcessingStats et exportée
+    par /api/metrics (voir recordings/metrics.py)
     """
     try:
+        timer = StageTimer()
         recording = Recording.objects.get(id=recording_id)
         
         if not recording.file:
@@ -36,44 +52,87 @@ def process_recording(recording_id):
         
         file_path = recording.file.path
         
-        # 1. Normalisation audio avec ffmpeg
-        normalized_path = normalize_audio(file_path, recording.format)
+        # 1. Paramètres VAD de l'utilisateur
+        vad_sensitivity, silence_threshold, energy_floor_dbfs = get_vad_settings(recording.user)
         
-        # 2. Extraction des métadonnées audio
-        audio_info = extract_audio_info(normalized_path)
-        recording.sample_rate = audio_info.get('sample_rate', 44100)
-        recording.duration_seconds = audio_info.get('duration', 0.0)
+        # 2. Décodage ffmpeg (pipe) + détection de voix (VAD) en une seule passe
+        #    (analyse parallèle si VAD_PARALLEL_WORKERS > 1), sauf si les
+        #    décisions VAD de cet audio sont déjà en cache
+        if not source_sha256:
+            with timer.stage('hash'):
+                source_sha256 = file_sha256(file_path)
+            timer.add_read(file_path)
+        peak_builder = peaks.PeakBuilder(vad.ANALYSIS_SAMPLE_RATE)
+        with timer.stage('decode_vad'):
+            vad_report, pcm_sha256, decisions = analyze_with_cache(
+                file_path, source_sha256, vad_sensitivity, energy_floor_dbfs, settings.VAD_PARALLEL_WORKERS,
+                peaks=peak_builder
+            )
+        cache_hit = bool(vad_report) and not peak_builder.total_samples
+        if peak_builder.total_samples:
+            timer.add_read(file_path)
+        recording.source_sha256 = source_sha256
+        recording.pcm_sha256 = pcm_sha256
+        update_fields = ['source_sha256', 'pcm_sha256']
         
-        # 3. Détection de voix (VAD) - Utiliser les settings utilisateur
-        vad_sensitivity = 2
-        silence_threshold = 5.0
-        try:
-            user_settings = recording.user.user_settings
-            vad_sensitivity = user_settings.vad_sensitivity
-            silence_threshold = user_settings.silence_threshold_seconds
-        except UserSettings.DoesNotExist:
-            pass
+        # Décisions brutes (1 bit par trame) à côté du fichier, pour les
+        # réanalyses et la timeline sans nouveau décodage
+        with timer.stage('sidecars'):
+            if decisions is not None:
+                vad.write_decisions(vad.decisions_sidecar_path(file_path), decisions)
+            
+            # Pics de forme d'onde pour le lecteur (décodage dédié seulement si
+            # le rapport VAD venait du cache et qu'aucun fichier de pics n'existe)
+            peaks_path = peaks.peaks_sidecar_path(file_path)
+            if peak_builder.total_samples:
+                peak_builder.write(peaks_path)
+            elif vad_report and not os.path.exists(peaks_path):
+                peaks.compute_file_peaks(
+                    vad.iter_ffmpeg_blocks(file_path, vad.ANALYSIS_SAMPLE_RATE), vad.ANALYSIS_SAMPLE_RATE, peaks_path
+                )
+                timer.add_read(file_path)
         
-        vad_report = detect_voice_activity(normalized_path, recording.sample_rate, vad_sensitivity)
-        recording.vad_report = vad_report
+        # 3. En-têtes du fichier source (normalement sondés à l'upload) et
+        #    durée exacte à partir du nombre d'échantillons décodés
+        if not recording.codec:
+            try:
+                with timer.stage('probe'):
+                    info = probe_audio(file_path)
+                if info:
+                    update_fields += apply_probe(recording, info)
+            except ProbeError as e:
+                print(f"En-têtes illisibles pour l'enregistrement {recording_id}: {e}")
+        if vad_report:
+            recording.duration_seconds = vad_report['total_duration']
+            update_fields.append('duration_seconds')
         
         # 4. Détection de blancs non naturels avec seuil personnalisé
-        unnatural_silences = detect_unnatural_silences(vad_report, min_silence_duration=silence_threshold)
+        with timer.stage('silences'):
+            unnatural_silences = detect_unnatural_silences(vad_report, min_silence_duration=silence_threshold)
+        recording.flagged = bool(unnatural_silences)
+        update_fields.append('flagged')
         if unnatural_silences:
-            recording.flagged = True
-            recording.vad_report['unnatural_silences'] = unnatural_silences
-            # Envoyer une alerte email si configuré
-            try:
-                user_settings = recording.user.user_settings
-                if user_settings.email_alerts_enabled:
-                    send_alert_email(recording_id, unnatural_silences)
-            except UserSettings.DoesNotExist:
-                if settings.EMAIL_HOST:
-                    send_alert_email(recording_id, unnatural_silences)
+            vad_report['unnatural_silences'] = unnatural_silences
+        # Alerte email si configuré ; les alertes encore en attente d'un
+        # traitement précédent sont remplacées (supprimées si plus aucun blanc)
+        with timer.stage('alerts'):
+            notify_unnatural_silences(recording, unnatural_silences, replace_pending=True)
         
-        recording.save()
+        # 5. Seuls les champs calculés par le traitement sont écrits: un
+        #    renommage ou un trim concurrent n'est pas écrasé
+        with timer.stage('save'):
+            save_analysis(recording, vad_report, update_fields)
+        
+        # 6. Mesures du traitement (ProcessingStats + histogrammes /api/metrics)
+        audio_seconds = vad_report.get('total_duration', 0) if vad_report else 0
+        try:
+            realtime_factor = record_processing(recording, timer, audio_seconds, cache_hit=cache_hit)
+        except Exception as e:
+            realtime_factor = None
+            print(f"Mesures non enregistrées pour l'enregistrement {recording_id}: {str(e)}")
         
-        print(f"Traitement terminé pour l'enregistrement {recording_id}")
+        rtf = f", facteur temps réel {realtime_factor:.4f}" if realtime_factor is not None else ""
+        print(f"Traitement terminé pour l'enregistrement {recording_id} en {timer.elapsed():.2f}s{rtf}")
         
     except Recording.DoesNotExist:
         print(f"Enregistrement {recording_id} introuvable")
@@ -84,149 +143,461 @@ def process_recording(recording_id):
         raise
 
 
-def normalize_audio(file_path, output_format='wav'):
+def split_recording(recording_id, source_sha256=None):
     """
-    Normalise l'audio avec ffmpeg (conversion en WAV 16kHz mono pour VAD)
+    Découpage automatique d'un long enregistrement en parties de
+    UserSettings.auto_split_duration_minutes, par copie de flux (sans ré-encodage)
+    
+    Chaque partie devient un Recording enfant (parent, part_index,
+    offset_seconds) traité par son propre job : l'analyse VAD et les
+    téléchargements portent sur de petites unités indépendantes, traitées
+    en parallèle par les workers. Un enregistrement plus court qu'une partie
+    (ou un découpage désactivé) est traité directement (source_sha256 est
+    alors transmis à process_recording).
     """
-    output_path = file_path.replace(f'.{output_format}', '_normalized.wav')
+    from .jobs import enqueue_job
     
     try:
-        (
-            ffmpeg
-            .input(file_path)
-            .output(
-                output_path,
-                acodec='pcm_s16le',
-                ac=1,  # Mono
-                ar=16000,  # 16kHz pour VAD
-            )
-            .overwrite_output()
-            .run(quiet=True)
-        )
-        return output_path
+        recording = Recording.objects.get(id=recording_id)
+        
+        if not recording.file or not os.path.exists(recording.file.path):
+            print(f"Fichier physique non trouvé pour l'enregistrement {recording_id}")
+            return
+        
+        split_minutes = None
+        try:
+            user_settings = recording.user.user_settings
+            if user_settings.auto_split_enabled and user_settings.auto_split_duration_minutes > 0:
+                split_minutes = user_settings.auto_split_duration_minutes
+        except UserSettings.DoesNotExist:
+            pass
+        
+        # Durée sondée à l'upload : un fichier plus court qu'une partie est
+        # traité sans lancer le découpage
+        short = bool(split_minutes and recording.codec and recording.duration_seconds <= split_minutes * 60)
+        if split_minutes is None or short or recording.parent_id or recording.is_split:
+            process_recording(recording_id, source_sha256)
+            return
+        
+        file_path = recording.file.path
+        base, ext = os.path.splitext(os.path.basename(file_path))
+        
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(file_path)) as tmpdir:
+            segments = cut_segments(file_path, tmpdir, split_minutes * 60, ext)
+            
+            if len(segments) <= 1:
+                # Plus court qu'une partie : pas de découpage
+                process_recording(recording_id, source_sha256)
+                return
+            
+            parts = []
+            for index, (segment_path, start, end) in enumerate(segments):
+                part_name = f'{base}_part{index + 1:03d}{ext}'
+                os.replace(segment_path, os.path.join(os.path.dirname(file_path), part_name))
+                part = Recording(
+                    user=recording.user,
+                    parent=recording,
+                    part_index=index,
+                    offset_seconds=start,
+                    duration_seconds=end - start,
+                    title=f"{recording.title} ({index + 1}/{len(segments)})" if recording.title else '',
+                    type=recording.type,
+                    custom_name=f"{recording.custom_name}-{index + 1:03d}" if recording.custom_name else '',
+                    format=recording.format,
+                    codec=recording.codec,
+                    sample_rate=recording.sample_rate,
+                    channels=recording.channels,
+                    bit_rate=recording.bit_rate,
+                    retained_until=recording.retained_until,
+                )
+                part.file.name = os.path.join(os.path.dirname(recording.file.name), part_name)
+                parts.append(part)
+        
+        with transaction.atomic():
+            for part in parts:
+                part.save()
+            recording.is_split = True
+            recording.duration_seconds = segments[-1][2]
+            recording.save(update_fields=['is_split', 'duration_seconds'])
+        
+        # Une analyse par partie, réparties entre les workers
+        for part in parts:
+            enqueue_job(part, 'process', force=True)
+        
+        print(f"Enregistrement {recording_id} découpé en {len(parts)} parties de {split_minutes} min")
+        
+    except Recording.DoesNotExist:
+        print(f"Enregistrement {recording_id} introuvable")
     except Exception as e:
-        print(f"Erreur lors de la normalisation: {e}")
-        return file_path
+        print(f"Erreur lors du découpage de l'enregistrement {recording_id}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise
 
 
-def extract_audio_info(file_path):
+def cut_segments(file_path, output_dir, segment_seconds, ext):
     """
-    Extrait les métadonnées audio (sample rate, durée)
+    Découpe file_path en segments de segment_seconds avec le muxer segment
+    de ffmpeg (-c copy) et retourne [(chemin, début, fin), ...]
+    Les bornes sont celles écrites par ffmpeg dans la liste CSV des segments
+    (coupes alignées sur les paquets audio).
     """
-    try:
-        probe = ffmpeg.probe(file_path)
-        audio_stream = next((s for s in probe['streams'] if s['codec_type'] == 'audio'), None)
-        
-        if audio_stream:
-            sample_rate = int(audio_stream.get('sample_rate', 44100))
-            duration = float(probe.get('format', {}).get('duration', 0))
-            return {
-                'sample_rate': sample_rate,
-                'duration': duration
-            }
-    except Exception as e:
-        print(f"Erreur lors de l'extraction des métadonnées: {e}")
+    list_path = os.path.join(output_dir, 'segments.csv')
+    (
+        ffmpeg
+        .input(file_path)
+        .output(
+            os.path.join(output_dir, f'part_%04d{ext}'),
+            f='segment',
+            segment_time=segment_seconds,
+            segment_list=list_path,
+            segment_list_type='csv',
+            reset_timestamps=1,
+            map='0:a',
+            acodec='copy',
+        )
+        .global_args('-nostdin', '-loglevel', 'error')
+        .overwrite_output()
+        .run(quiet=True)
+    )
     
-    return {'sample_rate': 44100, 'duration': 0.0}
+    segments = []
+    with open(list_path) as f:
+        for line in f:
+            name, start, end = line.strip().rsplit(',', 2)
+            segments.append((os.path.join(output_dir, name), float(start), float(end)))
+    return segments
+
+
+def get_vad_settings(user):
+    """
+    Paramètres VAD de l'utilisateur
+    Retourne (sensibilité, seuil de silence anormal, plancher du pré-filtre ou None)
+    """
+    vad_sensitivity = 2
+    silence_threshold = 5.0
+    energy_floor_dbfs = None
+    try:
+        user_settings = user.user_settings
+        vad_sensitivity = user_settings.vad_sensitivity
+        silence_threshold = user_settings.silence_threshold_seconds
+        if user_settings.energy_prefilter_enabled:
+            energy_floor_dbfs = user_settings.energy_floor_dbfs
+    except UserSettings.DoesNotExist:
+        pass
+    return vad_sensitivity, silence_threshold, energy_floor_dbfs
+
+
+def notify_unnatural_silences(recording, unnatural_silences, replace_pending=False):
+    """
+    Place une alerte email dans la boîte d'envoi si l'utilisateur (ou la config
+    globale) l'autorise ; l'envoi est fait par manage.py send_alerts
+    replace_pending: remplace les alertes non envoyées de l'enregistrement
+    (liste complète des blancs, voir enqueue_alert)
+    """
+    enqueue_alert(recording, unnatural_silences, replace_pending=replace_pending)
+
+
+class RecordingNotLive(Exception):
+    """L'enregistrement n'est pas (ou plus) une capture en direct"""
 
 
-def detect_voice_activity(file_path, sample_rate=16000, sensitivity=2):
+def append_recording_chunk(recording_id, chunk_path=None, final=False):
     """
-    Détecte l'activité vocale avec webrtcvad
-    Retourne un rapport avec les périodes de voix et de silence
+    Ajoute un morceau audio à un enregistrement en direct (is_live) :
+    - Décodage du morceau seul en PCM 16 kHz mono, ajouté au WAV de l'enregistrement
+    - Reprise de l'analyse VAD à partir de l'état sauvegardé (vad_state) :
+      seul le nouvel audio est analysé, après ré-amorçage de webrtcvad sur
+      les OVERLAP_SECONDS précédentes
+    - Seuls les segments clos par ce morceau sont enregistrés (LiveSegment),
+      les compteurs du rapport sont tenus dans vad_state
+    - Alerte dès qu'un silence dépasse le seuil, sans attendre la fin de la capture
+    
+    Le décodage du morceau et le ré-amorçage se font hors verrou. La lecture
+    de l'état, l'ajout au WAV et l'enregistrement du nouvel état se font sous
+    verrou de la ligne Recording (select_for_update ; avec SQLite, BEGIN
+    IMMEDIATE) : deux morceaux envoyés en même temps sont traités l'un après
+    l'autre. Si un autre morceau est passé entre-temps, le ré-amorçage est
+    refait sous verrou (au plus OVERLAP_SECONDS d'audio).
     
     Args:
-        file_path: Chemin vers le fichier audio
-        sample_rate: Taux d'échantillonnage
-        sensitivity: Niveau d'agressivité VAD (0-3)
+        recording_id: Enregistrement ouvert par l'API live
+        chunk_path: Fichier audio autonome (tout format lu par ffmpeg), ou None
+        final: Clôture la capture (le segment en cours est fermé)
+    
+    Raises:
+        RecordingNotLive: la capture a été clôturée entre-temps
     """
-    vad = webrtcvad.Vad(sensitivity)  # Niveau d'agressivité (0-3)
+    sample_rate = vad.ANALYSIS_SAMPLE_RATE
     
-    try:
-        # Lire le fichier WAV avec wave
-        with wave.open(file_path, 'rb') as wf:
-            frames = wf.readframes(wf.getnframes())
-            audio_data = np.frombuffer(frames, dtype=np.int16)
-        
-        # Convertir en chunks de 10ms, 20ms ou 30ms (requis par VAD)
-        frame_duration_ms = 30
-        frame_size = int(sample_rate * frame_duration_ms / 1000)
+    # Décodage complet du morceau avant écriture (hors verrou): un morceau
+    # illisible ne modifie pas le fichier
+    samples = None
+    if chunk_path:
+        blocks = list(vad.iter_ffmpeg_blocks(chunk_path, sample_rate))
+        if blocks:
+            samples = np.concatenate(blocks)
+    
+    # Ré-amorçage hors verrou, à partir de l'état lu sans verrou
+    recording = Recording.objects.get(id=recording_id)
+    if not recording.is_live:
+        raise RecordingNotLive(f"L'enregistrement {recording_id} n'est pas une capture en cours")
+    vad_sensitivity, silence_threshold, energy_floor_dbfs = get_vad_settings(recording.user)
+    primed_state = recording.vad_state
+    analyzer = _resume_live_analyzer(recording, vad_sensitivity, energy_floor_dbfs)
+    
+    with transaction.atomic():
+        recording = Recording.objects.select_for_update().get(id=recording_id)
+        if not recording.is_live:
+            raise RecordingNotLive(f"L'enregistrement {recording_id} n'est pas une capture en cours")
+        if recording.vad_state != primed_state:
+            # Un autre morceau a été ajouté pendant le ré-amorçage
+            analyzer = _resume_live_analyzer(recording, vad_sensitivity, energy_floor_dbfs)
         
-        voice_segments = []
-        silence_segments = []
-        is_speaking = False
-        segment_start = 0
+        if samples is not None:
+            analyzer.feed(samples)
         
-        total_silence_seconds = 0
+        # Rapport des seuls segments clos par ce morceau (compteurs cumulés)
+        vad_report = analyzer.finish() if final else analyzer.report()
+        new_silences = detect_unnatural_silences(vad_report, min_silence_duration=silence_threshold)
+        unnatural_silences = recording.vad_report.get('unnatural_silences', []) + new_silences
         
-        for i in range(0, len(audio_data), frame_size):
-            chunk = audio_data[i:i + frame_size]
-            
-            # Convertir en bytes pour VAD
-            if len(chunk) < frame_size:
-                break
-            
-            chunk_bytes = chunk.astype(np.int16).tobytes()
-            
-            # Détecter si c'est de la voix
-            is_voice = vad.is_speech(chunk_bytes, sample_rate)
-            current_time = i / sample_rate
-            
-            if is_voice and not is_speaking:
-                # Début de parole
-                if segment_start > 0:
-                    silence_segments.append({
-                        'start': segment_start,
-                        'end': current_time,
-                        'duration': current_time - segment_start
-                    })
-                    total_silence_seconds += (current_time - segment_start)
-                is_speaking = True
-                segment_start = current_time
-            elif not is_voice and is_speaking:
-                # Fin de parole
-                voice_segments.append({
-                    'start': segment_start,
+        # Silence toujours en cours à la fin du morceau
+        segmenter = analyzer.segmenter
+        current_time = analyzer.total_samples / sample_rate
+        ongoing = []
+        if not final and not segmenter.is_speaking and segmenter.segment_start > 0:
+            if current_time - segmenter.segment_start >= silence_threshold:
+                ongoing.append({
+                    'start': segmenter.segment_start,
                     'end': current_time,
-                    'duration': current_time - segment_start
-                })
-                is_speaking = False
-                segment_start = current_time
-        
-        # Fin du fichier
-        if is_speaking:
-            voice_segments.append({
-                'start': segment_start,
-                'end': len(audio_data) / sample_rate,
-                'duration': len(audio_data) / sample_rate - segment_start
-            })
-        else:
-            if segment_start > 0:
-                silence_segments.append({
-                    'start': segment_start,
-                    'end': len(audio_data) / sample_rate,
-                    'duration': len(audio_data) / sample_rate - segment_start
+                    'duration': current_time - segmenter.segment_start,
+                    'reason': 'Silence en cours'
                 })
-                total_silence_seconds += (len(audio_data) / sample_rate - segment_start)
         
-        total_duration = len(audio_data) / sample_rate
-        silence_percentage = (total_silence_seconds / total_duration * 100) if total_duration > 0 else 0
+        # Alerter une seule fois par silence (même s'il continue sur les morceaux suivants)
+        last_alerted_start = recording.vad_state.get('last_alerted_start', -1)
+        new_alerts = [s for s in new_silences + ongoing if s['start'] > last_alerted_start]
+        if new_alerts:
+            last_alerted_start = max(s['start'] for s in new_alerts)
+            notify_unnatural_silences(recording, new_alerts)
+        
+        if unnatural_silences:
+            vad_report['unnatural_silences'] = unnatural_silences
+        if unnatural_silences or ongoing:
+            recording.flagged = True
         
+        vad_state = {}
+        if not final:
+            vad_state = analyzer.get_state()
+            vad_state['last_alerted_start'] = last_alerted_start
+        
+        if samples is not None:
+            vad.append_pcm_to_wav(recording.file.path, samples)
+        recording.vad_state = vad_state
+        recording.is_live = not final
+        recording.sample_rate = sample_rate
+        recording.duration_seconds = current_time
+        save_live_analysis(
+            recording, vad_report, ['vad_state', 'is_live', 'sample_rate', 'duration_seconds', 'flagged']
+        )
+    return recording
+
+
+def _resume_live_analyzer(recording, sensitivity, energy_floor_dbfs):
+    """StreamAnalyzer repris de vad_state (sans les segments), ré-amorcé sur la fin du WAV"""
+    sample_rate = vad.ANALYSIS_SAMPLE_RATE
+    analyzer = vad.StreamAnalyzer.restore(
+        recording.vad_state, None, sample_rate, sensitivity, energy_floor_dbfs
+    )
+    analyzed = analyzer.analyzed_samples()
+    if analyzed:
+        warmup_start = max(0, analyzed - vad.OVERLAP_SECONDS * sample_rate)
+        analyzer.warm_up(vad.read_wav_samples(recording.file.path, warmup_start, analyzed))
+    return analyzer
+
+
+def save_live_analysis(recording, vad_report, update_fields):
+    """
+    Enregistre l'analyse d'un morceau de capture en direct
+    
+    vad_report ne contient que les segments clos par ce morceau : ils sont
+    ajoutés (LiveSegment) sans relire ni réécrire les précédents. À la
+    clôture (is_live=False), les segments de la capture sont regroupés une
+    fois pour toutes dans RecordingAnalysis.
+    """
+    new_segments = LiveSegment.from_report(recording.id, vad_report)
+    recording.set_vad_report(vad_report)
+    update_fields = list(update_fields) + ['vad_report'] + recording.update_vad_summary()
+    with transaction.atomic():
+        LiveSegment.objects.bulk_create(new_segments)
+        if not recording.is_live:
+            RecordingAnalysis.objects.update_or_create(
+                recording_id=recording.id, defaults=LiveSegment.segment_lists(recording.id)
+            )
+            LiveSegment.objects.filter(recording_id=recording.id).delete()
+        recording.save(update_fields=update_fields)
+
+
+def analyze_audio_file(file_path, sensitivity=2, energy_floor_dbfs=None, workers=1, peaks=None):
+    """
+    Décode le fichier et calcule les décisions VAD trame par trame
+    
+    - workers <= 1: ffmpeg décode en PCM s16le sur pipe:1 et les trames sont
+      envoyées directement à webrtcvad au fil du décodage, sans _normalized.wav
+    - workers > 1: le fichier est décodé en PCM brut temporaire puis analysé
+      par shards dans un pool de processus (vad.classify_pcm_file_parallel)
+      s'il dure plus de VAD_PARALLEL_MIN_SECONDS. Chaque shard repart d'une
+      nouvelle instance webrtcvad : les décisions sont proches de l'analyse
+      séquentielle mais pas identiques (quelques trames autour des transitions)
+    
+    Args:
+        file_path: Chemin vers le fichier audio original (tout format lu par ffmpeg)
+        sensitivity: Niveau d'agressivité VAD (0-3)
+        energy_floor_dbfs: Plancher du pré-filtre d'énergie (None = désactivé)
+        workers: Nombre de processus pour l'analyse parallèle
+        peaks: PeakBuilder alimenté avec les mêmes blocs PCM (optionnel)
+    
+    Returns:
+        dict (report, decisions, pcm_sha256, total_samples, skipped_frames,
+        shards: (shard_seconds, overlap_seconds) si l'analyse a été découpée, sinon None)
+    
+    Raises:
+        RuntimeError, ffmpeg.Error: fichier illisible ou décodage interrompu.
+        L'erreur remonte jusqu'au job, qui est replanifié (fail_job) sans
+        écraser l'analyse précédente de l'enregistrement.
+    """
+    if workers and workers > 1:
+        return _analyze_audio_file_parallel(file_path, sensitivity, energy_floor_dbfs, workers, peaks)
+    
+    analyzer = vad.StreamAnalyzer(
+        vad.ANALYSIS_SAMPLE_RATE, sensitivity, energy_floor_dbfs=energy_floor_dbfs, keep_decisions=True
+    )
+    for block in vad.iter_ffmpeg_blocks(file_path, vad.ANALYSIS_SAMPLE_RATE):
+        analyzer.feed(block)
+        if peaks is not None:
+            peaks.feed(block)
+    return _analysis_result(analyzer)
+
+
+def _analyze_audio_file_parallel(file_path, sensitivity, energy_floor_dbfs, workers, peaks=None):
+    """Analyse via un fichier PCM brut temporaire (voir analyze_audio_file)"""
+    sample_rate = vad.ANALYSIS_SAMPLE_RATE
+    with tempfile.TemporaryDirectory(prefix='vad-') as tmp_dir:
+        pcm_path = vad.decode_to_pcm_file(file_path, os.path.join(tmp_dir, 'audio.pcm'), sample_rate)
+        total_samples = os.path.getsize(pcm_path) // 2
+        
+        if total_samples / sample_rate < settings.VAD_PARALLEL_MIN_SECONDS:
+            analyzer = vad.StreamAnalyzer(
+                sample_rate, sensitivity, energy_floor_dbfs=energy_floor_dbfs, keep_decisions=True
+            )
+            for block in vad.iter_pcm_file_blocks(pcm_path, vad.frame_size_for(sample_rate)):
+                analyzer.feed(block)
+                if peaks is not None:
+                    peaks.feed(block)
+            return _analysis_result(analyzer)
+        
+        if peaks is not None:
+            # Lecture séquentielle du PCM déjà décodé (pas de second décodage)
+            for block in vad.iter_pcm_file_blocks(pcm_path, vad.frame_size_for(sample_rate)):
+                peaks.feed(block)
+        
+        decisions, skipped_frames = vad.classify_pcm_file_parallel(
+            pcm_path, sample_rate, sensitivity, workers, energy_floor_dbfs=energy_floor_dbfs
+        )
         return {
-            'voice_segments': voice_segments,
-            'silence_segments': silence_segments,
-            'total_silence_seconds': total_silence_seconds,
-            'total_duration': total_duration,
-            'silence_percentage': round(silence_percentage, 2),
-            'voice_segments_count': len(voice_segments),
-            'silence_segments_count': len(silence_segments),
+            'report': vad.report_from_decisions(
+                decisions, total_samples, sample_rate,
+                energy_floor_dbfs=energy_floor_dbfs, skipped_frames=skipped_frames
+            ),
+            'decisions': decisions,
+            'pcm_sha256': file_sha256(pcm_path),
+            'total_samples': total_samples,
+            'skipped_frames': skipped_frames,
+            'shards': (vad.SHARD_SECONDS, vad.OVERLAP_SECONDS),
         }
+
+
+def _analysis_result(analyzer):
+    """Résultat d'analyse_audio_file à partir d'un StreamAnalyzer terminé"""
+    return {
+        'report': analyzer.finish(),
+        'decisions': analyzer.decisions(),
+        'pcm_sha256': analyzer.pcm_sha256(),
+        'total_samples': analyzer.total_samples,
+        'skipped_frames': analyzer.skipped_frames,
+        'shards': None,
+    }
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """Empreinte SHA-256 d'un fichier, lu par blocs"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def analyze_with_cache(file_path, source_sha256, sensitivity=2, energy_floor_dbfs=None, workers=1, peaks=None):
+    """
+    Rapport VAD d'un fichier, en réutilisant le cache VadCache si possible
     
-    except Exception as e:
-        print(f"Erreur lors de la détection VAD: {e}")
-        import traceback
-        traceback.print_exc()
-        return {}
+    Si un enregistrement aux octets identiques (source_sha256) a déjà été
+    décodé, l'empreinte de son PCM permet de retrouver les décisions VAD en
+    cache : le rapport est reconstruit sans décoder l'audio (peaks n'est
+    alors pas alimenté). Les décisions de l'analyse séquentielle conviennent
+    toujours ; celles d'une analyse par shards seulement si workers > 1.
+    
+    Returns:
+        (rapport VAD, empreinte SHA-256 du PCM ou '', décisions trame par trame ou None)
+    """
+    sample_rate = vad.ANALYSIS_SAMPLE_RATE
+    pcm_sha256 = (
+        Recording.objects.filter(source_sha256=source_sha256)
+        .exclude(pcm_sha256='')
+        .values_list('pcm_sha256', flat=True)
+        .first()
+    )
+    if pcm_sha256:
+        cached = vad_cache.lookup(pcm_sha256, sample_rate, sensitivity, vad.FRAME_DURATION_MS, energy_floor_dbfs)
+        if not cached and workers and workers > 1:
+            cached = vad_cache.lookup(
+                pcm_sha256, sample_rate, sensitivity, vad.FRAME_DURATION_MS, energy_floor_dbfs,
+                shards=(vad.SHARD_SECONDS, vad.OVERLAP_SECONDS)
+            )
+        if cached:
+            decisions = cached.get_decisions()
+            report = vad.report_from_decisions(
+                decisions, cached.total_samples, sample_rate,
+                energy_floor_dbfs=energy_floor_dbfs, skipped_frames=cached.skipped_frames
+            )
+            return report, pcm_sha256, decisions
+    
+    analysis = analyze_audio_file(file_path, sensitivity, energy_floor_dbfs, workers, peaks)
+    vad_cache.store(
+        analysis['pcm_sha256'], sample_rate, sensitivity, vad.FRAME_DURATION_MS, energy_floor_dbfs,
+        analysis['decisions'], analysis['total_samples'], analysis['skipped_frames'], shards=analysis['shards']
+    )
+    return analysis['report'], analysis['pcm_sha256'], analysis['decisions']
+
+
+def save_analysis(recording, vad_report, update_fields):
+    """
+    Enregistre le résultat d'une analyse VAD
+    
+    Le résumé (vad_report sans les segments) et les colonnes de résumé sont
+    écrits avec les champs update_fields par un UPDATE ciblé ; les listes de
+    segments vont dans RecordingAnalysis, dans la même transaction.
+    """
+    segments = recording.set_vad_report(vad_report)
+    update_fields = list(update_fields) + ['vad_report'] + recording.update_vad_summary()
+    with transaction.atomic():
+        if segments is None:
+            RecordingAnalysis.objects.filter(recording_id=recording.id).delete()
+        else:
+            RecordingAnalysis.objects.update_or_create(recording_id=recording.id, defaults=segments)
+        recording.save(update_fields=update_fields)
 
 
 def detect_unnatural_silences(vad_report, min_silence_duration=5.0):
@@ -250,9 +621,150 @@ def detect_unnatural_silences(vad_report, min_silence_duration=5.0):
     return unnatural_silences
 
 
-def trim_recording_task(recording_id, start_time, end_time):
+# Champs écrits par reevaluate_silences (bulk_update)
+REEVALUATE_FIELDS = [
+    'vad_report', 'flagged', 'silence_percentage', 'total_silence_seconds', 'unnatural_silence_count'
+]
+
+
+def reevaluate_silences(user_id, silence_threshold=None, batch_size=1000):
+    """
+    Recalcule flagged / unnatural_silences de tous les enregistrements d'un
+    utilisateur à partir des silence_segments déjà stockés, sans décoder
+    l'audio (après un changement de silence_threshold_seconds)
+    
+    Args:
+        user_id: Utilisateur concerné
+        silence_threshold: Seuil en secondes (défaut: celui des settings utilisateur)
+        batch_size: Nombre de lignes lues et écrites par lot (bulk_update)
+    
+    Returns:
+        dict: processed, updated, flagged
+    """
+    if silence_threshold is None:
+        user_settings = UserSettings.objects.filter(user_id=user_id).first()
+        silence_threshold = user_settings.silence_threshold_seconds if user_settings else 5.0
+    
+    queryset = (
+        Recording.objects.filter(user_id=user_id, is_live=False)
+        .only('id', 'vad_report', 'flagged')
+        .order_by('id')
+    )
+    
+    stats = {'processed': 0, 'updated': 0, 'flagged': 0}
+    batch = []
+    recordings = queryset.iterator(chunk_size=batch_size)
+    while True:
+        chunk = [recording for recording in islice(recordings, batch_size) if recording.vad_report]
+        if not chunk:
+            break
+        # Segments de silence du lot lus en une requête dans RecordingAnalysis
+        silences = dict(
+            RecordingAnalysis.objects.filter(recording_id__in=[recording.id for recording in chunk])
+            .values_list('recording_id', 'silence_segments')
+        )
+        for recording in chunk:
+            stats['processed'] += 1
+            batch.extend(_reevaluate_recording(recording, silences.get(recording.id, []), silence_threshold, stats))
+        
+        if len(batch) >= batch_size:
+            Recording.objects.bulk_update(batch, REEVALUATE_FIELDS)
+            stats['updated'] += len(batch)
+            batch = []
+    
+    if batch:
+        Recording.objects.bulk_update(batch, REEVALUATE_FIELDS)
+        stats['updated'] += len(batch)
+    
+    # bulk_update n'émet pas de signal post_save : statistiques journalières recalculées en bloc
+    if stats['updated']:
+        rebuild_daily_stats(user_id)
+    
+    return stats
+
+
+def _reevaluate_recording(recording, silence_segments, silence_threshold, stats):
+    """
+    Recalcule les silences anormaux d'un enregistrement (reevaluate_silences)
+    Retourne [recording] s'il a changé, [] sinon
+    """
+    unnatural_silences = detect_unnatural_silences(
+        {'silence_segments': silence_segments}, min_silence_duration=silence_threshold
+    )
+    flagged = bool(unnatural_silences)
+    stats['flagged'] += flagged
+    
+    if unnatural_silences == recording.vad_report.get('unnatural_silences', []) and flagged == recording.flagged:
+        return []
+    if unnatural_silences:
+        recording.vad_report['unnatural_silences'] = unnatural_silences
+    else:
+        recording.vad_report.pop('unnatural_silences', None)
+    recording.flagged = flagged
+    recording.update_vad_summary()
+    return [recording]
+
+
+# Formats dont le flux peut être recopié sans ré-encodage (-c copy) avec des
+# points de coupe précis : PCM à l'échantillon près, MP3/FLAC à la trame près
+STREAM_COPY_FORMATS = {'wav', 'mp3', 'flac'}
+
+
+def cut_audio(file_path, output_path, start_time, end_time, stream_copy=True):
+    """
+    Extrait [start_time, end_time] de file_path vers output_path
+    
+    Essaie d'abord une copie du flux (-c copy, sans ré-encodage) puis
+    ré-encode si la copie échoue ou produit un fichier vide.
+    Retourne 'copy' ou 'reencode' selon le mode utilisé.
+    """
+    # -ss avant l'entrée : recherche directe sans décoder le début du fichier
+    stream = ffmpeg.input(file_path, ss=start_time, t=end_time - start_time)
+    
+    if stream_copy:
+        try:
+            (
+                stream
+                .output(output_path, acodec='copy', map_metadata=0)
+                .global_args('-nostdin', '-loglevel', 'error')
+                .overwrite_output()
+                .run(quiet=True)
+            )
+            if os.path.getsize(output_path) > 0:
+                return 'copy'
+        except ffmpeg.Error as e:
+            print(f"Copie de flux impossible pour {file_path}, ré-encodage: {e.stderr.decode(errors='replace').strip()}")
+    
+    (
+        stream
+        .output(output_path)
+        .global_args('-nostdin', '-loglevel', 'error')
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    return 'reencode'
+
+
+def trim_recording_task(recording_id, start_time, end_time, trim_id=None):
     """
     Découpe un enregistrement audio selon les timestamps
+    
+    Tout est d'abord préparé sans toucher à l'enregistrement : le fichier
+    découpé et ses sidecars (.vad, .peaks) restreints sont écrits dans des
+    fichiers du même dossier nommés d'après trim_id, et le rapport VAD
+    existant est restreint à la fenêtre et recalé (sans nouveau décodage ni
+    nouvelle analyse de l'audio). Le rapport et last_trim_id sont ensuite
+    enregistrés dans une transaction, puis les fichiers préparés remplacent
+    les originaux (os.replace).
+    
+    Le trim est rejouable (trim_id, fourni par l'API dans le payload du job) :
+    - si last_trim_id vaut déjà trim_id, le trim est enregistré : seule la
+      bascule des fichiers préparés restants est terminée, sans découper
+      une seconde fois avec les temps absolus d'origine
+    - sinon les fichiers d'une tentative interrompue sont écartés et le
+      trim repart du fichier original, intact
+    
+    Une erreur remonte au job, qui est replanifié (fail_job).
     """
     try:
         recording = Recording.objects.get(id=recording_id)
@@ -261,28 +773,75 @@ def trim_recording_task(recording_id, start_time, end_time):
             print(f"Recording {recording_id} n'a pas de fichier")
             return
         
+        trim_id = trim_id or uuid.uuid4().hex
         file_path = recording.file.path
-        output_path = file_path.replace(f'.{recording.format}', f'_trimmed.{recording.format}')
-        
-        # Utiliser ffmpeg pour découper
-        (
-            ffmpeg
-            .input(file_path, ss=start_time, t=end_time - start_time)
-            .output(output_path)
-            .overwrite_output()
-            .run(quiet=True)
-        )
+        staged_path = os.path.join(os.path.dirname(file_path), f'.trim_{trim_id}.{recording.format}')
+        # Fichier définitif -> fichier préparé
+        staged = {
+            file_path: staged_path,
+            vad.decisions_sidecar_path(file_path): vad.decisions_sidecar_path(staged_path),
+            peaks.peaks_sidecar_path(file_path): peaks.peaks_sidecar_path(staged_path),
+        }
+        
+        if recording.last_trim_id == trim_id:
+            swap_staged_files(staged)
+            print(f"Trim {trim_id} déjà enregistré pour l'enregistrement {recording_id}")
+            return
         
-        # Remplacer le fichier original par le fichier découpé
-        if os.path.exists(output_path):
-            os.replace(output_path, file_path)
-            recording.duration_seconds = end_time - start_time
-            recording.save()
+        committed = False
+        try:
+            remove_files(staged.values())
+            mode = cut_audio(
+                file_path, staged_path, start_time, end_time,
+                stream_copy=recording.format in STREAM_COPY_FORMATS
+            )
+            # Une copie de flux coupe aux limites de paquets : la durée réelle est
+            # lue sur le fichier produit, et non déduite de la fenêtre demandée
+            duration_seconds = vad.decoded_duration(staged_path)
+            end_time = start_time + duration_seconds
+            
+            decisions_path = vad.decisions_sidecar_path(file_path)
+            if os.path.exists(decisions_path):
+                header = vad.read_decisions_header(decisions_path)
+                frame_seconds = header['frame_duration_ms'] / 1000
+                _, decisions = vad.read_decisions(
+                    decisions_path, round(start_time / frame_seconds), round(end_time / frame_seconds)
+                )
+                vad.write_decisions(
+                    staged[decisions_path], decisions, header['sample_rate'], header['frame_duration_ms']
+                )
+            
+            peaks_path = peaks.peaks_sidecar_path(file_path)
+            if os.path.exists(peaks_path):
+                peaks.slice_peaks(peaks_path, start_time, end_time, staged[peaks_path])
             
-            # Relancer le traitement
-            process_recording(recording_id)
+            update_fields = ['duration_seconds', 'source_sha256', 'pcm_sha256', 'last_trim_id']
+            recording.duration_seconds = duration_seconds
+            # Les empreintes ne correspondent plus à l'audio : le cache VAD sera
+            # recalculé au prochain traitement complet
+            recording.source_sha256 = ''
+            recording.pcm_sha256 = ''
+            recording.last_trim_id = trim_id
+            if recording.vad_report:
+                _, silence_threshold, _ = get_vad_settings(recording.user)
+                vad_report = vad.slice_report(recording.get_full_vad_report(), start_time, end_time)
+                unnatural_silences = detect_unnatural_silences(vad_report, min_silence_duration=silence_threshold)
+                if unnatural_silences:
+                    vad_report['unnatural_silences'] = unnatural_silences
+                recording.flagged = bool(unnatural_silences)
+                save_analysis(recording, vad_report, update_fields + ['flagged'])
+            else:
+                recording.save(update_fields=update_fields)
+            committed = True
+            
+            swap_staged_files(staged)
+        finally:
+            # Après l'enregistrement, les fichiers préparés restants sont
+            # conservés pour que le job rejoué termine la bascule
+            if not committed:
+                remove_files(staged.values())
         
-        print(f"Trim terminé pour l'enregistrement {recording_id}")
+        print(f"Trim terminé pour l'enregistrement {recording_id} ({mode})")
         
     except Recording.DoesNotExist:
         print(f"Enregistrement {recording_id} introuvable")
@@ -293,96 +852,111 @@ def trim_recording_task(recording_id, start_time, end_time):
         raise
 
 
-def purge_expired():
+def swap_staged_files(staged):
+    """Remplace chaque fichier par sa version préparée, si elle existe encore"""
+    for final_path, staged_path in staged.items():
+        if os.path.exists(staged_path):
+            os.replace(staged_path, final_path)
+
+
+def remove_files(paths):
+    """Supprime les fichiers existants parmi paths"""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def recording_file_paths(file_path):
     """
-    Supprime les enregistrements expirés (retained_until dépassé)
+    Fichier audio d'un enregistrement et ses fichiers annexes (sidecars)
     """
-    from django.utils import timezone
-    
-    expired_recordings = Recording.objects.filter(
-        retained_until__lt=timezone.now()
-    )
-    
-    count = 0
-    for recording in expired_recordings:
-        if recording.file:
-            try:
-                os.remove(recording.file.path)
-            except:
-                pass
-        recording.delete()
-        count += 1
-    
-    print(f"{count} enregistrements expirés supprimés")
-    return count
+    base, ext = os.path.splitext(file_path)
+    return [
+        file_path,
+        f'{base}_normalized.wav',
+        f'{base}_trimmed{ext}',
+        vad.decisions_sidecar_path(file_path),
+        peaks.peaks_sidecar_path(file_path),
+    ]
+
+
+def file_size(path):
+    """Taille d'un fichier en octets (0 s'il n'existe pas)"""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
 
 
-def send_alert_email(recording_id, unnatural_silences):
+def unlink_file(path):
     """
-    Envoie un email d'alerte si des blancs non naturels sont détectés
+    Supprime un fichier et retourne le nombre d'octets libérés
+    (0 s'il n'existe pas, None en cas d'erreur)
     """
     try:
-        recording = Recording.objects.get(id=recording_id)
-        
-        # Vérifier si les alertes email sont activées pour cet utilisateur
-        email_enabled = False
-        email_config = {}
-        try:
-            user_settings = recording.user.user_settings
-            email_enabled = user_settings.email_alerts_enabled
-            if email_enabled:
-                email_config = {
-                    'host': user_settings.email_host or settings.EMAIL_HOST,
-                    'port': user_settings.email_port or settings.EMAIL_PORT,
-                    'user': user_settings.email_user or settings.EMAIL_HOST_USER,
-                    'password': user_settings.email_password or settings.EMAIL_HOST_PASSWORD,
-                }
-        except UserSettings.DoesNotExist:
-            # Fallback sur les settings globaux
-            email_enabled = bool(settings.EMAIL_HOST)
-            email_config = {
-                'host': settings.EMAIL_HOST,
-                'port': settings.EMAIL_PORT,
-                'user': settings.EMAIL_HOST_USER,
-                'password': settings.EMAIL_HOST_PASSWORD,
-            }
-        
-        if not email_enabled or not email_config.get('host'):
-            print(f"Alertes email désactivées pour l'enregistrement {recording_id}")
-            return
-        
-        if not recording.user.email:
-            print(f"Pas d'email pour l'utilisateur {recording.user.username}")
-            return
-        
-        subject = f'Alerte: Blancs détectés dans {recording.title or "enregistrement"}'
-        message = f"""
-Des blancs non naturels ont été détectés dans l'enregistrement:
+        size = os.path.getsize(path)
+        os.remove(path)
+        return size
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        print(f"Impossible de supprimer {path}: {str(e)}")
+        return None
 
-Titre: {recording.title or "Sans titre"}
-Type: {recording.type}
-Date: {recording.created_at}
 
-Blancs détectés:
-{json.dumps(unnatural_silences, indent=2)}
-"""
-        
-        # Utiliser la configuration email de l'utilisateur ou globale
-        try:
-            send_mail(
-                subject,
-                message,
-                email_config.get('user', settings.DEFAULT_FROM_EMAIL),
-                [recording.user.email],
-                fail_silently=False,
-            )
-            print(f"Email d'alerte envoyé pour l'enregistrement {recording_id}")
-        except Exception as e:
-            print(f"Erreur lors de l'envoi de l'email: {str(e)}")
-        
-    except Recording.DoesNotExist:
-        print(f"Enregistrement {recording_id} introuvable")
-    except Exception as e:
-        print(f"Erreur lors de l'envoi de l'email: {str(e)}")
-        import traceback
-        traceback.print_exc()
+def purge_expired(batch_size=500, workers=8, dry_run=False):
+    """
+    Supprime les enregistrements expirés (retained_until dépassé)
+    
+    Les enregistrements sont lus par lots (keyset sur l'id, champs limités
+    avec only()), supprimés par une requête DELETE par lot, puis leurs
+    fichiers et sidecars sont effacés en parallèle dans un pool de threads.
+    Les statistiques journalières sont recalculées une fois par bucket touché.
+    
+    Args:
+        batch_size: Nombre d'enregistrements par lot
+        workers: Nombre de threads de suppression de fichiers
+        dry_run: Compte ce qui serait supprimé sans rien supprimer
+    
+    Returns:
+        dict: recordings, files, bytes_freed, errors
+    """
+    now = timezone.now()
+    fields = ('id', 'file', 'user_id', 'type', 'created_at')
+    # Les parties d'un enregistrement découpé expiré sont traitées avec lui
+    expired = Recording.objects.filter(
+        retained_until__lt=now
+    ).exclude(parent__retained_until__lt=now).only(*fields).order_by('id')
+    
+    result = {'recordings': 0, 'files': 0, 'bytes_freed': 0, 'errors': 0}
+    last_id = 0
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(expired.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            # Parties des enregistrements découpés (supprimées en cascade)
+            batch += list(Recording.objects.filter(parent_id__in=[r.id for r in batch]).only(*fields))
+            
+            paths = [path for recording in batch if recording.file for path in recording_file_paths(recording.file.path)]
+            
+            if dry_run:
+                sizes = list(pool.map(file_size, paths))
+            else:
+                # Lignes d'abord : un échec de suppression laisse au pire un fichier orphelin
+                with transaction.atomic(), suspended_stats_updates():
+                    Recording.objects.filter(id__in=[recording.id for recording in batch]).delete()
+                for bucket in {(r.user_id, recording_day(r), r.type) for r in batch}:
+                    refresh_daily_stats(*bucket)
+                sizes = list(pool.map(unlink_file, paths))
+            
+            result['recordings'] += len(batch)
+            result['files'] += sum(1 for size in sizes if size)
+            result['bytes_freed'] += sum(size for size in sizes if size)
+            result['errors'] += sum(1 for size in sizes if size is None)
+    
+    action = "à supprimer" if dry_run else "supprimés"
+    print(f"{result['recordings']} enregistrements expirés {action} ({result['bytes_freed']} octets)")
+    return result
@@ -0,0 +1,5 @@
+"""
+Tests de non-régression de l'application recordings
+
+python manage.py test recordings
+"""
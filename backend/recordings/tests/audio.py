@@ -0,0 +1,70 @@
+"""
+Audio synthétique pour les tests et les benchmarks (NumPy seul, sans Django)
+
+Alternance de « voix » (fondamentale de 100 à 220 Hz et ses harmoniques,
+modulée au rythme des syllabes) et de silences (bruit de fond vers -60 dBFS),
+avec de temps en temps un blanc long qui déclenche la détection de silences
+anormaux. La même graine produit toujours le même fichier.
+"""
+import wave
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+
+
+def speech_segment(rng, samples, sample_rate=SAMPLE_RATE):
+    """Segment voisé : harmoniques d'une fondamentale modulées par des syllabes"""
+    t = np.arange(samples) / sample_rate
+    f0 = rng.uniform(100, 220)
+    # Légère variation de hauteur (intonation)
+    phase = 2 * np.pi * np.cumsum(f0 * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(0.2, 0.6) * t))) / sample_rate
+    signal = np.zeros(samples)
+    for harmonic in range(1, 9):
+        signal += np.sin(harmonic * phase + rng.uniform(0, 2 * np.pi)) / harmonic
+
+    # Syllabes : enveloppe à 3-6 Hz avec un gain aléatoire par syllabe
+    syllable_rate = rng.uniform(3, 6)
+    envelope = 0.5 * (1 - np.cos(2 * np.pi * syllable_rate * t))
+    syllables = int(np.ceil(t[-1] * syllable_rate)) + 1 if samples else 1
+    gains = rng.uniform(0.4, 1.0, syllables)
+    envelope *= gains[np.minimum((t * syllable_rate).astype(int), syllables - 1)]
+
+    signal = signal * envelope + rng.normal(0, 0.02, samples)
+    return signal * 0.25 * 32767
+
+
+def silence_segment(rng, samples):
+    """Bruit de fond (environ -60 dBFS)"""
+    return rng.normal(0, 30, samples)
+
+
+def generate_speech_wav(path, seconds, sample_rate=SAMPLE_RATE, seed=0, long_silence_probability=0.05):
+    """
+    Écrit un WAV PCM 16 bits mono de `seconds` secondes alternant voix et silences
+
+    Args:
+        long_silence_probability: Probabilité qu'un silence dure 6 à 15 s
+                                  (au-delà du seuil par défaut de 5 s)
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    written = 0
+    speaking = True
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        while written < total:
+            if speaking:
+                duration = rng.uniform(1.0, 8.0)
+            elif rng.random() < long_silence_probability:
+                duration = rng.uniform(6.0, 15.0)
+            else:
+                duration = rng.uniform(0.3, 2.5)
+            samples = min(int(duration * sample_rate), total - written)
+            segment = speech_segment(rng, samples, sample_rate) if speaking else silence_segment(rng, samples)
+            wf.writeframes(np.clip(segment, -32768, 32767).astype('<i2').tobytes())
+            written += samples
+            speaking = not speaking
+    return path
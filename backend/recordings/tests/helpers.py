@@ -0,0 +1,42 @@
+"""
+Outils communs aux tests : fixtures audio par classe de tests, client API
+"""
+import os
+import shutil
+import tempfile
+import wave
+import numpy as np
+from rest_framework.test import APIClient
+from .audio import generate_speech_wav
+
+
+def read_wav(path):
+    """Échantillons int16 d'un fichier WAV PCM 16 bits mono"""
+    with wave.open(path, 'rb') as wf:
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def api_client(user):
+    """Client API authentifié (sans passer par les jetons JWT)"""
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class AudioFixtureMixin:
+    """Fixture synthétique (voix et silences) générée une fois par classe"""
+
+    fixture_seconds = 60
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp_dir = tempfile.mkdtemp(prefix='recordings-tests-')
+        cls.wav_path = generate_speech_wav(
+            os.path.join(cls.tmp_dir, 'speech.wav'), cls.fixture_seconds, seed=7, long_silence_probability=0.3
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+        super().tearDownClass()
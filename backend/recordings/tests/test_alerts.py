@@ -0,0 +1,161 @@
+"""
+Alertes email : boîte d'envoi alimentée par le traitement, emails récapitulatifs
+"""
+import os
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.files import File
+from django.core.mail.backends import locmem
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from recordings import tasks
+from recordings.alerts import build_digest, claim_alerts, deliver_alerts, enqueue_alert
+from recordings.models import Alert, Recording, UserSettings
+from .helpers import AudioFixtureMixin
+
+
+class ProcessingAlertsTests(AudioFixtureMixin, TestCase):
+    """Un nouveau traitement remplace les alertes encore en attente"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('alerts', email='alerts@example.com')
+        self.settings = UserSettings.objects.create(
+            user=self.user, email_alerts_enabled=True, email_host='smtp.example.com'
+        )
+        self.media = override_settings(MEDIA_ROOT=os.path.join(self.tmp_dir, 'media'))
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+        self.recording = Recording(user=self.user, title='Antenne', format='wav')
+        with open(self.wav_path, 'rb') as f:
+            self.recording.file.save('alerts.wav', File(f))
+
+    def test_reprocess_without_silences_clears_pending_alerts(self):
+        tasks.process_recording(self.recording.id)
+        self.recording.refresh_from_db()
+        self.assertTrue(self.recording.flagged)
+        pending = Alert.objects.filter(recording=self.recording, status='pending')
+        self.assertEqual(pending.count(), 1)
+        self.assertEqual(len(pending.get().silences), self.recording.unnatural_silence_count)
+
+        # Même traitement : une seule alerte en attente, pas de doublon
+        tasks.process_recording(self.recording.id)
+        self.assertEqual(pending.count(), 1)
+
+        # Seuil relevé : plus aucun blanc, l'alerte en attente est retirée
+        self.settings.silence_threshold_seconds = 3600
+        self.settings.save()
+        tasks.process_recording(self.recording.id)
+        self.recording.refresh_from_db()
+        self.assertFalse(self.recording.flagged)
+        self.assertEqual(self.recording.unnatural_silence_count, 0)
+        self.assertFalse(pending.exists())
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    ALERT_DIGEST_WINDOW_SECONDS=300,
+    ALERT_MAX_ATTEMPTS=2,
+    ALERT_RETRY_BACKOFF_SECONDS=60,
+    ALERT_MAX_SILENCES_LISTED=20,
+)
+class DeliverAlertsTests(TestCase):
+    """Un email récapitulatif par utilisateur, une fois la fenêtre de regroupement écoulée"""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.users = []
+        for name in ('matin', 'soir'):
+            user = User.objects.create_user(name, email=f'{name}@example.com')
+            UserSettings.objects.create(user=user, email_alerts_enabled=True, email_host='smtp.example.com')
+            self.users.append(user)
+
+    def alert(self, user, title, silences, age=600):
+        recording = Recording.objects.create(user=user, title=title)
+        return self.alert_for(recording, silences, age)
+
+    def alert_for(self, recording, silences, age=600):
+        alert = enqueue_alert(recording, silences)
+        created_at = self.now - timedelta(seconds=age)
+        Alert.objects.filter(id=alert.id).update(created_at=created_at, next_attempt_at=created_at)
+        return alert
+
+    def silence(self, start, duration):
+        return {'start': start, 'end': start + duration, 'duration': duration}
+
+    def test_digest_per_user_after_window(self):
+        first = self.alert(self.users[0], 'Matinale', [self.silence(10, 6)])
+        self.alert(self.users[0], 'Journal', [self.silence(3700, 8)])
+        # Trop récente : l'utilisateur attend la fin de la fenêtre
+        self.alert(self.users[1], 'Nuit', [self.silence(5, 7)], age=10)
+
+        stats = deliver_alerts('host:1', now=self.now)
+        self.assertEqual(stats, {'emails': 1, 'alerts': 2, 'retried': 0, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['matin@example.com'])
+        self.assertEqual(message.subject, 'Alerte: Blancs détectés dans 2 enregistrements')
+        self.assertIn('Titre: Matinale', message.body)
+        self.assertIn('1:01:40 → 1:01:48 (8.0 s)', message.body)
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, 'sent')
+        self.assertEqual(Alert.objects.filter(user=self.users[1], status='pending').count(), 1)
+
+        # Rien de plus jusqu'à la fin de la fenêtre du second utilisateur
+        self.assertEqual(deliver_alerts('host:1', now=self.now)['emails'], 0)
+        self.assertEqual(deliver_alerts('host:1', now=self.now + timedelta(seconds=300))['emails'], 1)
+
+    def test_digest_lists_each_silence_once(self):
+        recording = Recording.objects.create(user=self.users[0], title='Direct')
+        # Silence en cours pendant la capture, puis clos : seule la version la plus récente est listée
+        self.alert_for(recording, [self.silence(20, 6)])
+        self.alert_for(recording, [self.silence(20, 9), self.silence(90, 12)])
+
+        alerts = list(Alert.objects.filter(user=self.users[0]).order_by('created_at', 'id'))
+        message = build_digest(self.users[0], alerts, 'alertes@example.com')
+        self.assertEqual(message.subject, 'Alerte: Blancs détectés dans Direct')
+        self.assertIn('Blancs détectés (2):', message.body)
+        self.assertIn('(9.0 s)', message.body)
+        self.assertNotIn('(6.0 s)', message.body)
+
+    def test_claimed_alerts_are_not_sent_twice(self):
+        self.alert(self.users[0], 'Matinale', [self.silence(10, 6)])
+        claimed = claim_alerts('host:1', self.now, max_users=10)
+        self.assertEqual(list(claimed), [self.users[0].id])
+        self.assertEqual(claim_alerts('host:2', self.now, max_users=10), {})
+        self.assertEqual(deliver_alerts('host:2', now=self.now)['emails'], 0)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        alert = self.alert(self.users[0], 'Matinale', [self.silence(10, 6)])
+        with mock.patch.object(locmem.EmailBackend, 'send_messages', side_effect=SMTPException('refusé')):
+            stats = deliver_alerts('host:1', now=self.now)
+        self.assertEqual(stats, {'emails': 0, 'alerts': 0, 'retried': 1, 'failed': 0})
+        alert.refresh_from_db()
+        self.assertEqual(alert.status, 'pending')
+        self.assertEqual(alert.last_error, 'refusé')
+        self.assertEqual(alert.next_attempt_at, self.now + timedelta(seconds=60))
+
+        # Pas avant la date replanifiée
+        self.assertEqual(deliver_alerts('host:1', now=self.now + timedelta(seconds=30))['retried'], 0)
+
+        # ALERT_MAX_ATTEMPTS atteint : abandonnée
+        later = self.now + timedelta(seconds=60)
+        with mock.patch.object(locmem.EmailBackend, 'open', side_effect=OSError('injoignable')):
+            stats = deliver_alerts('host:1', now=later)
+        self.assertEqual(stats['failed'], 1)
+        alert.refresh_from_db()
+        self.assertEqual(alert.status, 'failed')
+        self.assertEqual(alert.attempts, 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_disabled_alerts_are_dropped(self):
+        alert = self.alert(self.users[0], 'Matinale', [self.silence(10, 6)])
+        UserSettings.objects.filter(user=self.users[0]).update(email_alerts_enabled=False)
+        stats = deliver_alerts('host:1', now=self.now)
+        self.assertEqual(stats['failed'], 1)
+        alert.refresh_from_db()
+        self.assertEqual(alert.status, 'failed')
+        self.assertEqual(alert.attempts, 1)
@@ -0,0 +1,99 @@
+"""
+Téléchargement : requêtes partielles (Range) et GET conditionnel
+"""
+import os
+import shutil
+import tempfile
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from recordings.models import Recording
+from .helpers import api_client
+
+
+class DownloadTests(TestCase):
+    """Seuls les octets demandés sont envoyés, 304 si le fichier n'a pas changé"""
+
+    content = bytes(range(256)) * 40
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix='recordings-tests-')
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.media = override_settings(MEDIA_ROOT=self.media_root, MEDIA_OFFLOAD='')
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+
+        self.user = User.objects.create_user('download')
+        self.client = api_client(self.user)
+        self.recording = Recording(user=self.user, title='Antenne', format='wav')
+        self.recording.file.save('antenne.wav', ContentFile(self.content))
+        self.url = f'/api/recordings/{self.recording.id}/download/'
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_download(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertTrue(response['ETag'])
+
+    def test_byte_ranges(self):
+        size = len(self.content)
+        cases = [
+            ('bytes=100-199', 100, 199),
+            ('bytes=10000-', 10000, size - 1),
+            ('bytes=-240', size - 240, size - 1),
+            ('bytes=10000-99999', 10000, size - 1),
+        ]
+        for header, start, end in cases:
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/{size}')
+                self.assertEqual(response['Content-Length'], str(end - start + 1))
+                self.assertEqual(self.body(response), self.content[start:end + 1])
+
+    def test_unsatisfiable_and_ignored_ranges(self):
+        size = len(self.content)
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={size}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{size}')
+
+        # Multi-plages : fichier complet
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-1,5-6')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+
+    def test_conditional_requests(self):
+        response = self.client.get(self.url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        response.close()
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        # If-Range obsolète : la plage est ignorée, le fichier complet est renvoyé
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"obsolete"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), self.content[:10])
+
+        # Fichier modifié : nouvel ETag, plus de 304
+        stat = os.stat(self.recording.file.path)
+        os.utime(self.recording.file.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        response.close()
+
+    @override_settings(MEDIA_OFFLOAD='x-accel', MEDIA_OFFLOAD_PREFIX='/protected-media/')
+    def test_offload_to_reverse_proxy(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.recording.file.name)
+        self.assertEqual(response.content, b'')
@@ -0,0 +1,132 @@
+"""
+File d'attente des traitements : réservation, retries, reprise après arrêt brutal
+"""
+import socket
+import subprocess
+import sys
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from recordings import jobs
+from recordings.models import ProcessingJob, Recording
+
+
+def dead_pid():
+    """Pid d'un processus terminé"""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+@override_settings(PROCESSING_JOB_MAX_ATTEMPTS=3, PROCESSING_RETRY_BACKOFF_SECONDS=30)
+class ProcessingJobQueueTests(TestCase):
+    """Réservation FIFO, un seul job en cours par enregistrement, backoff exponentiel"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('jobs')
+        self.first = Recording.objects.create(user=self.user, title='Matinale')
+        self.second = Recording.objects.create(user=self.user, title='Journal')
+
+    def test_enqueue_process_is_deduplicated(self):
+        job = jobs.enqueue_job(self.first)
+        self.assertEqual(jobs.enqueue_job(self.first), job)
+        trim = jobs.enqueue_job(self.first, kind='trim', payload={'start_time': 0, 'end_time': 1})
+        self.assertNotEqual(trim, job)
+        self.assertEqual(jobs.pending_jobs_count(), 2)
+
+    @override_settings(PROCESSING_QUEUE_MAX_PENDING=1)
+    def test_enqueue_raises_when_queue_is_full(self):
+        jobs.enqueue_job(self.first)
+        with self.assertRaises(jobs.QueueFull):
+            jobs.enqueue_job(self.second)
+        # Job déjà accepté par l'API : la limite est ignorée
+        self.assertEqual(jobs.enqueue_job(self.second, force=True).status, 'pending')
+
+    def test_claim_skips_recording_with_running_job(self):
+        process = jobs.enqueue_job(self.first)
+        trim = jobs.enqueue_job(self.first, kind='trim', payload={'start_time': 0, 'end_time': 1})
+        other = jobs.enqueue_job(self.second)
+
+        claimed = jobs.claim_next_job('host:1')
+        self.assertEqual(claimed.id, process.id)
+        self.assertEqual(claimed.status, 'running')
+        self.assertEqual(claimed.worker, 'host:1')
+        self.assertEqual(claimed.attempts, 1)
+
+        # Le découpage attend la fin du traitement du même enregistrement
+        self.assertEqual(jobs.claim_next_job('host:2').id, other.id)
+        self.assertIsNone(jobs.claim_next_job('host:3'))
+
+        jobs.complete_job(claimed)
+        self.assertEqual(jobs.claim_next_job('host:3').id, trim.id)
+
+    def test_claim_respects_run_after(self):
+        job = jobs.enqueue_job(self.first)
+        ProcessingJob.objects.filter(id=job.id).update(run_after=timezone.now() + timedelta(minutes=5))
+        self.assertIsNone(jobs.claim_next_job('host:1'))
+
+    def test_fail_job_retries_with_backoff_then_fails(self):
+        job = jobs.enqueue_job(self.first)
+        delays = []
+        for attempt in range(1, 3):
+            ProcessingJob.objects.filter(id=job.id).update(run_after=timezone.now())
+            claimed = jobs.claim_next_job('host:1')
+            self.assertEqual(claimed.attempts, attempt)
+            before = timezone.now()
+            self.assertEqual(jobs.fail_job(claimed, RuntimeError('ffmpeg')), 'pending')
+            job.refresh_from_db()
+            self.assertEqual(job.last_error, 'ffmpeg')
+            self.assertEqual(job.worker, '')
+            delays.append((job.run_after - before).total_seconds())
+
+        self.assertAlmostEqual(delays[0], 30, delta=1)
+        self.assertAlmostEqual(delays[1], 60, delta=1)
+
+        ProcessingJob.objects.filter(id=job.id).update(run_after=timezone.now())
+        claimed = jobs.claim_next_job('host:1')
+        self.assertEqual(jobs.fail_job(claimed, RuntimeError('ffmpeg')), 'failed')
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsNone(jobs.claim_next_job('host:1'))
+
+
+class RequeueStaleJobsTests(TestCase):
+    """Seuls les jobs des workers locaux disparus sont remis en attente"""
+
+    def setUp(self):
+        user = User.objects.create_user('stale')
+        self.hostname = socket.gethostname()
+        self.recordings = [Recording.objects.create(user=user, title=f'r{i}') for i in range(3)]
+
+    def running_job(self, recording, worker):
+        return ProcessingJob.objects.create(
+            recording=recording, status='running', worker=worker, attempts=1, started_at=timezone.now()
+        )
+
+    def test_requeues_only_dead_local_workers(self):
+        dead = self.running_job(self.recordings[0], f'{self.hostname}:{dead_pid()}')
+        alive = self.running_job(self.recordings[1], jobs.default_worker_name())
+        remote = self.running_job(self.recordings[2], f'autre-{self.hostname}:{dead_pid()}')
+
+        self.assertEqual(jobs.requeue_stale_jobs(), 1)
+
+        dead.refresh_from_db()
+        self.assertEqual(dead.status, 'pending')
+        self.assertEqual(dead.worker, '')
+        for job in (alive, remote):
+            job.refresh_from_db()
+            self.assertEqual(job.status, 'running')
+
+        self.assertEqual(jobs.requeue_stale_jobs(), 0)
+
+    def test_run_job_dispatches_payload(self):
+        job = ProcessingJob.objects.create(
+            recording=self.recordings[0], kind='trim', payload={'start_time': 1.0, 'end_time': 2.0}
+        )
+        handler = mock.Mock()
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'trim': handler}):
+            jobs.run_job(job.id)
+        handler.assert_called_once_with(self.recordings[0].id, start_time=1.0, end_time=2.0)
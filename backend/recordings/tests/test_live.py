@@ -0,0 +1,93 @@
+"""
+Capture en direct : morceaux successifs, segments enregistrés au fil de l'eau
+"""
+import os
+import wave
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from recordings import vad
+from recordings.models import LiveSegment, Recording, RecordingAnalysis
+from .helpers import AudioFixtureMixin, api_client, read_wav
+
+
+class LiveCaptureTests(AudioFixtureMixin, TestCase):
+    """Un morceau n'analyse et n'enregistre que le nouvel audio"""
+
+    fixture_seconds = 120
+    chunk_seconds = 25
+    # Ré-amorçage sur OVERLAP_SECONDS : bornes à quelques trames de l'analyse séquentielle
+    max_edge_frames = 3
+
+    def setUp(self):
+        self.user = User.objects.create_user('live')
+        self.client = api_client(self.user)
+        self.media = override_settings(MEDIA_ROOT=os.path.join(self.tmp_dir, 'media'))
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+
+        samples = read_wav(self.wav_path)
+        step = self.chunk_seconds * vad.ANALYSIS_SAMPLE_RATE
+        self.chunk_paths = []
+        for index, start in enumerate(range(0, len(samples), step)):
+            path = os.path.join(self.tmp_dir, f'chunk-{index}.wav')
+            with wave.open(path, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(vad.ANALYSIS_SAMPLE_RATE)
+                wf.writeframes(samples[start:start + step].tobytes())
+            self.chunk_paths.append(path)
+
+        analyzer = vad.StreamAnalyzer()
+        analyzer.feed(samples)
+        self.expected = analyzer.finish()
+
+    def post_chunk(self, recording_id, path, final=False):
+        with open(path, 'rb') as f:
+            data = {'chunk': f}
+            if final:
+                data['final'] = 'true'
+            response = self.client.post(f'/api/recordings/{recording_id}/chunks/', data, format='multipart')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_chunks_only_append_new_segments(self):
+        response = self.client.post('/api/recordings/live/', {'title': 'Antenne'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        recording_id = response.data['id']
+
+        for path in self.chunk_paths[:-1]:
+            with CaptureQueriesContext(connection) as queries:
+                self.post_chunk(recording_id, path)
+            # Ni lecture ni réécriture des listes complètes pendant la capture
+            self.assertFalse([q for q in queries.captured_queries if 'recordinganalysis' in q['sql']])
+
+            recording = Recording.objects.get(id=recording_id)
+            state = recording.vad_state['segmenter']
+            self.assertEqual(
+                LiveSegment.objects.filter(recording_id=recording_id).count(),
+                state['voice_segments_count'] + state['silence_segments_count']
+            )
+            report = recording.get_full_vad_report()
+            self.assertEqual(len(report['voice_segments']), report['voice_segments_count'])
+            self.assertEqual(len(report['silence_segments']), report['silence_segments_count'])
+
+        response = self.post_chunk(recording_id, self.chunk_paths[-1], final=True)
+        self.assertFalse(response.data['is_live'])
+        self.assertFalse(LiveSegment.objects.filter(recording_id=recording_id).exists())
+        self.assertTrue(RecordingAnalysis.objects.filter(recording_id=recording_id).exists())
+
+        report = Recording.objects.get(id=recording_id).get_full_vad_report()
+        self.assertAlmostEqual(report['total_duration'], self.expected['total_duration'])
+        tolerance = self.max_edge_frames * vad.FRAME_DURATION_MS / 1000 + 1e-6
+        for key in ('voice_segments', 'silence_segments'):
+            self.assertEqual(len(report[key]), len(self.expected[key]))
+            self.assertEqual(report[f'{key}_count'], len(self.expected[key]))
+            for segment, expected in zip(report[key], self.expected[key]):
+                self.assertAlmostEqual(segment['start'], expected['start'], delta=tolerance)
+                self.assertAlmostEqual(segment['end'], expected['end'], delta=tolerance)
+
+        with open(self.chunk_paths[0], 'rb') as f:
+            closed = self.client.post(f'/api/recordings/{recording_id}/chunks/', {'chunk': f}, format='multipart')
+        self.assertEqual(closed.status_code, 409)
@@ -0,0 +1,94 @@
+"""
+Mesures du traitement : ProcessingStats, histogrammes cumulés, export /api/metrics
+"""
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from recordings import metrics
+from recordings.models import MetricBucket, ProcessingJob, ProcessingStats, Recording
+
+
+class ProcessingMetricsTests(TestCase):
+    """Chaque traitement alimente ses mesures et les histogrammes exportés"""
+
+    def setUp(self):
+        # Séries connues du processus : les lignes créées par d'autres tests ont été annulées
+        metrics._KNOWN_SERIES.clear()
+        self.addCleanup(metrics._KNOWN_SERIES.clear)
+        self.user = User.objects.create_user('metrics')
+        self.recording = Recording.objects.create(user=self.user, title='Antenne')
+
+    def timer(self, stages, total, bytes_read=0):
+        timer = metrics.StageTimer()
+        timer.stages = stages
+        timer.bytes_read = bytes_read
+        timer.elapsed = lambda: total
+        return timer
+
+    def bucket(self, metric, le, stage=''):
+        return MetricBucket.objects.get(metric=metric, stage=stage, le=le)
+
+    def test_record_processing(self):
+        timer = self.timer({'decode_vad': 0.7, 'save': 0.02}, total=0.8, bytes_read=3 * 2 ** 20)
+        with mock.patch.object(metrics, 'peak_rss_bytes', return_value=2 ** 27):
+            realtime_factor = metrics.record_processing(self.recording, timer, audio_seconds=80, cache_hit=True)
+        self.assertAlmostEqual(realtime_factor, 0.01)
+
+        stats = ProcessingStats.objects.get(recording=self.recording)
+        self.assertEqual(stats.stages, {'decode_vad': 0.7, 'save': 0.02})
+        self.assertEqual(stats.audio_seconds, 80)
+        self.assertEqual(stats.bytes_read, 3 * 2 ** 20)
+        self.assertTrue(stats.cache_hit)
+
+        # Histogrammes cumulés : chaque borne compte les observations inférieures ou égales
+        stage = 'recordings_processing_stage_seconds'
+        self.assertEqual(self.bucket(stage, '0.5', 'decode_vad').count, 0)
+        self.assertEqual(self.bucket(stage, '1', 'decode_vad').count, 1)
+        self.assertEqual(self.bucket(stage, '0.05', 'save').count, 1)
+        self.assertEqual(self.bucket(stage, '+Inf', 'save').count, 1)
+        self.assertEqual(self.bucket('recordings_processing_realtime_factor', '0.01').count, 1)
+        self.assertEqual(self.bucket('recordings_processing_bytes_read', '4194304').count, 1)
+
+        # Nouveau traitement : mesures remplacées, histogrammes cumulés
+        with mock.patch.object(metrics, 'peak_rss_bytes', return_value=None):
+            metrics.record_processing(self.recording, self.timer({'save': 0.2}, total=5.0), audio_seconds=0)
+        self.assertEqual(ProcessingStats.objects.count(), 1)
+        stats = ProcessingStats.objects.get(recording=self.recording)
+        self.assertIsNone(stats.realtime_factor)
+        self.assertIsNone(stats.peak_rss_bytes)
+        total = self.bucket('recordings_processing_seconds', '+Inf')
+        self.assertEqual(total.count, 2)
+        self.assertAlmostEqual(total.sum, 5.8)
+        self.assertEqual(self.bucket('recordings_processing_realtime_factor', '+Inf').count, 1)
+
+    def test_render_metrics(self):
+        with mock.patch.object(metrics, 'peak_rss_bytes', return_value=None):
+            metrics.record_processing(self.recording, self.timer({'save': 0.02}, total=0.5), audio_seconds=50)
+        ProcessingJob.objects.create(recording=self.recording, status='failed')
+
+        text = metrics.render_metrics()
+        self.assertIn('# TYPE recordings_processing_seconds histogram', text)
+        self.assertIn('recordings_processing_stage_seconds_bucket{stage="save",le="0.05"} 1', text)
+        self.assertIn('recordings_processing_stage_seconds_count{stage="save"} 1', text)
+        self.assertIn('recordings_processing_seconds_bucket{le="0.1"} 0', text)
+        self.assertIn('recordings_processing_seconds_sum 0.5', text)
+        self.assertIn('recordings_processing_jobs{status="failed"} 1', text)
+        self.assertIn('recordings_processing_jobs{status="pending"} 0', text)
+        self.assertIn('recordings_alerts{status="pending"} 0', text)
+        # Bornes dans l'ordre croissant, +Inf en dernier
+        buckets = [line for line in text.splitlines() if line.startswith('recordings_processing_seconds_bucket')]
+        self.assertEqual(len(buckets), len(metrics.SECONDS_BUCKETS) + 1)
+        self.assertTrue(buckets[-1].startswith('recordings_processing_seconds_bucket{le="+Inf"}'))
+
+    @override_settings(METRICS_TOKEN='secret', DEBUG=False)
+    def test_endpoint_requires_token(self):
+        self.assertEqual(self.client.get('/api/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/api/metrics', HTTP_AUTHORIZATION='Bearer autre').status_code, 401)
+        response = self.client.get('/api/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.PROMETHEUS_CONTENT_TYPE)
+        self.assertIn(b'recordings_processing_jobs', response.content)
+
+    @override_settings(METRICS_TOKEN='', DEBUG=False)
+    def test_endpoint_disabled_without_token(self):
+        self.assertEqual(self.client.get('/api/metrics').status_code, 404)
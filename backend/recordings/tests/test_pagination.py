@@ -0,0 +1,53 @@
+"""
+Pagination par curseur de la liste des enregistrements
+"""
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from recordings.models import Recording
+from .helpers import api_client
+
+
+class CursorPaginationTests(TestCase):
+    """Pagination par curseur avec des enregistrements créés au même instant"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('pages')
+        self.client = api_client(self.user)
+        Recording.objects.bulk_create([Recording(user=self.user, title=f'r{i}') for i in range(45)])
+        same_instant = timezone.now() - timedelta(days=1)
+        Recording.objects.filter(user=self.user).update(created_at=same_instant)
+        # Un enregistrement plus récent, en tête de liste
+        newest = Recording.objects.filter(user=self.user).order_by('id').first()
+        Recording.objects.filter(id=newest.id).update(created_at=timezone.now())
+        self.expected = [newest.id] + list(
+            Recording.objects.filter(user=self.user).exclude(id=newest.id).order_by('-id').values_list('id', flat=True)
+        )
+
+    def walk(self, url, link):
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = [item['id'] for item in response.data['results']]
+            pages.append(page)
+            ids.extend(page)
+            url = response.data[link]
+        return ids, pages
+
+    def test_next_pages(self):
+        ids, pages = self.walk('/api/recordings/?page_size=20', 'next')
+        self.assertEqual(ids, self.expected)
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+
+    def test_previous_pages(self):
+        _, pages = self.walk('/api/recordings/?page_size=20', 'next')
+        response = self.client.get('/api/recordings/?page_size=20')
+        url = response.data['next']
+        last = None
+        while url:
+            last = self.client.get(url)
+            url = last.data['next']
+        ids, _ = self.walk(last.data['previous'], 'previous')
+        self.assertEqual(ids, pages[1] + pages[0])
@@ -0,0 +1,130 @@
+"""
+Pyramide de pics de la forme d'onde : calcul par blocs, fichier .peaks, endpoint /peaks/
+"""
+import os
+import shutil
+import tempfile
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from recordings import peaks
+from recordings.models import Recording
+from .helpers import api_client
+
+
+SAMPLE_RATE = 16000
+
+
+def reference_levels(samples):
+    """Pics calculés en une fois sur tout le signal, pour chaque résolution"""
+    levels = {}
+    for resolution in peaks.PEAK_RESOLUTIONS:
+        window = SAMPLE_RATE // resolution
+        chunks = [samples[i:i + window] for i in range(0, len(samples), window)]
+        levels[resolution] = np.array([[c.min() >> 8, c.max() >> 8] for c in chunks], dtype=np.int8)
+    return levels
+
+
+class PeakBuilderTests(SimpleTestCase):
+    """Pics identiques quel que soit le découpage en blocs du flux PCM"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='recordings-tests-')
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        rng = np.random.default_rng(3)
+        # 12,34 s : dernière fenêtre incomplète à chaque niveau
+        self.samples = rng.integers(-32768, 32767, int(12.34 * SAMPLE_RATE), dtype=np.int16)
+        self.path = os.path.join(self.tmp_dir, 'speech.peaks')
+
+    def test_blocks_match_reference(self):
+        builder = peaks.PeakBuilder(SAMPLE_RATE)
+        position = 0
+        for size in [1, 159, 161, 4000, 12345] * 40:
+            builder.feed(self.samples[position:position + size])
+            position += size
+        builder.feed(self.samples[position:])
+        self.assertEqual(builder.total_samples, len(self.samples))
+
+        expected = reference_levels(self.samples)
+        levels = builder.levels()
+        self.assertEqual(sorted(levels), sorted(expected))
+        for resolution, pairs in expected.items():
+            np.testing.assert_array_equal(levels[resolution], pairs)
+
+    def test_write_read_and_slice(self):
+        peaks.compute_file_peaks(np.array_split(self.samples, 7), SAMPLE_RATE, self.path)
+        expected = reference_levels(self.samples)
+
+        sample_rate, index = peaks.read_peaks_index(self.path)
+        self.assertEqual(sample_rate, SAMPLE_RATE)
+        self.assertEqual({resolution: count for resolution, (count, _) in index.items()},
+                         {resolution: len(pairs) for resolution, pairs in expected.items()})
+
+        first, pairs = peaks.read_peaks(self.path, 10, start=2.05, end=5.01)
+        self.assertEqual(first, 20)
+        np.testing.assert_array_equal(pairs, expected[10][20:51])
+        first, pairs = peaks.read_peaks(self.path, 100, start=100)
+        self.assertEqual(len(pairs), 0)
+        with self.assertRaises(KeyError):
+            peaks.read_peaks(self.path, 50)
+
+        sliced_path = os.path.join(self.tmp_dir, 'sliced.peaks')
+        peaks.slice_peaks(self.path, 2.0, 4.0, output_path=sliced_path)
+        sliced = reference_levels(self.samples[2 * SAMPLE_RATE:4 * SAMPLE_RATE])
+        for resolution, pairs in sliced.items():
+            np.testing.assert_array_equal(peaks.read_peaks(sliced_path, resolution)[1], pairs)
+        # Fichier d'origine inchangé
+        self.assertEqual(peaks.read_peaks_index(self.path)[1][100][0], len(expected[100]))
+
+
+class PeaksEndpointTests(TestCase):
+    """Pics servis depuis le fichier annexe, en JSON ou en binaire, revalidables"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix='recordings-tests-')
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.media = override_settings(MEDIA_ROOT=self.media_root)
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+
+        self.user = User.objects.create_user('peaks')
+        self.client = api_client(self.user)
+        self.recording = Recording(user=self.user, title='Antenne', format='wav')
+        self.recording.file.save('antenne.wav', ContentFile(b'\0' * 100))
+        self.url = f'/api/recordings/{self.recording.id}/peaks/'
+
+        self.samples = np.random.default_rng(5).integers(-32768, 32767, 30 * SAMPLE_RATE, dtype=np.int16)
+        self.expected = reference_levels(self.samples)
+
+    def write_sidecar(self):
+        peaks.compute_file_peaks([self.samples], SAMPLE_RATE, peaks.peaks_sidecar_path(self.recording.file.path))
+
+    def test_missing_sidecar(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_json_binary_and_revalidation(self):
+        self.write_sidecar()
+
+        response = self.client.get(self.url, {'zoom': 10, 'start': 5, 'end': 8})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['start_index'], 50)
+        self.assertEqual(response.data['count'], 30)
+        self.assertEqual(response.data['peaks'], self.expected[10][50:80].ravel().tolist())
+
+        response = self.client.get(self.url, {'zoom': 1, 'encoding': 'binary'})
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertEqual(response['X-Peaks-Start'], '0')
+        self.assertEqual(response.content, self.expected[1].tobytes())
+
+        etag = response['ETag']
+        response = self.client.get(self.url, {'zoom': 1, 'encoding': 'binary'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Autre représentation : autre ETag
+        self.assertEqual(self.client.get(self.url, {'zoom': 100}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_invalid_parameters(self):
+        self.write_sidecar()
+        for params in ({'zoom': 50}, {'zoom': 'x'}, {'start': 'abc'}, {'encoding': 'xml'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
@@ -0,0 +1,85 @@
+"""
+Purge des enregistrements expirés : lignes, fichiers, sidecars et statistiques
+"""
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from recordings import peaks, tasks, vad
+from recordings.models import Recording, RecordingDailyStats
+
+
+class PurgeExpiredTests(TestCase):
+    """Les enregistrements expirés et leurs parties sont supprimés par lots"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix='recordings-tests-')
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.media = override_settings(MEDIA_ROOT=self.media_root)
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+
+        self.user = User.objects.create_user('purge')
+        past = timezone.now() - timedelta(days=1)
+        future = timezone.now() + timedelta(days=1)
+        self.expired = [self.recording(f'old{i}', past) for i in range(3)]
+        self.kept = [self.recording('recent', future), self.recording('forever', None)]
+        # Parties d'un enregistrement découpé expiré : supprimées avec lui, même sans date propre
+        self.parts = [self.recording(f'part{i}', None, parent=self.expired[0]) for i in range(2)]
+
+    def recording(self, name, retained_until, parent=None):
+        recording = Recording(user=self.user, title=name, format='wav', retained_until=retained_until, parent=parent)
+        recording.file.save(f'{name}.wav', ContentFile(b'\0' * 100))
+        # Sidecars VAD et pics
+        for path in (vad.decisions_sidecar_path(recording.file.path), peaks.peaks_sidecar_path(recording.file.path)):
+            with open(path, 'wb') as f:
+                f.write(b'\0' * 10)
+        return recording
+
+    def paths(self, recordings):
+        return [
+            path for recording in recordings for path in (
+                recording.file.path,
+                vad.decisions_sidecar_path(recording.file.path),
+                peaks.peaks_sidecar_path(recording.file.path),
+            )
+        ]
+
+    def test_dry_run_deletes_nothing(self):
+        result = tasks.purge_expired(batch_size=2, dry_run=True)
+        self.assertEqual(result, {'recordings': 5, 'files': 15, 'bytes_freed': 5 * 120, 'errors': 0})
+        self.assertEqual(Recording.objects.count(), 7)
+        self.assertTrue(all(os.path.exists(path) for path in self.paths(self.expired + self.parts)))
+
+    def test_purge_removes_rows_files_and_stats(self):
+        result = tasks.purge_expired(batch_size=2, workers=2)
+        self.assertEqual(result, {'recordings': 5, 'files': 15, 'bytes_freed': 5 * 120, 'errors': 0})
+
+        self.assertEqual(
+            set(Recording.objects.values_list('id', flat=True)), {recording.id for recording in self.kept}
+        )
+        self.assertFalse(any(os.path.exists(path) for path in self.paths(self.expired + self.parts)))
+        self.assertTrue(all(os.path.exists(path) for path in self.paths(self.kept)))
+
+        stats = RecordingDailyStats.objects.get(user=self.user)
+        self.assertEqual(stats.count, len(self.kept))
+
+        # Rien de plus à supprimer
+        self.assertEqual(tasks.purge_expired()['recordings'], 0)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command('purge_expired', '--dry-run', stdout=stdout)
+        self.assertIn('[dry-run] 5 enregistrements, 15 fichiers', stdout.getvalue())
+        self.assertEqual(Recording.objects.count(), 7)
+
+        stdout = StringIO()
+        call_command('purge_expired', '--batch-size', '2', stdout=stdout)
+        self.assertIn('5 enregistrements, 15 fichiers', stdout.getvalue())
+        self.assertEqual(Recording.objects.count(), 2)
@@ -0,0 +1,88 @@
+"""
+Découpage automatique des longs enregistrements en parties
+"""
+import os
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.test import TestCase, override_settings
+from recordings import tasks
+from recordings.models import ProcessingJob, Recording, UserSettings
+from .audio import SAMPLE_RATE
+from .helpers import AudioFixtureMixin, api_client, read_wav
+
+
+class SplitRecordingTests(AudioFixtureMixin, TestCase):
+    """Parties d'auto_split_duration_minutes, copiées sans ré-encodage et traitées chacune par un job"""
+
+    fixture_seconds = 150
+
+    def setUp(self):
+        self.user = User.objects.create_user('split')
+        self.client = api_client(self.user)
+        self.settings = UserSettings.objects.create(
+            user=self.user, auto_split_enabled=True, auto_split_duration_minutes=1
+        )
+        self.media = override_settings(MEDIA_ROOT=os.path.join(self.tmp_dir, 'media'))
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+        self.recording = Recording(user=self.user, title='Antenne', custom_name='antenne', format='wav')
+        with open(self.wav_path, 'rb') as f:
+            self.recording.file.save('split.wav', File(f))
+
+    def test_split_creates_parts_and_jobs(self):
+        tasks.split_recording(self.recording.id)
+
+        self.recording.refresh_from_db()
+        self.assertTrue(self.recording.is_split)
+        self.assertAlmostEqual(self.recording.duration_seconds, self.fixture_seconds, delta=0.1)
+
+        parts = list(self.recording.parts.order_by('part_index'))
+        self.assertEqual([part.part_index for part in parts], [0, 1, 2])
+        self.assertEqual([part.title for part in parts], ['Antenne (1/3)', 'Antenne (2/3)', 'Antenne (3/3)'])
+        self.assertEqual(parts[2].custom_name, 'antenne-003')
+
+        # Parties contiguës, dont les échantillons reconstituent l'original
+        samples = []
+        for previous, part in zip([None] + parts, parts):
+            expected_offset = previous.offset_seconds + previous.duration_seconds if previous else 0
+            self.assertAlmostEqual(part.offset_seconds, expected_offset, places=3)
+            self.assertLessEqual(part.duration_seconds, 60 + 0.1)
+            samples.append(read_wav(part.file.path))
+        self.assertEqual(sum(len(s) for s in samples), self.fixture_seconds * SAMPLE_RATE)
+        self.assertTrue(os.path.exists(self.recording.file.path))
+
+        self.assertEqual(
+            set(ProcessingJob.objects.filter(kind='process', status='pending').values_list('recording_id', flat=True)),
+            {part.id for part in parts}
+        )
+
+        response = self.client.get(f'/api/recordings/{self.recording.id}/parts/')
+        self.assertEqual([item['id'] for item in response.data], [part.id for part in parts])
+        response = self.client.post(
+            f'/api/recordings/{self.recording.id}/trim/', {'start_time': 0, 'end_time': 10}, format='json'
+        )
+        self.assertEqual(response.status_code, 409)
+
+        # Relancé (retry du job) : déjà découpé, les parties ne sont pas recréées
+        with mock.patch.object(tasks, 'process_recording') as process:
+            tasks.split_recording(self.recording.id)
+        process.assert_called_once_with(self.recording.id, None)
+        self.assertEqual(self.recording.parts.count(), 3)
+
+    def test_short_or_disabled_recordings_are_processed_directly(self):
+        self.settings.auto_split_duration_minutes = 5
+        self.settings.save()
+        with mock.patch.object(tasks, 'process_recording') as process:
+            tasks.split_recording(self.recording.id, 'abc')
+        process.assert_called_once_with(self.recording.id, 'abc')
+
+        self.settings.auto_split_enabled = False
+        self.settings.save()
+        with mock.patch.object(tasks, 'process_recording') as process:
+            tasks.split_recording(self.recording.id)
+        process.assert_called_once_with(self.recording.id, None)
+
+        self.recording.refresh_from_db()
+        self.assertFalse(self.recording.is_split)
+        self.assertFalse(self.recording.parts.exists())
@@ -0,0 +1,100 @@
+"""
+Statistiques journalières tenues à jour par les signaux de Recording
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from recordings.models import Recording, RecordingDailyStats
+from recordings.stats import rebuild_daily_stats, recording_day
+from .helpers import api_client
+
+
+class DailyStatsSignalsTests(TestCase):
+    """Chaque écriture d'un enregistrement recalcule son bucket (utilisateur, jour, type)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('stats')
+        self.client = api_client(self.user)
+
+    def bucket(self, recording, type=None):
+        return RecordingDailyStats.objects.filter(
+            user=self.user, day=recording_day(recording), type=type or recording.type
+        ).first()
+
+    def snapshot(self):
+        return sorted(RecordingDailyStats.objects.filter(user=self.user).values_list(
+            'day', 'type', 'count', 'flagged_count', 'total_duration_seconds', 'total_silence_seconds'
+        ))
+
+    def test_create_update_delete(self):
+        first = Recording.objects.create(user=self.user, title='a', duration_seconds=60, total_silence_seconds=5)
+        second = Recording.objects.create(
+            user=self.user, title='b', duration_seconds=30, total_silence_seconds=10, flagged=True
+        )
+        stats = self.bucket(first)
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.flagged_count, 1)
+        self.assertEqual(stats.total_duration_seconds, 90)
+        self.assertEqual(stats.total_silence_seconds, 15)
+
+        first.flagged = True
+        first.save(update_fields=['flagged'])
+        self.assertEqual(self.bucket(first).flagged_count, 2)
+
+        second.delete()
+        stats = self.bucket(first)
+        self.assertEqual(stats.count, 1)
+        self.assertEqual(stats.total_duration_seconds, 60)
+
+        first.delete()
+        self.assertFalse(RecordingDailyStats.objects.filter(user=self.user).exists())
+
+    def test_type_change_moves_recording_between_buckets(self):
+        Recording.objects.create(user=self.user, title='a', type='antenne')
+        created = Recording.objects.create(user=self.user, title='b', type='antenne')
+        # Rechargé depuis la base : le type chargé est mémorisé par from_db
+        recording = Recording.objects.get(id=created.id)
+
+        recording.type = 'reunion'
+        recording.save()
+        self.assertEqual(self.bucket(recording, 'antenne').count, 1)
+        self.assertEqual(self.bucket(recording, 'reunion').count, 1)
+
+    def test_split_recordings_are_not_counted(self):
+        parent = Recording.objects.create(user=self.user, title='parent', duration_seconds=120)
+        Recording.objects.create(user=self.user, title='p1', duration_seconds=60, parent=parent)
+        Recording.objects.create(user=self.user, title='p2', duration_seconds=60, parent=parent)
+        self.assertEqual(self.bucket(parent).count, 3)
+
+        parent.is_split = True
+        parent.save(update_fields=['is_split'])
+        stats = self.bucket(parent)
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.total_duration_seconds, 120)
+
+    def test_unrelated_fields_do_not_refresh(self):
+        recording = Recording.objects.create(user=self.user, title='a')
+        RecordingDailyStats.objects.filter(user=self.user).update(count=42)
+        recording.title = 'renommé'
+        recording.save(update_fields=['title'])
+        self.assertEqual(self.bucket(recording).count, 42)
+
+    def test_signals_match_rebuild_and_api(self):
+        for index, type in enumerate(['antenne', 'emission', 'antenne', 'reunion']):
+            Recording.objects.create(
+                user=self.user, title=f'r{index}', type=type, duration_seconds=10 * (index + 1),
+                flagged=index % 2 == 0
+            )
+        incremental = self.snapshot()
+        self.assertEqual(len(incremental), 3)
+
+        rebuild_daily_stats(self.user.id)
+        self.assertEqual(self.snapshot(), incremental)
+
+        response = self.client.get('/api/recordings/stats/?bucket=day')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 4)
+        self.assertEqual(response.data['flagged'], 2)
+        self.assertEqual(response.data['by_type'], {'antenne': 2, 'emission': 1, 'reunion': 1})
+        self.assertEqual(len(response.data['series']), 1)
+        self.assertEqual(response.data['series'][0]['count'], 4)
+        self.assertEqual(response.data['series'][0]['duration_seconds'], 100)
@@ -0,0 +1,120 @@
+"""
+Trim : rapport VAD restreint (slice_report) et durée du fichier découpé
+"""
+import hashlib
+import os
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.test import TestCase, override_settings
+from recordings import peaks, tasks, vad
+from recordings.models import Recording
+from .helpers import AudioFixtureMixin
+
+
+class SliceReportTests(AudioFixtureMixin, TestCase):
+    """Le rapport d'un trim (slice_report) correspond à l'analyse du fichier découpé"""
+
+    # Segments postérieurs au démarrage de webrtcvad (premières trames peu fiables)
+    warmup_seconds = 1.0
+
+    def analyze(self, path):
+        return vad.analyze_blocks(vad.iter_wav_blocks(path, vad.frame_size_for(vad.ANALYSIS_SAMPLE_RATE)))
+
+    def assertSegmentsMatch(self, sliced, reanalyzed):
+        for key in ('voice_segments', 'silence_segments'):
+            expected = [s for s in reanalyzed[key] if s['start'] >= self.warmup_seconds]
+            actual = [s for s in sliced[key] if s['start'] >= self.warmup_seconds]
+            self.assertEqual(len(actual), len(expected), key)
+            for a, b in zip(actual, expected):
+                self.assertAlmostEqual(a['start'], b['start'], delta=0.001)
+                self.assertAlmostEqual(a['end'], b['end'], delta=0.001)
+
+    def trim(self, report, start, seconds):
+        output_path = os.path.join(self.tmp_dir, 'trim.wav')
+        tasks.cut_audio(self.wav_path, output_path, start, start + seconds)
+        duration = vad.decoded_duration(output_path)
+        return vad.slice_report(report, start, start + duration), self.analyze(output_path), duration
+
+    def test_trim_inside_silence(self):
+        report = self.analyze(self.wav_path)
+        silence = max(report['silence_segments'], key=lambda s: s['duration'])
+        # Début aligné sur une trame, au milieu du plus long silence
+        start = round((silence['start'] + silence['end']) / 2 / 0.03) * 0.03
+        sliced, reanalyzed, duration = self.trim(report, start, 20)
+
+        self.assertTrue(all(s['start'] > 0 for s in sliced['silence_segments']))
+        self.assertAlmostEqual(sliced['total_duration'], duration)
+        self.assertSegmentsMatch(sliced, reanalyzed)
+
+    def test_trim_inside_voice(self):
+        report = self.analyze(self.wav_path)
+        voice = max(report['voice_segments'], key=lambda s: s['duration'])
+        start = round((voice['start'] + voice['end']) / 2 / 0.03) * 0.03
+        sliced, reanalyzed, _ = self.trim(report, start, 20)
+
+        self.assertEqual(sliced['voice_segments'][0]['start'], 0)
+        self.assertSegmentsMatch(sliced, reanalyzed)
+
+    def processed_recording(self, name):
+        """Enregistrement traité (rapport VAD et sidecars .vad/.peaks) dans MEDIA_ROOT=tmp_dir"""
+        user = User.objects.create_user(name)
+        recording = Recording(user=user, title=name, format='wav')
+        with open(self.wav_path, 'rb') as f:
+            recording.file.save(f'{name}.wav', File(f))
+        tasks.process_recording(recording.id)
+        return Recording.objects.get(id=recording.id)
+
+    def test_trim_task_stores_file_duration(self):
+        with override_settings(MEDIA_ROOT=self.tmp_dir):
+            recording = self.processed_recording('trim')
+            tasks.trim_recording_task(recording.id, 12.5, 32.5)
+
+            recording.refresh_from_db()
+            duration = vad.decoded_duration(recording.file.path)
+            report = recording.get_full_vad_report()
+            decisions_header = vad.read_decisions_header(vad.decisions_sidecar_path(recording.file.path))
+            _, finest = peaks.read_peaks(peaks.peaks_sidecar_path(recording.file.path), max(peaks.PEAK_RESOLUTIONS))
+        self.assertEqual(recording.duration_seconds, duration)
+        self.assertAlmostEqual(report['total_duration'], duration)
+        self.assertTrue(all(s['start'] > 0 for s in report['silence_segments']))
+        # Sidecars restreints à la même fenêtre
+        self.assertAlmostEqual(decisions_header['frame_count'] * vad.FRAME_DURATION_MS / 1000, duration, delta=0.06)
+        self.assertAlmostEqual(len(finest) / max(peaks.PEAK_RESOLUTIONS), duration, delta=0.02)
+
+    def test_failed_trim_leaves_recording_intact(self):
+        with override_settings(MEDIA_ROOT=self.tmp_dir):
+            recording = self.processed_recording('trim-failed')
+            file_path = recording.file.path
+            paths = [file_path, vad.decisions_sidecar_path(file_path), peaks.peaks_sidecar_path(file_path)]
+            digests = [hashlib.sha256(open(path, 'rb').read()).hexdigest() for path in paths]
+
+            with mock.patch.object(peaks, 'slice_peaks', side_effect=OSError('disque plein')):
+                with self.assertRaises(OSError):
+                    tasks.trim_recording_task(recording.id, 12.5, 32.5)
+
+            self.assertEqual([hashlib.sha256(open(path, 'rb').read()).hexdigest() for path in paths], digests)
+            self.assertFalse([name for name in os.listdir(os.path.dirname(file_path)) if name.startswith('.trim_')])
+        trimmed = Recording.objects.get(id=recording.id)
+        self.assertEqual(trimmed.duration_seconds, recording.duration_seconds)
+        self.assertEqual(trimmed.get_full_vad_report(), recording.get_full_vad_report())
+
+    def test_replayed_trim_does_not_cut_twice(self):
+        with override_settings(MEDIA_ROOT=self.tmp_dir):
+            recording = self.processed_recording('trim-replay')
+            file_path = recording.file.path
+
+            # Panne entre l'enregistrement du trim et la bascule des fichiers
+            with mock.patch.object(tasks, 'swap_staged_files', side_effect=OSError('interrompu')):
+                with self.assertRaises(OSError):
+                    tasks.trim_recording_task(recording.id, 12.5, 32.5, trim_id='replay')
+            self.assertEqual(vad.decoded_duration(file_path), recording.duration_seconds)
+
+            # Le job rejoué termine la bascule, puis ne fait plus rien
+            for _ in range(2):
+                tasks.trim_recording_task(recording.id, 12.5, 32.5, trim_id='replay')
+                trimmed = Recording.objects.get(id=recording.id)
+                self.assertEqual(vad.decoded_duration(file_path), trimmed.duration_seconds)
+                self.assertAlmostEqual(trimmed.duration_seconds, 20, delta=0.1)
+            self.assertEqual(trimmed.last_trim_id, 'replay')
+            self.assertFalse([name for name in os.listdir(os.path.dirname(file_path)) if name.startswith('.trim_')])
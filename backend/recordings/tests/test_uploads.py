@@ -0,0 +1,88 @@
+"""
+Uploads reprenables (création, PATCH, HEAD, finalisation)
+"""
+import base64
+import hashlib
+import os
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from recordings.models import ProcessingJob, Recording, UploadSession
+from .helpers import AudioFixtureMixin, api_client
+
+
+@override_settings(UPLOAD_MAX_SIZE=10 * 1024 * 1024)
+class ResumableUploadTests(AudioFixtureMixin, TestCase):
+    """Upload reprenable: ouverture, PATCH par morceaux, reprise, finalisation"""
+
+    fixture_seconds = 10
+
+    def setUp(self):
+        self.user = User.objects.create_user('uploader')
+        self.client = api_client(self.user)
+        self.media = override_settings(MEDIA_ROOT=os.path.join(self.tmp_dir, 'media'))
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+        with open(self.wav_path, 'rb') as f:
+            self.content = f.read()
+
+    def patch(self, upload_id, offset, data, **headers):
+        return self.client.generic(
+            'PATCH', f'/api/uploads/{upload_id}/', data,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset), **headers
+        )
+
+    def test_upload_and_finalize(self):
+        response = self.client.post(
+            '/api/uploads/',
+            {'filename': 'antenne.wav', 'upload_length': len(self.content), 'title': 'Antenne'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.data['id']
+        middle = len(self.content) // 2
+
+        self.assertEqual(self.patch(upload_id, 0, self.content[:middle]).status_code, 204)
+        # Offset périmé (réponse perdue puis renvoi): refusé, l'offset courant est indiqué
+        stale = self.patch(upload_id, 0, self.content[:middle])
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(stale['Upload-Offset'], str(middle))
+
+        incomplete = self.client.post(f'/api/uploads/{upload_id}/finalize/')
+        self.assertEqual(incomplete.status_code, 409)
+
+        head = self.client.head(f'/api/uploads/{upload_id}/')
+        offset = int(head['Upload-Offset'])
+        rest = self.content[offset:]
+        checksum = base64.b64encode(hashlib.sha256(rest).digest()).decode()
+        response = self.patch(upload_id, offset, rest, HTTP_UPLOAD_CHECKSUM=f'sha256 {checksum}')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response['Upload-Offset'], str(len(self.content)))
+
+        response = self.client.post(f'/api/uploads/{upload_id}/finalize/')
+        self.assertEqual(response.status_code, 201)
+        recording = Recording.objects.get(user=self.user)
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(recording.title, 'Antenne')
+        self.assertEqual(recording.source_sha256, sha256)
+        with recording.file.open('rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+        job = ProcessingJob.objects.get(recording=recording)
+        self.assertEqual(job.payload, {'source_sha256': sha256})
+        self.assertEqual(UploadSession.objects.get(id=upload_id).status, 'complete')
+
+        # Finalisation rejouée: même enregistrement, aucun nouveau job
+        replay = self.client.post(f'/api/uploads/{upload_id}/finalize/')
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(Recording.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(ProcessingJob.objects.filter(recording=recording).count(), 1)
+
+    def test_checksum_mismatch(self):
+        response = self.client.post(
+            '/api/uploads/', {'filename': 'antenne.wav', 'upload_length': len(self.content)}, format='json'
+        )
+        upload_id = response.data['id']
+        checksum = base64.b64encode(hashlib.sha256(b'autre chose').digest()).decode()
+        response = self.patch(upload_id, 0, self.content, HTTP_UPLOAD_CHECKSUM=f'sha256 {checksum}')
+        self.assertEqual(response.status_code, 460)
+        self.assertEqual(self.client.head(f'/api/uploads/{upload_id}/')['Upload-Offset'], '0')
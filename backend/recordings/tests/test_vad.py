@@ -0,0 +1,144 @@
+"""
+Analyse VAD : flux, pipe ffmpeg, vectorisation, shards, reprise d'une capture
+
+L'analyse séquentielle (une seule instance webrtcvad) est la référence. Les
+modes qui repartent d'une nouvelle instance (shards parallèles, reprise d'une
+capture) sont approchés : leurs écarts doivent rester collés aux transitions.
+"""
+import hashlib
+import os
+import numpy as np
+import webrtcvad
+from django.test import TestCase, override_settings
+from recordings import tasks, vad
+from .helpers import AudioFixtureMixin, read_wav
+
+
+class VadPathsTests(AudioFixtureMixin, TestCase):
+    """Décisions VAD des différentes façons d'analyser un fichier"""
+
+    fixture_seconds = 300
+    # Shards courts pour couvrir plusieurs changements d'instance webrtcvad
+    shard_seconds = 60
+    overlap_seconds = 10
+    # Écart toléré par rapport à l'analyse séquentielle (trames de 30 ms)
+    max_edge_frames = 3
+    max_mismatch_rate = 0.001
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.samples = read_wav(cls.wav_path)
+        cls.pcm_path = os.path.join(cls.tmp_dir, 'speech.pcm')
+        cls.samples.astype('<i2').tofile(cls.pcm_path)
+
+        # Référence: fichier WAV lu en flux par blocs
+        analyzer = vad.StreamAnalyzer(keep_decisions=True)
+        for block in vad.iter_wav_blocks(cls.wav_path, vad.frame_size_for(vad.ANALYSIS_SAMPLE_RATE)):
+            analyzer.feed(block)
+        cls.decisions = analyzer.decisions()
+        cls.report = analyzer.finish()
+        cls.edges = np.flatnonzero(np.diff(cls.decisions.astype(np.int8))) + 1
+
+    def assertCloseDecisions(self, decisions):
+        """Trames divergentes rares et à moins de max_edge_frames d'une transition séquentielle"""
+        self.assertEqual(len(decisions), len(self.decisions))
+        mismatches = np.flatnonzero(decisions != self.decisions)
+        self.assertLessEqual(len(mismatches), self.max_mismatch_rate * len(self.decisions))
+        for frame in mismatches:
+            self.assertLessEqual(np.abs(self.edges - frame).min(), self.max_edge_frames, f"trame {frame}")
+
+    def assertCloseReports(self, report):
+        """Mêmes segments, bornes décalées d'au plus max_edge_frames trames"""
+        tolerance = self.max_edge_frames * vad.FRAME_DURATION_MS / 1000 + 1e-6
+        self.assertEqual(report['total_duration'], self.report['total_duration'])
+        for key in ('voice_segments', 'silence_segments'):
+            self.assertEqual(len(report[key]), len(self.report[key]))
+            for segment, expected in zip(report[key], self.report[key]):
+                self.assertAlmostEqual(segment['start'], expected['start'], delta=tolerance)
+                self.assertAlmostEqual(segment['end'], expected['end'], delta=tolerance)
+
+    def test_ffmpeg_pipe(self):
+        analysis = tasks.analyze_audio_file(self.wav_path)
+        np.testing.assert_array_equal(analysis['decisions'], self.decisions)
+        self.assertEqual(analysis['report'], self.report)
+        self.assertEqual(analysis['pcm_sha256'], hashlib.sha256(self.samples.tobytes()).hexdigest())
+
+    def test_irregular_blocks(self):
+        analyzer = vad.StreamAnalyzer(keep_decisions=True)
+        for start in range(0, len(self.samples), 77777):
+            analyzer.feed(self.samples[start:start + 77777])
+        np.testing.assert_array_equal(analyzer.decisions(), self.decisions)
+        self.assertEqual(analyzer.finish(), self.report)
+
+    def test_vectorized_matches_frame_loop(self):
+        frame_size = vad.frame_size_for(vad.ANALYSIS_SAMPLE_RATE)
+        shard = self.samples[:self.shard_seconds * vad.ANALYSIS_SAMPLE_RATE]
+        detector = webrtcvad.Vad(2)
+        expected = [
+            detector.is_speech(shard[i:i + frame_size].tobytes(), vad.ANALYSIS_SAMPLE_RATE)
+            for i in range(0, len(shard), frame_size)
+        ]
+        np.testing.assert_array_equal(self.decisions[:len(expected)], expected)
+
+        segmenter = vad.VadSegmenter(vad.ANALYSIS_SAMPLE_RATE)
+        for frame, decision in enumerate(self.decisions):
+            segmenter.push_decisions(frame, [decision], frame_size)
+        self.assertEqual(segmenter.finish(len(self.samples)), self.report)
+
+    def test_parallel(self):
+        decisions, skipped_frames = vad.classify_pcm_file_parallel(
+            self.pcm_path, workers=2, shard_seconds=self.shard_seconds, overlap_seconds=self.overlap_seconds
+        )
+        self.assertCloseDecisions(decisions)
+        self.assertEqual(skipped_frames, 0)
+        # Le premier shard est analysé exactement comme en séquentiel
+        first_shard = int(self.shard_seconds * 1000 / vad.FRAME_DURATION_MS)
+        np.testing.assert_array_equal(decisions[:first_shard], self.decisions[:first_shard])
+
+        report = vad.analyze_pcm_file_parallel(
+            self.pcm_path, workers=2, shard_seconds=self.shard_seconds, overlap_seconds=self.overlap_seconds
+        )
+        self.assertCloseReports(report)
+
+    @override_settings(VAD_PARALLEL_MIN_SECONDS=0)
+    def test_parallel_analyze_audio_file(self):
+        sequential = tasks.analyze_audio_file(self.wav_path, energy_floor_dbfs=-50)
+        parallel = tasks.analyze_audio_file(self.wav_path, energy_floor_dbfs=-50, workers=2)
+        self.assertEqual(parallel['shards'], (vad.SHARD_SECONDS, vad.OVERLAP_SECONDS))
+        self.assertIsNone(sequential['shards'])
+        # Le pré-filtre d'énergie ne dépend pas de l'état de webrtcvad
+        self.assertEqual(parallel['skipped_frames'], sequential['skipped_frames'])
+        self.assertEqual(parallel['pcm_sha256'], sequential['pcm_sha256'])
+        mismatches = np.count_nonzero(parallel['decisions'] != sequential['decisions'])
+        self.assertLessEqual(mismatches, self.max_mismatch_rate * len(sequential['decisions']))
+
+    def test_resumed_analysis(self):
+        """Capture en direct: reprise depuis get_state() à chaque morceau"""
+        state, report, blocks = None, None, []
+        step = 97 * vad.ANALYSIS_SAMPLE_RATE + 123
+        for start in range(0, len(self.samples), step):
+            if state is None:
+                analyzer = vad.StreamAnalyzer(keep_decisions=True)
+            else:
+                analyzer = vad.StreamAnalyzer.restore(state, report)
+                analyzer.keep_decisions = True
+                analyzed = analyzer.analyzed_samples()
+                warmup_start = max(0, analyzed - vad.OVERLAP_SECONDS * vad.ANALYSIS_SAMPLE_RATE)
+                analyzer.warm_up(self.samples[warmup_start:analyzed])
+            analyzer.feed(self.samples[start:start + step])
+            blocks.append(analyzer.decisions())
+            report, state = analyzer.report(), analyzer.get_state()
+        self.assertCloseDecisions(np.concatenate(blocks))
+        self.assertCloseReports(analyzer.finish())
+
+    def test_blocks_shorter_than_a_frame(self):
+        detector = webrtcvad.Vad(2)
+        for length in (0, 1, vad.frame_size_for(vad.ANALYSIS_SAMPLE_RATE) - 1):
+            samples = np.zeros(length, dtype=np.int16)
+            self.assertEqual(len(vad.classify_frames(detector, samples, vad.ANALYSIS_SAMPLE_RATE, 480)), 0)
+
+        analyzer = vad.StreamAnalyzer()
+        for _ in range(3):
+            analyzer.feed(np.zeros(100, dtype=np.int16))
+        self.assertEqual(analyzer.finish()['total_duration'], 300 / vad.ANALYSIS_SAMPLE_RATE)
@@ -0,0 +1,240 @@
+"""
+Uploads reprenables par morceaux (protocole inspiré de tus 1.0)
+
+- POST   /api/uploads/                    crée la session et réserve le fichier final
+- PATCH  /api/uploads/{id}/               ajoute un morceau à Upload-Offset (fsync)
+- HEAD   /api/uploads/{id}/               position actuelle (reprise après coupure)
+- POST   /api/uploads/{id}/finalize/      crée l'enregistrement et enfile le traitement
+- DELETE /api/uploads/{id}/               abandonne l'upload
+
+Les morceaux sont lus par blocs depuis le flux de la requête et écrits à leur
+position dans le fichier final : la mémoire utilisée ne dépend pas de la taille
+du fichier. L'empreinte SHA-256 est calculée au fil des morceaux.
+"""
+from collections import OrderedDict
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from .models import Recording, UploadSession
+import base64
+import hashlib
+import os
+import threading
+
+
+TUS_VERSION = '1.0.0'
+OFFSET_CONTENT_TYPE = 'application/offset+octet-stream'
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Empreintes en cours par session : {id: (offset, hashlib.sha256)}
+# Propres au processus : un morceau reçu par un autre processus est rattrapé
+# en relisant seulement la partie manquante du fichier (catch_up_hasher)
+_HASHERS = OrderedDict()
+_HASHERS_MAX = 256
+_HASHERS_LOCK = threading.Lock()
+
+
+class UploadError(Exception):
+    """Morceau refusé : status est le code HTTP à renvoyer"""
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+def reserve_file(original_name):
+    """
+    Crée un fichier vide à l'emplacement définitif (upload_to du champ file)
+    Retourne le chemin relatif à MEDIA_ROOT
+    """
+    field = Recording._meta.get_field('file')
+    name = field.generate_filename(None, original_name)
+    while True:
+        name = default_storage.get_available_name(name)
+        path = default_storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            with open(path, 'xb'):
+                pass
+            return name
+        except FileExistsError:
+            # Nom pris entre get_available_name et la création : on recommence
+            continue
+
+
+def create_session(user, original_name, upload_length, metadata):
+    """Ouvre une session d'upload et réserve son fichier"""
+    session = UploadSession.objects.create(
+        user=user,
+        file_name=reserve_file(original_name),
+        original_name=original_name,
+        upload_length=upload_length,
+        metadata=metadata,
+        expires_at=timezone.now() + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+    )
+    _remember_hasher(session.id, 0, hashlib.sha256())
+    return session
+
+
+def session_path(session):
+    """Chemin absolu du fichier en cours d'upload"""
+    return default_storage.path(session.file_name)
+
+
+def _remember_hasher(session_id, offset, hasher):
+    with _HASHERS_LOCK:
+        _HASHERS[session_id] = (offset, hasher)
+        _HASHERS.move_to_end(session_id)
+        while len(_HASHERS) > _HASHERS_MAX:
+            _HASHERS.popitem(last=False)
+
+
+def _cached_hasher(session_id, offset):
+    """Copie de l'empreinte en cours si elle correspond exactement à offset"""
+    with _HASHERS_LOCK:
+        cached = _HASHERS.get(session_id)
+    if cached and cached[0] == offset:
+        return cached[1].copy()
+    return None
+
+
+def parse_checksum(header):
+    """En-tête Upload-Checksum ('sha256 <base64>') -> empreinte attendue en octets"""
+    if not header:
+        return None
+    algorithm, _, value = header.strip().partition(' ')
+    if algorithm.lower() != 'sha256':
+        raise UploadError(f"Algorithme de contrôle non supporté: {algorithm}", 400)
+    try:
+        return base64.b64decode(value, validate=True)
+    except ValueError:
+        raise UploadError("Upload-Checksum invalide", 400)
+
+
+def write_chunk(session, stream, offset, content_length, checksum=None):
+    """
+    Écrit un morceau à la position offset du fichier final
+
+    Le morceau est lu par blocs de READ_BLOCK_SIZE, écrit puis synchronisé sur
+    disque (fsync) avant que l'offset ne soit enregistré en base. Si la
+    connexion est coupée, les octets déjà reçus sont conservés (le client
+    reprend à l'offset renvoyé par HEAD), sauf si un Upload-Checksum est
+    fourni : le morceau incomplet est alors annulé.
+
+    Returns:
+        Nouvel offset
+
+    Raises:
+        UploadError: offset incohérent (409), taille dépassée (413),
+                     contrôle d'intégrité en échec (460)
+    """
+    if session.status != 'uploading':
+        raise UploadError("Upload déjà finalisé ou abandonné", 409)
+    if offset != session.offset:
+        raise UploadError(f"Upload-Offset attendu: {session.offset}", 409)
+    if content_length is not None and offset + content_length > session.upload_length:
+        raise UploadError("Le morceau dépasse la taille annoncée", 413)
+
+    expected = parse_checksum(checksum)
+    chunk_digest = hashlib.sha256() if expected is not None else None
+    hasher = _cached_hasher(session.id, offset)
+    remaining = session.upload_length - offset
+    if content_length is not None:
+        remaining = min(remaining, content_length)
+
+    path = session_path(session)
+    written = 0
+    interrupted = False
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        try:
+            while written < remaining:
+                data = stream.read(min(READ_BLOCK_SIZE, remaining - written))
+                if not data:
+                    break
+                f.write(data)
+                written += len(data)
+                if chunk_digest is not None:
+                    chunk_digest.update(data)
+                if hasher is not None:
+                    hasher.update(data)
+        except OSError as e:
+            # Connexion interrompue : on garde ce qui a été reçu
+            print(f"Upload {session.id} interrompu à {offset + written}: {str(e)}")
+            interrupted = True
+
+        if expected is not None and (interrupted or chunk_digest.digest() != expected):
+            f.truncate(offset)
+            f.flush()
+            os.fsync(f.fileno())
+            raise UploadError("Contrôle d'intégrité du morceau en échec", 460)
+
+        f.flush()
+        os.fsync(f.fileno())
+
+    new_offset = offset + written
+    # UPDATE conditionnel: deux PATCH concurrents au même offset ne peuvent
+    # pas avancer la session deux fois
+    updated = UploadSession.objects.filter(id=session.id, offset=offset, status='uploading').update(
+        offset=new_offset,
+        updated_at=timezone.now(),
+        expires_at=timezone.now() + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+    )
+    if not updated:
+        raise UploadError("Upload modifié par une autre requête", 409)
+    if hasher is not None:
+        _remember_hasher(session.id, new_offset, hasher)
+    session.offset = new_offset
+    return new_offset
+
+
+def catch_up_hasher(session):
+    """
+    Empreinte SHA-256 des session.offset premiers octets
+    Ne relit que la partie du fichier non couverte par l'empreinte en cours
+    """
+    with _HASHERS_LOCK:
+        cached = _HASHERS.get(session.id)
+    if cached and cached[0] <= session.offset:
+        position, hasher = cached[0], cached[1].copy()
+    else:
+        position, hasher = 0, hashlib.sha256()
+
+    if position < session.offset:
+        with open(session_path(session), 'rb') as f:
+            f.seek(position)
+            while position < session.offset:
+                data = f.read(min(READ_BLOCK_SIZE, session.offset - position))
+                if not data:
+                    break
+                hasher.update(data)
+                position += len(data)
+        _remember_hasher(session.id, position, hasher)
+    return hasher
+
+
+def forget_session(session):
+    """Libère l'empreinte en cours d'une session terminée"""
+    with _HASHERS_LOCK:
+        _HASHERS.pop(session.id, None)
+
+
+def abort_session(session):
+    """Abandonne un upload et supprime son fichier partiel"""
+    forget_session(session)
+    UploadSession.objects.filter(id=session.id).update(status='aborted')
+    try:
+        os.remove(session_path(session))
+    except FileNotFoundError:
+        pass
+
+
+def purge_stale_uploads():
+    """Supprime les uploads inachevés dont la session a expiré"""
+    stale = UploadSession.objects.filter(status='uploading', expires_at__lt=timezone.now())
+    count = 0
+    for session in stale.iterator():
+        abort_session(session)
+        count += 1
+    return count
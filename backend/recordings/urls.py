@@ -1,12 +1,14 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from .views import RecordingViewSet, SignupViewSet, UserSettingsViewSet
+from .views import RecordingViewSet, SignupViewSet, UploadViewSet, UserSettingsViewSet, metrics_view
 
 router = DefaultRouter()
 router.register(r'recordings', RecordingViewSet, basename='recording')
+router.register(r'uploads', UploadViewSet, basename='upload')
 router.register(r'signup', SignupViewSet, basename='signup')
 router.register(r'settings', UserSettingsViewSet, basename='settings')
 
 urlpatterns = [
+    re_path(r'^metrics/?$', metrics_view, name='metrics'),
     path('', include(router.urls)),
 ]
@@ -0,0 +1,668 @@
+"""
+Moteur de détection d'activité vocale (VAD) en flux
+L'audio est lu par blocs de trames de 30 ms : la mémoire utilisée ne dépend pas
+de la durée de l'enregistrement.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import base64
+import hashlib
+import io
+import multiprocessing
+import os
+import struct
+import subprocess
+import tempfile
+import wave
+import numpy as np
+import webrtcvad
+import ffmpeg
+
+
+ANALYSIS_SAMPLE_RATE = 16000  # PCM 16 kHz mono pour webrtcvad
+FRAME_DURATION_MS = 30  # 10, 20 ou 30 ms (requis par webrtcvad)
+WAV_HEADER_SIZE = 44  # En-tête WAV canonique (PCM, sans chunk supplémentaire)
+BLOCK_FRAMES = 1000  # Trames lues par bloc (30 s d'audio)
+SHARD_SECONDS = 600  # Durée d'un shard en mode parallèle
+OVERLAP_SECONDS = 30  # Audio analysé avant un shard ou une reprise pour amorcer l'état de webrtcvad
+
+
+def frame_size_for(sample_rate, frame_duration_ms=FRAME_DURATION_MS):
+    """Nombre d'échantillons par trame VAD"""
+    return int(sample_rate * frame_duration_ms / 1000)
+
+
+def iter_wav_blocks(file_path, frame_size, block_frames=BLOCK_FRAMES):
+    """
+    Lit un fichier WAV PCM 16 bits mono par blocs de block_frames trames
+    Le dernier bloc peut contenir une trame incomplète
+    """
+    with wave.open(file_path, 'rb') as wf:
+        while True:
+            frames = wf.readframes(frame_size * block_frames)
+            if not frames:
+                break
+            yield np.frombuffer(frames, dtype=np.int16)
+
+
+def empty_wav_bytes(sample_rate=ANALYSIS_SAMPLE_RATE):
+    """En-tête d'un fichier WAV PCM 16 bits mono vide (44 octets)"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+    return buffer.getvalue()
+
+
+def append_pcm_to_wav(file_path, samples):
+    """
+    Ajoute des échantillons int16 à la fin d'un WAV créé par empty_wav_bytes
+    et met à jour les tailles de l'en-tête (RIFF et data)
+    """
+    with open(file_path, 'r+b') as f:
+        f.seek(0, os.SEEK_END)
+        f.write(samples.astype('<i2', copy=False).tobytes())
+        data_size = f.tell() - WAV_HEADER_SIZE
+        f.seek(4)
+        f.write(struct.pack('<I', 36 + data_size))
+        f.seek(40)
+        f.write(struct.pack('<I', data_size))
+
+
+def read_wav_samples(file_path, start, end):
+    """Lit les échantillons [start, end) d'un WAV créé par empty_wav_bytes"""
+    with open(file_path, 'rb') as f:
+        f.seek(WAV_HEADER_SIZE + 2 * start)
+        return np.frombuffer(f.read(2 * (end - start)), dtype='<i2')
+
+
+def iter_ffmpeg_blocks(file_path, sample_rate=ANALYSIS_SAMPLE_RATE, block_frames=BLOCK_FRAMES):
+    """
+    Décode un fichier audio avec ffmpeg en PCM s16le mono sur pipe:1 et le lit
+    par blocs, sans passer par un fichier WAV intermédiaire
+
+    stderr est écrit dans un fichier temporaire et non dans un pipe : un pipe
+    lu seulement après la fin de stdout bloquerait ffmpeg dès que ses messages
+    dépassent la taille du tampon du pipe.
+    """
+    block_bytes = frame_size_for(sample_rate) * block_frames * 2
+    args = (
+        ffmpeg
+        .input(file_path)
+        .output('pipe:1', format='s16le', acodec='pcm_s16le', ac=1, ar=sample_rate)
+        .global_args('-nostdin', '-loglevel', 'error')
+        .compile()
+    )
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            while True:
+                data = process.stdout.read(block_bytes)
+                if not data:
+                    break
+                if len(data) % 2:
+                    data = data[:-1]
+                yield np.frombuffer(data, dtype=np.int16)
+
+            process.stdout.close()
+            if process.wait() != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"ffmpeg: {stderr.read().decode(errors='replace').strip()}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+
+def decoded_duration(file_path, sample_rate=ANALYSIS_SAMPLE_RATE):
+    """
+    Durée exacte d'un fichier audio (secondes) : lue dans l'en-tête d'un WAV
+    PCM, sinon comptée sur les échantillons décodés par ffmpeg (la durée
+    annoncée par un conteneur compressé n'est qu'une estimation)
+    """
+    try:
+        with wave.open(file_path, 'rb') as wf:
+            return wf.getnframes() / wf.getframerate()
+    except (wave.Error, EOFError):
+        pass
+    total_samples = sum(len(block) for block in iter_ffmpeg_blocks(file_path, sample_rate))
+    return total_samples / sample_rate
+
+
+def decode_to_pcm_file(file_path, output_path, sample_rate=ANALYSIS_SAMPLE_RATE):
+    """Décode un fichier audio en PCM brut s16le mono (sans en-tête), lisible par np.memmap"""
+    (
+        ffmpeg
+        .input(file_path)
+        .output(output_path, format='s16le', acodec='pcm_s16le', ac=1, ar=sample_rate)
+        .global_args('-nostdin', '-loglevel', 'error')
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    return output_path
+
+
+def iter_pcm_file_blocks(pcm_path, frame_size, block_frames=BLOCK_FRAMES):
+    """Lit un fichier PCM brut s16le par blocs de block_frames trames"""
+    with open(pcm_path, 'rb') as f:
+        while True:
+            data = f.read(frame_size * block_frames * 2)
+            if not data:
+                break
+            if len(data) % 2:
+                data = data[:-1]
+            yield np.frombuffer(data, dtype=np.int16)
+
+
+class VadSegmenter:
+    """
+    Construit les segments de voix et de silence à partir des décisions VAD
+    trame par trame. L'état (segment courant, totaux) est conservé entre les
+    blocs, ce qui permet d'analyser l'audio en flux.
+
+    Une reprise peut se faire sans les segments déjà clos : les listes ne
+    contiennent alors que les nouveaux segments, et les compteurs du rapport
+    incluent les segments antérieurs (conservés dans l'état).
+    """
+
+    def __init__(self, sample_rate, state=None, voice_segments=None, silence_segments=None):
+        self.sample_rate = sample_rate
+        self.voice_segments = voice_segments if voice_segments is not None else []
+        self.silence_segments = silence_segments if silence_segments is not None else []
+        self.is_speaking = False
+        self.segment_start = 0
+        self.total_silence_seconds = 0
+        # Segments clos absents des listes (reprise sans les segments)
+        self.previous_voice_count = 0
+        self.previous_silence_count = 0
+        if state:
+            self.is_speaking = state['is_speaking']
+            self.segment_start = state['segment_start']
+            self.total_silence_seconds = state['total_silence_seconds']
+            self.previous_voice_count = max(0, state.get('voice_segments_count', 0) - len(self.voice_segments))
+            self.previous_silence_count = max(0, state.get('silence_segments_count', 0) - len(self.silence_segments))
+
+    def get_state(self):
+        """État du segment en cours et compteurs (sérialisable en JSON, hors listes de segments)"""
+        return {
+            'is_speaking': self.is_speaking,
+            'segment_start': self.segment_start,
+            'total_silence_seconds': self.total_silence_seconds,
+            'voice_segments_count': self.previous_voice_count + len(self.voice_segments),
+            'silence_segments_count': self.previous_silence_count + len(self.silence_segments),
+        }
+
+    def push_decisions(self, first_frame, decisions, frame_size):
+        """
+        Ajoute une suite de décisions VAD pour les trames first_frame, first_frame+1, ...
+
+        Les changements d'état (début/fin de parole) sont extraits par
+        run-length encoding vectorisé : seule la création des segments est
+        faite en Python, une fois par segment et non plus par trame.
+        """
+        decisions = np.asarray(decisions, dtype=bool)
+        if not len(decisions):
+            return
+
+        # Trames où la décision diffère de la précédente (état courant pour la première)
+        transitions = np.flatnonzero(np.diff(decisions, prepend=self.is_speaking))
+        if not len(transitions):
+            return
+
+        times = ((first_frame + transitions) * frame_size / self.sample_rate).tolist()
+        starts_voice = decisions[transitions].tolist()
+
+        for current_time, is_voice in zip(times, starts_voice):
+            if is_voice:
+                # Début de parole
+                if self.segment_start > 0:
+                    self.silence_segments.append({
+                        'start': self.segment_start,
+                        'end': current_time,
+                        'duration': current_time - self.segment_start
+                    })
+                    self.total_silence_seconds += (current_time - self.segment_start)
+            else:
+                # Fin de parole
+                self.voice_segments.append({
+                    'start': self.segment_start,
+                    'end': current_time,
+                    'duration': current_time - self.segment_start
+                })
+            self.segment_start = current_time
+
+        self.is_speaking = bool(decisions[-1])
+
+    def finish(self, total_samples):
+        """Clôture le segment en cours et retourne le rapport VAD"""
+        total_duration = total_samples / self.sample_rate
+
+        # Fin du fichier
+        if self.is_speaking:
+            self.voice_segments.append({
+                'start': self.segment_start,
+                'end': total_duration,
+                'duration': total_duration - self.segment_start
+            })
+        elif self.segment_start > 0:
+            self.silence_segments.append({
+                'start': self.segment_start,
+                'end': total_duration,
+                'duration': total_duration - self.segment_start
+            })
+            self.total_silence_seconds += (total_duration - self.segment_start)
+
+        return self.report(total_samples)
+
+    def report(self, total_samples):
+        """
+        Rapport VAD des segments clos (le segment en cours n'y figure pas)
+        Après une reprise sans les segments, les listes ne contiennent que les nouveaux
+        """
+        total_duration = total_samples / self.sample_rate
+        silence_percentage = (self.total_silence_seconds / total_duration * 100) if total_duration > 0 else 0
+
+        return {
+            'voice_segments': self.voice_segments,
+            'silence_segments': self.silence_segments,
+            'total_silence_seconds': self.total_silence_seconds,
+            'total_duration': total_duration,
+            'silence_percentage': round(silence_percentage, 2),
+            'voice_segments_count': self.previous_voice_count + len(self.voice_segments),
+            'silence_segments_count': self.previous_silence_count + len(self.silence_segments),
+        }
+
+
+class StreamAnalyzer:
+    """
+    Analyse VAD incrémentale d'un flux PCM int16
+
+    Les blocs peuvent avoir une taille quelconque : les échantillons qui ne
+    forment pas une trame complète sont reportés sur le bloc suivant.
+    L'état peut être sauvegardé (get_state) puis restauré (restore) pour
+    reprendre l'analyse plus tard, par exemple à l'arrivée d'un nouveau
+    morceau d'une capture en direct. L'état interne de webrtcvad n'est pas
+    sérialisable : après une reprise, warm_up() le ré-amorce avec la fin de
+    l'audio déjà analysé. Sans le rapport précédent, restore() reprend avec
+    les seuls compteurs : le rapport ne liste alors que les nouveaux segments.
+
+    Si energy_floor_dbfs est défini, les trames dont l'énergie RMS est sous ce
+    plancher sont marquées non-voix sans appel à webrtcvad (pré-filtre).
+
+    Avec keep_decisions=True, les décisions trame par trame sont conservées
+    (decisions()) et l'empreinte SHA-256 du PCM est calculée au fil du flux
+    (pcm_sha256()), pour alimenter le cache VAD.
+    """
+
+    def __init__(self, sample_rate=ANALYSIS_SAMPLE_RATE, sensitivity=2, frame_duration_ms=FRAME_DURATION_MS,
+                 energy_floor_dbfs=None, segmenter=None, keep_decisions=False):
+        self.sample_rate = sample_rate
+        self.energy_floor_dbfs = energy_floor_dbfs
+        self.vad = webrtcvad.Vad(sensitivity)
+        self.frame_size = frame_size_for(sample_rate, frame_duration_ms)
+        self.segmenter = segmenter or VadSegmenter(sample_rate)
+        self.total_samples = 0
+        self.skipped_frames = 0
+        self.pending = np.empty(0, dtype=np.int16)
+        self.keep_decisions = keep_decisions
+        self.decision_blocks = []
+        self.sha256 = hashlib.sha256() if keep_decisions else None
+
+    def feed(self, block):
+        """Analyse un bloc d'échantillons int16"""
+        if self.sha256 is not None:
+            self.sha256.update(block.tobytes())
+        self.total_samples += len(block)
+        if len(self.pending):
+            block = np.concatenate((self.pending, block))
+        # Index (dans le fichier) de la première trame du bloc
+        first_frame = (self.total_samples - len(block)) // self.frame_size
+
+        usable = len(block) - len(block) % self.frame_size
+        quiet = None
+        if self.energy_floor_dbfs is not None:
+            quiet = quiet_frames_mask(block[:usable], self.frame_size, self.energy_floor_dbfs)
+            self.skipped_frames += int(quiet.sum())
+        decisions = classify_frames(self.vad, block[:usable], self.sample_rate, self.frame_size, quiet)
+        self.segmenter.push_decisions(first_frame, decisions, self.frame_size)
+        if self.keep_decisions:
+            self.decision_blocks.append(decisions)
+        self.pending = block[usable:]
+
+    def decisions(self):
+        """Décisions VAD de toutes les trames analysées (keep_decisions=True)"""
+        return np.concatenate(self.decision_blocks) if self.decision_blocks else np.zeros(0, dtype=bool)
+
+    def pcm_sha256(self):
+        """Empreinte SHA-256 du PCM analysé (keep_decisions=True)"""
+        return self.sha256.hexdigest()
+
+    def warm_up(self, samples):
+        """Amorce l'état de webrtcvad avec de l'audio déjà analysé (décisions ignorées)"""
+        classify_frames(self.vad, samples, self.sample_rate, self.frame_size)
+
+    def analyzed_samples(self):
+        """Nombre d'échantillons déjà classés (trames complètes)"""
+        return self.total_samples - len(self.pending)
+
+    def report(self):
+        """Rapport intermédiaire (segment en cours non clos)"""
+        return self._with_counters(self.segmenter.report(self.total_samples))
+
+    def finish(self):
+        """Clôture l'analyse et retourne le rapport VAD final"""
+        return self._with_counters(self.segmenter.finish(self.total_samples))
+
+    def _with_counters(self, report):
+        if self.energy_floor_dbfs is not None:
+            add_prefilter_counters(
+                report, self.energy_floor_dbfs, self.total_samples // self.frame_size, self.skipped_frames
+            )
+        return report
+
+    def get_state(self):
+        """État sérialisable en JSON (les listes de segments restent dans le rapport)"""
+        return {
+            'segmenter': self.segmenter.get_state(),
+            'total_samples': self.total_samples,
+            'skipped_frames': self.skipped_frames,
+            'pending': base64.b64encode(self.pending.tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def restore(cls, state, report=None, sample_rate=ANALYSIS_SAMPLE_RATE, sensitivity=2, energy_floor_dbfs=None):
+        """Reprend une analyse à partir d'un état get_state() et, si fourni, du rapport déjà produit"""
+        report = report or {}
+        segmenter = VadSegmenter(
+            sample_rate,
+            state=state.get('segmenter'),
+            voice_segments=list(report.get('voice_segments', [])),
+            silence_segments=list(report.get('silence_segments', [])),
+        )
+        analyzer = cls(sample_rate, sensitivity, energy_floor_dbfs=energy_floor_dbfs, segmenter=segmenter)
+        analyzer.total_samples = state.get('total_samples', 0)
+        analyzer.skipped_frames = state.get('skipped_frames', 0)
+        analyzer.pending = np.frombuffer(base64.b64decode(state.get('pending', '')), dtype=np.int16)
+        return analyzer
+
+
+def analyze_blocks(blocks, sample_rate=16000, sensitivity=2, frame_duration_ms=FRAME_DURATION_MS,
+                   energy_floor_dbfs=None):
+    """
+    Analyse un flux de blocs PCM int16 (tableaux numpy) avec webrtcvad
+    Voir StreamAnalyzer pour le pré-filtre d'énergie.
+    """
+    analyzer = StreamAnalyzer(sample_rate, sensitivity, frame_duration_ms, energy_floor_dbfs)
+    for block in blocks:
+        analyzer.feed(block)
+    return analyzer.finish()
+
+
+def slice_segments(segments, start, end):
+    """
+    Segments restreints à la fenêtre [start, end] et recalés sur start
+    (les segments à cheval sont tronqués aux bornes)
+    """
+    sliced = []
+    for segment in segments:
+        seg_start = max(segment['start'], start)
+        seg_end = min(segment['end'], end)
+        if seg_end <= seg_start:
+            continue
+        sliced.append({
+            'start': seg_start - start,
+            'end': seg_end - start,
+            'duration': seg_end - seg_start
+        })
+    return sliced
+
+
+def slice_report(report, start, end):
+    """
+    Rapport VAD d'un extrait [start, end] calculé à partir du rapport complet,
+    sans nouvelle analyse (trim). Les silences anormaux et les compteurs du
+    pré-filtre, propres à l'audio complet, ne sont pas repris.
+
+    Comme VadSegmenter, le silence qui précède la première parole de
+    l'extrait n'est pas un segment de silence : un extrait qui commence au
+    milieu d'un silence ne démarre donc pas par un silence en 0.
+    """
+    end = min(end, report['total_duration'])
+    voice_segments = slice_segments(report['voice_segments'], start, end)
+    silence_segments = [
+        segment for segment in slice_segments(report['silence_segments'], start, end)
+        if segment['start'] > 0
+    ]
+    total_silence_seconds = sum(segment['duration'] for segment in silence_segments)
+    total_duration = max(end - start, 0)
+    silence_percentage = (total_silence_seconds / total_duration * 100) if total_duration > 0 else 0
+
+    sliced = {
+        'voice_segments': voice_segments,
+        'silence_segments': silence_segments,
+        'total_silence_seconds': total_silence_seconds,
+        'total_duration': total_duration,
+        'silence_percentage': round(silence_percentage, 2),
+        'voice_segments_count': len(voice_segments),
+        'silence_segments_count': len(silence_segments),
+    }
+    if 'prefilter_floor_dbfs' in report:
+        sliced['prefilter_floor_dbfs'] = report['prefilter_floor_dbfs']
+    return sliced
+
+
+def report_from_decisions(decisions, total_samples, sample_rate=ANALYSIS_SAMPLE_RATE,
+                          frame_duration_ms=FRAME_DURATION_MS, energy_floor_dbfs=None, skipped_frames=0):
+    """
+    Reconstruit le rapport VAD à partir des décisions trame par trame
+    (cache, analyse parallèle) : identique au rapport d'une analyse en flux
+    qui aurait produit les mêmes décisions
+    """
+    frame_size = frame_size_for(sample_rate, frame_duration_ms)
+    segmenter = VadSegmenter(sample_rate)
+    segmenter.push_decisions(0, decisions, frame_size)
+    report = segmenter.finish(total_samples)
+    if energy_floor_dbfs is not None:
+        add_prefilter_counters(report, energy_floor_dbfs, len(decisions), skipped_frames)
+    return report
+
+
+# Fichier annexe des décisions VAD : en-tête fixe puis 1 bit par trame (np.packbits)
+DECISIONS_MAGIC = b'VADF'
+DECISIONS_HEADER = struct.Struct('<4sIHxxQ')  # magic, sample_rate, frame_duration_ms, frame_count
+DECISIONS_HEADER_SIZE = 32
+
+
+def decisions_sidecar_path(file_path):
+    """Chemin du fichier de décisions VAD associé à un fichier audio"""
+    return os.path.splitext(file_path)[0] + '.vad'
+
+
+def write_decisions(path, decisions, sample_rate=ANALYSIS_SAMPLE_RATE, frame_duration_ms=FRAME_DURATION_MS):
+    """
+    Écrit les décisions VAD (1 bit par trame, ~360 Ko pour 24 h) dans un
+    fichier annexe, remplacé atomiquement
+    """
+    decisions = np.asarray(decisions, dtype=bool)
+    header = DECISIONS_HEADER.pack(DECISIONS_MAGIC, sample_rate, frame_duration_ms, len(decisions))
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(DECISIONS_HEADER_SIZE, b'\0'))
+        f.write(np.packbits(decisions).tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_decisions_header(path):
+    """En-tête d'un fichier de décisions : dict (sample_rate, frame_duration_ms, frame_count)"""
+    with open(path, 'rb') as f:
+        magic, sample_rate, frame_duration_ms, frame_count = DECISIONS_HEADER.unpack(
+            f.read(DECISIONS_HEADER.size)
+        )
+    if magic != DECISIONS_MAGIC:
+        raise ValueError(f"Fichier de décisions VAD invalide: {path}")
+    return {'sample_rate': sample_rate, 'frame_duration_ms': frame_duration_ms, 'frame_count': frame_count}
+
+
+def read_decisions(path, start_frame=0, end_frame=None):
+    """
+    Décisions VAD des trames [start_frame, end_frame) d'un fichier annexe
+    
+    Le fichier est projeté en mémoire (np.memmap) : seuls les octets de la
+    plage demandée sont lus et dépaquetés.
+    Retourne (en-tête, tableau numpy de booléens).
+    """
+    header = read_decisions_header(path)
+    frame_count = header['frame_count']
+    end_frame = frame_count if end_frame is None else min(end_frame, frame_count)
+    start_frame = max(0, min(start_frame, end_frame))
+    if frame_count == 0 or start_frame == end_frame:
+        return header, np.zeros(0, dtype=bool)
+    
+    packed = np.memmap(path, dtype=np.uint8, mode='r', offset=DECISIONS_HEADER_SIZE)
+    first_byte = start_frame // 8
+    last_byte = (end_frame + 7) // 8
+    bits = np.unpackbits(packed[first_byte:last_byte])
+    offset = start_frame - first_byte * 8
+    return header, bits[offset:offset + end_frame - start_frame].astype(bool)
+
+
+def quiet_frames_mask(samples, frame_size, energy_floor_dbfs):
+    """
+    Trames dont l'énergie RMS est sous le plancher de bruit (dBFS)
+    Ces trames (silence numérique, souffle très faible) sont du silence certain.
+    """
+    n_frames = len(samples) // frame_size
+    frames = samples[:n_frames * frame_size].reshape(n_frames, frame_size).astype(np.float32)
+    mean_square = np.einsum('ij,ij->i', frames, frames) / frame_size
+    floor = 32768.0 * 10 ** (energy_floor_dbfs / 20)
+    return mean_square < floor * floor
+
+
+def add_prefilter_counters(report, energy_floor_dbfs, total_frames, skipped_frames):
+    """Ajoute au rapport VAD les compteurs du pré-filtre d'énergie"""
+    report['prefilter_floor_dbfs'] = energy_floor_dbfs
+    report['prefilter_skipped_frames'] = skipped_frames
+    report['vad_frames'] = total_frames - skipped_frames
+
+
+def classify_frames(vad, samples, sample_rate, frame_size, quiet=None):
+    """
+    Décision webrtcvad (voix / non-voix) pour chaque trame complète de samples
+
+    Les trames sont des lignes d'une vue (n_frames, octets par trame) sans
+    copie sur le tampon int16 : seul l'appel à is_speech reste en Python.
+    Les trames marquées dans quiet (pré-filtre d'énergie) ne sont pas
+    envoyées à webrtcvad. Retourne un tableau numpy de booléens.
+    """
+    n_frames = len(samples) // frame_size
+    # Largeur explicite (2 octets par échantillon) : reshape(0, -1) échoue
+    # pour un bloc plus court qu'une trame
+    frames = np.ascontiguousarray(
+        samples[:n_frames * frame_size], dtype=np.int16
+    ).view(np.uint8).reshape(n_frames, 2 * frame_size)
+    if quiet is None:
+        return np.fromiter(
+            (vad.is_speech(frame, sample_rate) for frame in frames),
+            dtype=bool,
+            count=n_frames,
+        )
+
+    decisions = np.zeros(n_frames, dtype=bool)
+    ambiguous = np.flatnonzero(~quiet)
+    decisions[ambiguous] = np.fromiter(
+        (vad.is_speech(frames[k], sample_rate) for k in ambiguous),
+        dtype=bool,
+        count=len(ambiguous),
+    )
+    return decisions
+
+
+def _analyze_shard(pcm_path, sample_rate, sensitivity, energy_floor_dbfs, frame_size,
+                   warmup_frame, start_frame, end_frame):
+    """
+    Analyse les trames [start_frame, end_frame) d'un fichier PCM brut (processus du pool)
+    Les trames [warmup_frame, start_frame) servent seulement à amorcer l'état de webrtcvad
+    Retourne (décisions, nombre de trames écartées par le pré-filtre)
+    """
+    pcm = np.memmap(pcm_path, dtype=np.int16, mode='r')
+    vad = webrtcvad.Vad(sensitivity)
+    samples = pcm[warmup_frame * frame_size:end_frame * frame_size]
+    warmup = start_frame - warmup_frame
+
+    quiet = None
+    skipped_frames = 0
+    if energy_floor_dbfs is not None:
+        quiet = quiet_frames_mask(samples, frame_size, energy_floor_dbfs)
+        skipped_frames = int(quiet[warmup:].sum())
+    return classify_frames(vad, samples, sample_rate, frame_size, quiet)[warmup:], skipped_frames
+
+
+def classify_pcm_file_parallel(pcm_path, sample_rate=ANALYSIS_SAMPLE_RATE, sensitivity=2, workers=None,
+                               shard_seconds=SHARD_SECONDS, overlap_seconds=OVERLAP_SECONDS,
+                               energy_floor_dbfs=None):
+    """
+    Décisions VAD d'un fichier PCM brut s16le, calculées en parallèle sur plusieurs cœurs
+
+    Le fichier est découpé en shards de shard_seconds, analysés par un
+    ProcessPoolExecutor qui lit le fichier via np.memmap. Chaque shard est
+    précédé de overlap_seconds d'audio (décisions ignorées) pour amorcer
+    l'état adaptatif de webrtcvad. Les décisions sont concaténées dans
+    l'ordre des shards.
+
+    Le résultat est approché : webrtcvad adapte son modèle de bruit sur tout
+    l'historique, et une instance amorcée sur overlap_seconds ne retrouve
+    jamais exactement l'état de l'analyse séquentielle. Le premier shard est
+    identique ; dans les suivants, quelques trames isolées diffèrent, à 2 ou
+    3 trames au plus d'une transition voix/silence (mesuré sur des fixtures
+    de 300 à 1300 s). Sans amorçage (overlap_seconds=0), les écarts
+    dépassent la minute.
+
+    Retourne (décisions, nombre de trames écartées par le pré-filtre)
+    """
+    frame_size = frame_size_for(sample_rate)
+    n_frames = os.path.getsize(pcm_path) // 2 // frame_size
+    shard_frames = max(1, int(shard_seconds * 1000 / FRAME_DURATION_MS))
+    overlap_frames = int(overlap_seconds * 1000 / FRAME_DURATION_MS)
+
+    shards = []
+    for start in range(0, n_frames, shard_frames):
+        end = min(start + shard_frames, n_frames)
+        shards.append((max(0, start - overlap_frames), start, end))
+
+    decision_blocks = []
+    skipped_frames = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [
+            pool.submit(_analyze_shard, pcm_path, sample_rate, sensitivity, energy_floor_dbfs, frame_size, *shard)
+            for shard in shards
+        ]
+        for future in futures:
+            decisions, skipped = future.result()
+            decision_blocks.append(decisions)
+            skipped_frames += skipped
+
+    decisions = np.concatenate(decision_blocks) if decision_blocks else np.zeros(0, dtype=bool)
+    return decisions, skipped_frames
+
+
+def analyze_pcm_file_parallel(pcm_path, sample_rate=ANALYSIS_SAMPLE_RATE, sensitivity=2, workers=None,
+                              shard_seconds=SHARD_SECONDS, overlap_seconds=OVERLAP_SECONDS,
+                              energy_floor_dbfs=None):
+    """
+    Analyse un fichier PCM brut s16le en parallèle sur plusieurs cœurs
+
+    Les décisions des shards (classify_pcm_file_parallel) sont segmentées en
+    une seule passe : les segments à cheval sur deux shards sont donc
+    recollés naturellement. Les bornes des segments peuvent différer de
+    quelques trames de l'analyse séquentielle (analyze_blocks).
+    """
+    decisions, skipped_frames = classify_pcm_file_parallel(
+        pcm_path, sample_rate, sensitivity, workers, shard_seconds, overlap_seconds, energy_floor_dbfs
+    )
+    total_samples = os.path.getsize(pcm_path) // 2
+    return report_from_decisions(
+        decisions, total_samples, sample_rate,
+        energy_floor_dbfs=energy_floor_dbfs, skipped_frames=skipped_frames
+    )
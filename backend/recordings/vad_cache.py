@@ -0,0 +1,67 @@
+"""
+Cache des décisions VAD (modèle VadCache)
+Évite de décoder et d'analyser à nouveau un audio déjà vu avec les mêmes
+paramètres : réanalyse avec un autre seuil de silence, fichiers ré-uploadés
+(jingles, émissions rediffusées).
+"""
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .models import VadCache
+import hashlib
+import numpy as np
+
+
+def cache_key(pcm_sha256, sample_rate, sensitivity, frame_duration_ms, energy_floor_dbfs=None, shards=None):
+    """
+    Clé unique de (PCM, paramètres VAD)
+    shards: (shard_seconds, overlap_seconds) pour les décisions d'une analyse
+    parallèle, qui diffèrent légèrement de l'analyse séquentielle (None)
+    """
+    raw = f"{pcm_sha256}:{sample_rate}:{sensitivity}:{frame_duration_ms}:{energy_floor_dbfs}"
+    if shards:
+        raw += ":shards={}:{}".format(*shards)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def lookup(pcm_sha256, sample_rate, sensitivity, frame_duration_ms, energy_floor_dbfs=None, shards=None):
+    """Retourne l'entrée VadCache correspondante (ou None) et met à jour sa date d'utilisation"""
+    key = cache_key(pcm_sha256, sample_rate, sensitivity, frame_duration_ms, energy_floor_dbfs, shards)
+    entry = VadCache.objects.filter(key=key).first()
+    if entry:
+        VadCache.objects.filter(id=entry.id).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    return entry
+
+
+def store(pcm_sha256, sample_rate, sensitivity, frame_duration_ms, energy_floor_dbfs,
+          decisions, total_samples, skipped_frames=0, shards=None):
+    """Enregistre les décisions VAD d'un audio puis applique l'éviction"""
+    key = cache_key(pcm_sha256, sample_rate, sensitivity, frame_duration_ms, energy_floor_dbfs, shards)
+    decisions = np.asarray(decisions, dtype=bool)
+    VadCache.objects.update_or_create(
+        key=key,
+        defaults={
+            'pcm_sha256': pcm_sha256,
+            'sample_rate': sample_rate,
+            'sensitivity': sensitivity,
+            'frame_duration_ms': frame_duration_ms,
+            'energy_floor_dbfs': energy_floor_dbfs,
+            'decisions': np.packbits(decisions).tobytes(),
+            'frame_count': len(decisions),
+            'total_samples': total_samples,
+            'skipped_frames': skipped_frames,
+            'last_used_at': timezone.now(),
+        }
+    )
+    evict()
+
+
+def evict(max_entries=None):
+    """Supprime les entrées les moins récemment utilisées au-delà de VAD_CACHE_MAX_ENTRIES"""
+    max_entries = settings.VAD_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    excess = VadCache.objects.count() - max_entries
+    if excess <= 0:
+        return 0
+    stale_ids = list(VadCache.objects.order_by('last_used_at').values_list('id', flat=True)[:excess])
+    deleted, _ = VadCache.objects.filter(id__in=stale_ids).delete()
+    return deleted
@@ -1,21 +1,47 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.http import FileResponse, Http404
+from django.conf import settings
+from django.db import transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from django.utils import timezone
-from datetime import timedelta
-from .models import Recording, UserSettings
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
+from .models import Recording, UserSettings, UploadSession
 from .serializers import (
     RecordingSerializer, 
+    RecordingListSerializer,
     RecordingCreateSerializer, 
     RecordingTrimSerializer,
+    RecordingLiveSerializer,
     UserSignupSerializer,
-    UserSettingsSerializer
+    UserSettingsSerializer,
+    ProcessingJobSerializer,
+    UploadSessionCreateSerializer,
+    UploadSessionSerializer
 )
-from .tasks import process_recording, trim_recording_task
+from .jobs import enqueue_job, queue_is_full, QueueFull
+from .tasks import RecordingNotLive, append_recording_chunk, reevaluate_silences
+from .media import file_etag, serve_file
+from .metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+from .pagination import RecordingCursorPagination
+from .stats import BUCKETS, bucketed_stats, user_summary
+from . import peaks, uploads, vad
+from .probe import ProbeError, apply_probe, probe_audio
+from django.core.files.base import ContentFile
+import base64
+import hmac
 import os
+import tempfile
+import uuid
+import numpy as np
 
 
 class SignupViewSet(viewsets.ViewSet):
@@ -50,7 +76,102 @@ class SignupViewSet(viewsets.ViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class RecordingViewSet(viewsets.ModelViewSet):
+def parse_datetime_param(value):
+    """
+    Date (AAAA-MM-JJ, minuit local) ou date-heure ISO 8601 d'un paramètre de requête
+    Retourne None si la valeur est invalide
+    """
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            parsed = datetime.combine(day, time.min)
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def queue_full_response():
+    """Réponse 503 quand la file de traitement est saturée (backpressure)"""
+    response = Response(
+        {'error': 'File de traitement saturée, réessayez plus tard'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    response['Retry-After'] = str(settings.PROCESSING_RETRY_BACKOFF_SECONDS)
+    return response
+
+
+def live_conflict_response():
+    """Réponse 409 pour les actions impossibles pendant une capture en direct"""
+    return Response(
+        {'error': 'Capture en cours: clôturez-la avant de la traiter ou de la découper'},
+        status=status.HTTP_409_CONFLICT
+    )
+
+
+def split_conflict_response():
+    """Réponse 409 pour les actions sur un enregistrement découpé en parties"""
+    return Response(
+        {'error': 'Enregistrement découpé: agissez sur ses parties (/parts/)'},
+        status=status.HTTP_409_CONFLICT
+    )
+
+
+class RecordingCreationMixin:
+    """
+    Réglages utilisateur appliqués à la création d'un enregistrement
+    (upload direct, capture en direct, upload reprenable)
+    """
+    
+    def get_user_defaults(self):
+        """Retourne (retained_until, naming_template) selon les settings utilisateur"""
+        retained_until = None
+        naming_template = None
+        try:
+            user_settings = self.request.user.user_settings
+            # Appliquer la durée de rétention
+            if user_settings.retention_days:
+                retained_until = timezone.now() + timedelta(days=user_settings.retention_days)
+            naming_template = user_settings.naming_template
+        except UserSettings.DoesNotExist:
+            pass
+        return retained_until, naming_template
+    
+    def auto_split_enabled(self):
+        """Vérifie si le découpage automatique est activé pour l'utilisateur"""
+        try:
+            return self.request.user.user_settings.auto_split_enabled
+        except UserSettings.DoesNotExist:
+            return False
+    
+    def apply_naming_template(self, recording, naming_template):
+        """Génère le nom de fichier selon le template"""
+        if not recording.custom_name and naming_template:
+            try:
+                filename = recording.generate_filename(naming_template)
+                recording.custom_name = filename
+                recording.save(update_fields=['custom_name'])
+            except Exception as e:
+                # Si erreur, on continue sans nom personnalisé
+                print(f"Erreur lors de la génération du nom: {e}")
+    
+    def enqueue_new_recording(self, recording, payload=None):
+        """
+        Met le traitement d'un nouvel enregistrement en file d'attente
+        (exécuté par manage.py run_workers). L'upload a déjà été accepté: on
+        ne le refuse plus à ce stade. Avec le découpage automatique, le job
+        'split' crée les parties puis enfile leur traitement (ou traite
+        directement un enregistrement court)
+        """
+        kind = 'split' if self.auto_split_enabled() else 'process'
+        return enqueue_job(recording, kind, payload=payload, force=True)
+
+
+class RecordingViewSet(RecordingCreationMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les enregistrements audio
     """
@@ -58,48 +179,170 @@ class RecordingViewSet(viewsets.ModelViewSet):
     serializer_class = RecordingSerializer
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecordingCursorPagination
     
     def get_queryset(self):
         """Retourne uniquement les enregistrements de l'utilisateur connecté"""
-        return Recording.objects.filter(user=self.request.user)
+        queryset = Recording.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            # Les rapports VAD complets ne sont pas lus pour la liste
+            queryset = self.filter_list(
+                queryset.select_related('user').defer('vad_report', 'vad_state')
+            )
+        return queryset
+    
+    def filter_list(self, queryset):
+        """
+        Filtres de la liste, appliqués en base :
+        ?type=antenne,emission&flagged=true&created_after=2026-01-01&created_before=2026-02-01
+        &min_duration=60&max_duration=3600
+        Les parties d'enregistrements découpés n'apparaissent qu'avec ?parts=true
+        """
+        params = self.request.query_params
+        errors = {}
+        
+        if params.get('parts', '').lower() not in ('true', '1'):
+            queryset = queryset.filter(parent__isnull=True)
+        
+        if params.get('type'):
+            types = [t for t in params['type'].split(',') if t]
+            valid_types = {choice for choice, _ in Recording.TYPE_CHOICES}
+            if not set(types) <= valid_types:
+                errors['type'] = f"Types acceptés: {', '.join(sorted(valid_types))}"
+            else:
+                queryset = queryset.filter(type__in=types)
+        
+        if params.get('flagged'):
+            flagged = params['flagged'].lower()
+            if flagged not in ('true', 'false', '1', '0'):
+                errors['flagged'] = "Valeurs acceptées: true, false"
+            else:
+                queryset = queryset.filter(flagged=flagged in ('true', '1'))
+        
+        for param, lookup in (('created_after', 'created_at__gte'), ('created_before', 'created_at__lt')):
+            if params.get(param):
+                value = parse_datetime_param(params[param])
+                if value is None:
+                    errors[param] = "Date invalide (AAAA-MM-JJ ou ISO 8601)"
+                else:
+                    queryset = queryset.filter(**{lookup: value})
+        
+        for param, lookup in (('min_duration', 'duration_seconds__gte'), ('max_duration', 'duration_seconds__lte')):
+            if params.get(param):
+                try:
+                    queryset = queryset.filter(**{lookup: float(params[param])})
+                except ValueError:
+                    errors[param] = "Durée invalide (secondes)"
+        
+        if errors:
+            raise ValidationError(errors)
+        return queryset
     
     def get_serializer_class(self):
-        """Utilise un serializer différent pour la création"""
+        """Utilise un serializer différent pour la création et pour la liste"""
         if self.action == 'create':
             return RecordingCreateSerializer
+        if self.action == 'list':
+            return RecordingListSerializer
         return RecordingSerializer
     
+    def create(self, request, *args, **kwargs):
+        """Refuse l'upload si la file de traitement est pleine"""
+        if queue_is_full():
+            return queue_full_response()
+        return super().create(request, *args, **kwargs)
+    
     def perform_create(self, serializer):
         """Crée l'enregistrement et lance le traitement"""
         # Récupérer les settings utilisateur pour le nommage et la rétention
-        retained_until = None
-        naming_template = None
-        try:
-            user_settings = self.request.user.user_settings
-            # Appliquer la durée de rétention
-            if user_settings.retention_days:
-                retained_until = timezone.now() + timedelta(days=user_settings.retention_days)
-            naming_template = user_settings.naming_template
-        except UserSettings.DoesNotExist:
-            pass
+        retained_until, naming_template = self.get_user_defaults()
         
         # Sauvegarder avec la rétention si définie
         recording = serializer.save(user=self.request.user, retained_until=retained_until)
         
         # Générer le nom de fichier selon le template
-        if not recording.custom_name and naming_template:
-            try:
-                filename = recording.generate_filename(naming_template)
-                recording.custom_name = filename
-                recording.save(update_fields=['custom_name'])
-            except Exception as e:
-                # Si erreur, on continue sans nom personnalisé
-                print(f"Erreur lors de la génération du nom: {e}")
+        self.apply_naming_template(recording, naming_template)
         
-        # Lancer le traitement (synchronisé, sans Celery)
-        # Note: Le traitement peut prendre du temps, idéalement utiliser un thread en production
-        import threading
-        threading.Thread(target=process_recording, args=(recording.id,), daemon=True).start()
+        # Mettre le traitement en file d'attente
+        self.enqueue_new_recording(recording)
+    
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, MultiPartParser, FormParser])
+    def live(self, request):
+        """
+        Ouvre une capture en direct, alimentée ensuite par morceaux
+        POST /api/recordings/live/
+        Body: { "title": "Antenne", "type": "antenne" }
+        """
+        serializer = RecordingLiveSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        retained_until, naming_template = self.get_user_defaults()
+        recording = Recording(
+            user=request.user,
+            retained_until=retained_until,
+            format='wav',
+            codec='pcm_s16le',
+            sample_rate=vad.ANALYSIS_SAMPLE_RATE,
+            channels=1,
+            bit_rate=vad.ANALYSIS_SAMPLE_RATE * 16,
+            is_live=True,
+            **serializer.validated_data
+        )
+        # WAV 16 kHz mono vide, complété à chaque morceau
+        filename = f"live-{timezone.now().strftime('%Y%m%d-%H%M%S')}.wav"
+        recording.file.save(filename, ContentFile(vad.empty_wav_bytes()), save=True)
+        self.apply_naming_template(recording, naming_template)
+        
+        return Response(
+            RecordingSerializer(recording, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED
+        )
+    
+    @action(detail=True, methods=['post'])
+    def chunks(self, request, pk=None):
+        """
+        Ajoute un morceau audio à une capture en direct (seul ce morceau est analysé)
+        POST /api/recordings/{id}/chunks/
+        Body (multipart): chunk=<fichier audio autonome>, final=true pour clôturer
+        """
+        recording = self.get_object()
+        if not recording.is_live:
+            return Response(
+                {'error': "L'enregistrement n'est pas une capture en cours"},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        chunk = request.FILES.get('chunk')
+        final = str(request.data.get('final', '')).lower() in ('1', 'true', 'yes')
+        if chunk is None and not final:
+            return Response({'error': 'Morceau audio manquant (chunk)'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            if chunk is None:
+                recording = append_recording_chunk(recording.id, None, final=True)
+            else:
+                suffix = os.path.splitext(chunk.name)[1]
+                with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+                    for data in chunk.chunks():
+                        tmp.write(data)
+                    tmp.flush()
+                    recording = append_recording_chunk(recording.id, tmp.name, final=final)
+        except RecordingNotLive:
+            return Response(
+                {'error': "L'enregistrement n'est pas une capture en cours"},
+                status=status.HTTP_409_CONFLICT
+            )
+        except RuntimeError as e:
+            return Response({'error': f'Morceau illisible: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'recording_id': recording.id,
+            'is_live': recording.is_live,
+            'duration_seconds': recording.duration_seconds,
+            'flagged': recording.flagged,
+            'unnatural_silences': recording.vad_report.get('unnatural_silences', []),
+        })
     
     @action(detail=True, methods=['post'])
     def trim(self, request, pk=None):
@@ -109,6 +352,10 @@ class RecordingViewSet(viewsets.ModelViewSet):
         Body: { "start_time": 10.5, "end_time": 120.3 }
         """
         recording = self.get_object()
+        if recording.is_live:
+            return live_conflict_response()
+        if recording.is_split:
+            return split_conflict_response()
         serializer = RecordingTrimSerializer(data=request.data)
         
         if serializer.is_valid():
@@ -122,14 +369,19 @@ class RecordingViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Lancer le trim (synchronisé, sans Celery)
-            # Note: Le trim peut prendre du temps, idéalement utiliser un thread en production
-            import threading
-            threading.Thread(target=trim_recording_task, args=(recording.id, start_time, end_time), daemon=True).start()
+            # Mettre le trim en file d'attente
+            try:
+                # trim_id rend le job rejouable (voir trim_recording_task)
+                job = enqueue_job(recording, 'trim', {
+                    'start_time': start_time, 'end_time': end_time, 'trim_id': uuid.uuid4().hex
+                })
+            except QueueFull:
+                return queue_full_response()
             
             return Response({
                 'message': 'Trim en cours de traitement',
                 'recording_id': recording.id,
+                'job_id': job.id,
                 'start_time': start_time,
                 'end_time': end_time
             })
@@ -143,33 +395,240 @@ class RecordingViewSet(viewsets.ModelViewSet):
         POST /api/recordings/{id}/process/
         """
         recording = self.get_object()
-        # Lancer le traitement (synchronisé, sans Celery)
-        import threading
-        threading.Thread(target=process_recording, args=(recording.id,), daemon=True).start()
+        if recording.is_live:
+            return live_conflict_response()
+        if recording.is_split:
+            # Relance l'analyse de chaque partie
+            if queue_is_full():
+                return queue_full_response()
+            jobs = [enqueue_job(part, 'process', force=True) for part in recording.parts.all()]
+            return Response({
+                'message': 'Traitement relancé pour chaque partie',
+                'recording_id': recording.id,
+                'job_ids': [job.id for job in jobs]
+            })
+        try:
+            job = enqueue_job(recording, 'process')
+        except QueueFull:
+            return queue_full_response()
         
         return Response({
             'message': 'Traitement relancé',
-            'recording_id': recording.id
+            'recording_id': recording.id,
+            'job_id': job.id
+        })
+    
+    @action(detail=True, methods=['get'])
+    def parts(self, request, pk=None):
+        """
+        Parties d'un enregistrement découpé automatiquement, dans l'ordre
+        GET /api/recordings/{id}/parts/
+        """
+        recording = self.get_object()
+        parts = recording.parts.select_related('user').defer('vad_report', 'vad_state').order_by('part_index')
+        serializer = RecordingListSerializer(parts, many=True, context={'request': request})
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'], url_path='vad', url_name='vad')
+    def vad_report(self, request, pk=None):
+        """
+        Rapport VAD complet d'un enregistrement (segments de voix et de silence)
+        GET /api/recordings/{id}/vad/
+        """
+        recording = self.get_object()
+        return Response({
+            'recording_id': recording.id,
+            'silence_percentage': recording.silence_percentage,
+            'total_silence_seconds': recording.total_silence_seconds,
+            'unnatural_silence_count': recording.unnatural_silence_count,
+            'vad_report': recording.get_full_vad_report(),
+        })
+    
+    @action(detail=True, methods=['get'], url_path='vad/frames')
+    def vad_frames(self, request, pk=None):
+        """
+        Décisions VAD brutes (1 = voix) d'une fenêtre, lues dans le fichier annexe .vad
+        GET /api/recordings/{id}/vad/frames/?start=60&end=120&encoding=packbits|list|segments
+        
+        - packbits (défaut): bits compactés (np.packbits) encodés en base64
+        - list: une valeur 0/1 par trame
+        - segments: segments de voix / silence recalculés sur la fenêtre
+        """
+        recording = self.get_object()
+        decisions_path = vad.decisions_sidecar_path(recording.file.path) if recording.file else None
+        if not decisions_path or not os.path.exists(decisions_path):
+            return Response(
+                {'error': 'Décisions VAD non disponibles: relancez le traitement'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        try:
+            start = float(request.query_params.get('start', 0))
+            end = request.query_params.get('end')
+            end = float(end) if end is not None else None
+        except ValueError:
+            return Response({'error': 'start et end doivent être des nombres (secondes)'}, status=status.HTTP_400_BAD_REQUEST)
+        encoding = request.query_params.get('encoding', 'packbits')
+        if encoding not in ('packbits', 'list', 'segments'):
+            return Response({'error': 'encoding: packbits, list ou segments'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        header = vad.read_decisions_header(decisions_path)
+        frame_seconds = header['frame_duration_ms'] / 1000
+        start_frame = max(0, int(start / frame_seconds))
+        end_frame = int(end / frame_seconds) if end is not None else None
+        header, decisions = vad.read_decisions(decisions_path, start_frame, end_frame)
+        start_frame = min(start_frame, header['frame_count'])
+        
+        data = {
+            'recording_id': recording.id,
+            'sample_rate': header['sample_rate'],
+            'frame_duration_ms': header['frame_duration_ms'],
+            'total_frames': header['frame_count'],
+            'start_frame': start_frame,
+            'frame_count': len(decisions),
+            'start': start_frame * frame_seconds,
+            'encoding': encoding,
+        }
+        if encoding == 'packbits':
+            data['decisions'] = base64.b64encode(np.packbits(decisions).tobytes()).decode('ascii')
+        elif encoding == 'list':
+            data['decisions'] = decisions.astype(np.uint8).tolist()
+        else:
+            frame_size = vad.frame_size_for(header['sample_rate'], header['frame_duration_ms'])
+            report = vad.report_from_decisions(
+                decisions, len(decisions) * frame_size, header['sample_rate'], header['frame_duration_ms']
+            )
+            data['voice_segments'] = report['voice_segments']
+            data['silence_segments'] = report['silence_segments']
+        return Response(data)
+    
+    @action(detail=True, methods=['get'], url_path='peaks', url_name='peaks')
+    def waveform_peaks(self, request, pk=None):
+        """
+        Pics min/max de la forme d'onde, lus dans le fichier annexe .peaks
+        GET /api/recordings/{id}/peaks/?zoom=1|10|100&start=0&end=60&encoding=json|binary
+        
+        - zoom: pics par seconde (défaut 10)
+        - json (défaut): liste [min, max, min, max, ...] (int8, -128..127)
+        - binary: mêmes valeurs en octets bruts (application/octet-stream)
+        Réponses revalidables (ETag / Last-Modified, 304 Not Modified)
+        """
+        recording = self.get_object()
+        peaks_path = peaks.peaks_sidecar_path(recording.file.path) if recording.file else None
+        try:
+            stat = os.stat(peaks_path) if peaks_path else None
+        except FileNotFoundError:
+            stat = None
+        if stat is None:
+            return Response(
+                {'error': "Forme d'onde non disponible: relancez le traitement"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        try:
+            zoom = int(request.query_params.get('zoom', 10))
+            start = float(request.query_params.get('start', 0))
+            end = request.query_params.get('end')
+            end = float(end) if end is not None else None
+        except ValueError:
+            return Response({'error': 'zoom, start et end doivent être des nombres'}, status=status.HTTP_400_BAD_REQUEST)
+        if zoom not in peaks.PEAK_RESOLUTIONS:
+            return Response(
+                {'error': f"zoom: {', '.join(str(r) for r in sorted(peaks.PEAK_RESOLUTIONS))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        encoding = request.query_params.get('encoding', 'json')
+        if encoding not in ('json', 'binary'):
+            return Response({'error': 'encoding: json ou binary'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # ETag propre à la représentation: fichier de pics + paramètres
+        etag = file_etag(stat)[:-1] + f'-{zoom}-{start:g}-{end}-{encoding}"'
+        last_modified = int(stat.st_mtime)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        
+        if response is None:
+            first, pairs = peaks.read_peaks(peaks_path, zoom, start, end)
+            if encoding == 'binary':
+                response = HttpResponse(pairs.tobytes(), content_type='application/octet-stream')
+                response['X-Peaks-Start'] = str(first)
+                response['X-Peaks-Per-Second'] = str(zoom)
+            else:
+                response = Response({
+                    'recording_id': recording.id,
+                    'zoom': zoom,
+                    'start_index': first,
+                    'start': first / zoom,
+                    'count': len(pairs),
+                    'peaks': pairs.ravel().tolist(),
+                })
+        
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, max_age=settings.PEAKS_CACHE_MAX_AGE)
+        return response
+    
+    @action(detail=True, methods=['get'], url_path='status')
+    def job_status(self, request, pk=None):
+        """
+        Retourne l'état des derniers jobs de traitement de l'enregistrement
+        GET /api/recordings/{id}/status/
+        """
+        recording = self.get_object()
+        jobs = recording.jobs.order_by('-created_at')[:10]
+        latest = jobs[0] if jobs else None
+        return Response({
+            'recording_id': recording.id,
+            'status': latest.status if latest else None,
+            'jobs': ProcessingJobSerializer(jobs, many=True).data,
         })
     
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, FormParser])
+    def reevaluate(self, request):
+        """
+        Recalcule les silences anormaux de tous les enregistrements à partir
+        des segments déjà détectés (sans décoder l'audio)
+        POST /api/recordings/reevaluate/
+        Body (optionnel): { "silence_threshold_seconds": 3.0 }
+        """
+        threshold = request.data.get('silence_threshold_seconds')
+        if threshold is not None:
+            try:
+                threshold = float(threshold)
+            except (TypeError, ValueError):
+                return Response(
+                    {'error': 'silence_threshold_seconds doit être un nombre'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        result = reevaluate_silences(request.user.id, threshold)
+        return Response(result)
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """
         Retourne les statistiques des enregistrements de l'utilisateur
         GET /api/recordings/stats/
+        GET /api/recordings/stats/?bucket=day|week&start=2026-01-01&end=2026-01-31
+        
+        Lues dans la table RecordingDailyStats (une ligne par jour et par type) :
+        le coût ne dépend pas du nombre d'enregistrements.
         """
-        queryset = self.get_queryset()
-        
-        stats = {
-            'total': queryset.count(),
-            'flagged': queryset.filter(flagged=True).count(),
-            'by_type': {
-                'antenne': queryset.filter(type='antenne').count(),
-                'emission': queryset.filter(type='emission').count(),
-                'reunion': queryset.filter(type='reunion').count(),
-            },
-            'total_duration_seconds': sum(r.duration_seconds for r in queryset),
-        }
+        stats = user_summary(request.user)
+        
+        bucket = request.query_params.get('bucket')
+        if bucket:
+            if bucket not in BUCKETS:
+                return Response(
+                    {'error': f"bucket doit valoir {' ou '.join(BUCKETS)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                start = parse_date(request.query_params.get('start') or '')
+                end = parse_date(request.query_params.get('end') or '')
+            except ValueError:
+                return Response({'error': 'Date invalide (format AAAA-MM-JJ)'}, status=status.HTTP_400_BAD_REQUEST)
+            stats['bucket'] = bucket
+            stats['series'] = bucketed_stats(request.user, bucket, start, end)
         
         return Response(stats)
     
@@ -180,13 +639,177 @@ class RecordingViewSet(viewsets.ModelViewSet):
         GET /api/recordings/{id}/download/
         """
         recording = self.get_object()
-        file_path = recording.file.path
+        # Range / ETag / Last-Modified, ou envoi délégué au reverse proxy (MEDIA_OFFLOAD)
+        return serve_file(request, recording.file.path, as_attachment=True)
+
+
+def tus_response(data=None, status_code=status.HTTP_204_NO_CONTENT, session=None):
+    """Réponse du protocole d'upload (en-têtes Tus-Resumable / Upload-Offset)"""
+    response = Response(data, status=status_code)
+    response['Tus-Resumable'] = uploads.TUS_VERSION
+    response['Cache-Control'] = 'no-store'
+    if session is not None:
+        response['Upload-Offset'] = str(session.offset)
+        response['Upload-Length'] = str(session.upload_length)
+    return response
+
+
+class UploadViewSet(RecordingCreationMixin, viewsets.ViewSet):
+    """
+    Uploads reprenables par morceaux (voir recordings/uploads.py)
+    Le corps des PATCH est lu en flux, sans passer par les parsers DRF
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, FormParser]
+    
+    def get_session(self, pk):
+        """Session d'upload de l'utilisateur connecté"""
+        try:
+            return UploadSession.objects.get(id=pk, user=self.request.user)
+        except (UploadSession.DoesNotExist, ValueError, DjangoValidationError):
+            raise Http404("Upload introuvable")
+    
+    def create(self, request):
+        """
+        Ouvre un upload et réserve le fichier à son emplacement final
+        POST /api/uploads/
+        Body: { "filename": "antenne.wav", "upload_length": 123456789, "title": "...", "type": "antenne" }
+        (upload_length peut être remplacé par l'en-tête Upload-Length)
+        """
+        if queue_is_full():
+            return queue_full_response()
+        
+        data = request.data.copy()
+        if 'upload_length' not in data and request.headers.get('Upload-Length'):
+            data['upload_length'] = request.headers['Upload-Length']
+        serializer = UploadSessionCreateSerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        metadata = dict(serializer.validated_data)
+        filename = metadata.pop('filename')
+        upload_length = metadata.pop('upload_length')
+        if metadata.get('retained_until'):
+            metadata['retained_until'] = metadata['retained_until'].isoformat()
+        if 'format' not in metadata:
+            ext = filename.rsplit('.', 1)[-1].lower()
+            if ext in {choice for choice, _ in Recording.FORMAT_CHOICES}:
+                metadata['format'] = ext
+        
+        session = uploads.create_session(request.user, filename, upload_length, metadata)
+        response = tus_response(UploadSessionSerializer(session).data, status.HTTP_201_CREATED, session)
+        response['Location'] = request.build_absolute_uri(reverse('upload-detail', args=[session.id]))
+        response['Tus-Max-Size'] = str(settings.UPLOAD_MAX_SIZE)
+        return response
+    
+    def retrieve(self, request, pk=None):
+        """
+        État d'un upload (HEAD: en-têtes seuls, pour reprendre à Upload-Offset)
+        GET|HEAD /api/uploads/{id}/
+        """
+        session = self.get_session(pk)
+        return tus_response(UploadSessionSerializer(session).data, status.HTTP_200_OK, session)
+    
+    def partial_update(self, request, pk=None):
+        """
+        Ajoute un morceau au fichier
+        PATCH /api/uploads/{id}/
+        En-têtes: Content-Type: application/offset+octet-stream, Upload-Offset: <octets déjà reçus>,
+        Upload-Checksum: sha256 <base64> (optionnel)
+        """
+        session = self.get_session(pk)
+        if request.content_type.split(';')[0].strip() != uploads.OFFSET_CONTENT_TYPE:
+            return Response(
+                {'error': f'Content-Type attendu: {uploads.OFFSET_CONTENT_TYPE}'},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            content_length = request.headers.get('Content-Length')
+            content_length = int(content_length) if content_length else None
+        except (KeyError, ValueError):
+            return Response({'error': 'En-tête Upload-Offset manquant ou invalide'}, status=status.HTTP_400_BAD_REQUEST)
         
-        if os.path.exists(file_path):
-            response = FileResponse(open(file_path, 'rb'))
-            response['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
-            return response
-        raise Http404("Fichier non trouvé")
+        try:
+            uploads.write_chunk(
+                session, request._request, offset, content_length,
+                checksum=request.headers.get('Upload-Checksum')
+            )
+        except uploads.UploadError as e:
+            return tus_response({'error': str(e)}, e.status, session)
+        return tus_response(session=session)
+    
+    def destroy(self, request, pk=None):
+        """
+        Abandonne un upload et supprime le fichier partiel
+        DELETE /api/uploads/{id}/
+        """
+        session = self.get_session(pk)
+        if session.status == 'complete':
+            return Response({'error': 'Upload déjà finalisé'}, status=status.HTTP_409_CONFLICT)
+        uploads.abort_session(session)
+        return tus_response()
+    
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """
+        Crée l'enregistrement à partir du fichier reçu et enfile son traitement
+        POST /api/uploads/{id}/finalize/
+        """
+        session = self.get_session(pk)
+        if session.status == 'complete' and session.recording_id:
+            # Finalisation rejouée (réponse perdue): même enregistrement
+            recording = session.recording
+            return Response(RecordingSerializer(recording, context={'request': request}).data)
+        if session.status != 'uploading':
+            return Response({'error': 'Upload abandonné'}, status=status.HTTP_409_CONFLICT)
+        if session.offset != session.upload_length:
+            return tus_response(
+                {'error': f'Upload incomplet: {session.offset}/{session.upload_length} octets'},
+                status.HTTP_409_CONFLICT, session
+            )
+        
+        # En-têtes du fichier reçu: un fichier corrompu est refusé et l'upload abandonné
+        try:
+            probe = probe_audio(uploads.session_path(session))
+        except ProbeError as e:
+            uploads.abort_session(session)
+            return Response({'error': f'Fichier audio illisible: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        sha256 = uploads.catch_up_hasher(session).hexdigest()
+        retained_until, naming_template = self.get_user_defaults()
+        metadata = dict(session.metadata)
+        if metadata.get('retained_until'):
+            retained_until = parse_datetime(metadata['retained_until'])
+        metadata.pop('retained_until', None)
+        
+        with transaction.atomic():
+            # Seule la requête qui fait passer la session à 'complete' crée l'enregistrement
+            claimed = UploadSession.objects.filter(id=session.id, status='uploading').update(
+                status='complete', sha256=sha256
+            )
+            if not claimed:
+                return Response({'error': 'Upload déjà finalisé'}, status=status.HTTP_409_CONFLICT)
+            recording = Recording(
+                user=request.user,
+                retained_until=retained_until,
+                source_sha256=sha256,
+                **metadata
+            )
+            recording.file.name = session.file_name
+            if probe:
+                apply_probe(recording, probe)
+            recording.save()
+            UploadSession.objects.filter(id=session.id).update(recording=recording)
+        
+        uploads.forget_session(session)
+        self.apply_naming_template(recording, naming_template)
+        self.enqueue_new_recording(recording, payload={'source_sha256': sha256})
+        
+        return Response(
+            RecordingSerializer(recording, context={'request': request}).data,
+            status=status.HTTP_201_CREATED
+        )
 
 
 class UserSettingsViewSet(viewsets.ModelViewSet):
@@ -224,9 +847,28 @@ class UserSettingsViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         """Met à jour les settings"""
         settings = self.get_object()
+        previous_threshold = settings.silence_threshold_seconds
         serializer = self.get_serializer(settings, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            # Appliquer le nouveau seuil aux enregistrements existants
+            if settings.silence_threshold_seconds != previous_threshold:
+                reevaluate_silences(request.user.id, settings.silence_threshold_seconds)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+
+def metrics_view(request):
+    """
+    Métriques du pipeline de traitement au format Prometheus
+    GET /api/metrics (en-tête Authorization: Bearer <METRICS_TOKEN>)
+    Sans METRICS_TOKEN, l'endpoint n'est ouvert qu'en développement (DEBUG)
+    """
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        raise Http404("Métriques désactivées (METRICS_TOKEN non défini)")
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponse("Jeton invalide\n", status=401, content_type='text/plain; charset=utf-8')
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,49 @@
+"""
+Points d'entrée des processus du pool de run_workers
+
+Les processus fils sont démarrés en mode 'spawn' (pas de connexion DB héritée) :
+ce module ne doit donc pas importer les modèles au chargement, Django n'étant
+initialisé qu'après par init_worker().
+"""
+import os
+import signal
+import django
+from django.db import close_old_connections
+
+
+def init_worker():
+    """Initialise Django dans le processus fils"""
+    # Ctrl-C est géré par le dispatcher, qui laisse finir les jobs en cours
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_project.settings')
+    django.setup()
+
+
+def worker_process_alive(worker_name):
+    """
+    Vérifie si le processus d'un worker local (nom 'hôte:pid') existe encore
+    Un nom sans pid valide est considéré comme actif (rien n'est repris)
+    """
+    try:
+        pid = int(worker_name.rsplit(':', 1)[1])
+    except (IndexError, ValueError):
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Processus d'un autre utilisateur: il existe
+        return True
+    return True
+
+
+def execute_job(job_id):
+    """Exécute un job dans le processus fils"""
+    from .jobs import run_job
+    # Connexion persistante (CONN_MAX_AGE) du processus: vérifiée entre deux jobs
+    close_old_connections()
+    try:
+        run_job(job_id)
+    finally:
+        close_old_connections()
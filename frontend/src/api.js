@@ -71,8 +71,16 @@ export const refreshToken = async () => {
 /**
  * Récupérer tous les enregistrements
  */
-export const getRecordings = async () => {
-  const response = await api.get('/api/recordings/');
+export const getRecordings = async (params = {}) => {
+  const response = await api.get('/api/recordings/', { params });
+  return response.data;
+};
+
+/**
+ * Récupérer la page suivante/précédente d'une liste (URL `next` / `previous` du curseur)
+ */
+export const getRecordingsPage = async (url) => {
+  const response = await api.get(url);
   return response.data;
 };
 
@@ -84,6 +92,16 @@ export const getRecording = async (id) => {
   return response.data;
 };
 
+/**
+ * Récupérer les pics de forme d'onde (zoom: 1, 10 ou 100 pics par seconde)
+ */
+export const getPeaks = async (id, zoom = 10, params = {}) => {
+  const response = await api.get(`/api/recordings/${id}/peaks/`, {
+    params: { zoom, ...params },
+  });
+  return response.data;
+};
+
 /**
  * Uploader un fichier audio
  */
@@ -104,6 +122,76 @@ export const uploadRecording = async (file, data = {}) => {
   return response.data;
 };
 
+// Taille des morceaux envoyés par l'upload reprenable
+const UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+const UPLOAD_MAX_RETRIES = 5;
+
+const uploadKey = (file) => `upload:${file.name}:${file.size}:${file.lastModified}`;
+
+const wait = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Uploader un fichier par morceaux, avec reprise après coupure réseau
+ * (POST /api/uploads/, PATCH par morceau, HEAD pour reprendre, finalize)
+ * L'upload en cours est mémorisé: le relancer après un rechargement de page
+ * reprend à l'offset déjà reçu par le serveur.
+ */
+export const uploadRecordingResumable = async (file, data = {}, onProgress) => {
+  const key = uploadKey(file);
+  let uploadId = localStorage.getItem(key);
+  let offset = 0;
+
+  if (uploadId) {
+    try {
+      const response = await api.head(`/api/uploads/${uploadId}/`);
+      offset = parseInt(response.headers['upload-offset'], 10) || 0;
+    } catch {
+      uploadId = null;
+    }
+  }
+  if (!uploadId) {
+    const response = await api.post('/api/uploads/', {
+      filename: file.name,
+      upload_length: file.size,
+      ...data,
+    });
+    uploadId = response.data.id;
+    localStorage.setItem(key, uploadId);
+  }
+
+  let retries = 0;
+  while (offset < file.size) {
+    try {
+      const response = await api.patch(
+        `/api/uploads/${uploadId}/`,
+        file.slice(offset, offset + UPLOAD_CHUNK_SIZE),
+        {
+          headers: {
+            'Content-Type': 'application/offset+octet-stream',
+            'Upload-Offset': offset,
+          },
+        }
+      );
+      offset = parseInt(response.headers['upload-offset'], 10);
+      retries = 0;
+      if (onProgress) onProgress(offset / file.size);
+    } catch (error) {
+      if (retries >= UPLOAD_MAX_RETRIES || (error.response && error.response.status < 500 && error.response.status !== 409)) {
+        throw error;
+      }
+      retries += 1;
+      await wait(1000 * 2 ** retries);
+      // Reprendre à l'offset réellement reçu par le serveur
+      const status = await api.head(`/api/uploads/${uploadId}/`);
+      offset = parseInt(status.headers['upload-offset'], 10) || 0;
+    }
+  }
+
+  const response = await api.post(`/api/uploads/${uploadId}/finalize/`);
+  localStorage.removeItem(key);
+  return response.data;
+};
+
 /**
  * Découper un enregistrement (trim)
  */
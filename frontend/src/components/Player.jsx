@@ -1,3 +1,5 @@
+import Waveform from './Waveform';
+
 /**
  * Composant pour afficher et lire un enregistrement (audio ou vidéo)
  * Affiche les informations de l'enregistrement et un lecteur média
@@ -38,7 +40,10 @@ export default function Player({ recording, onDelete }) {
           </button>
         )}
       </div>
-      <div className="mt-3">
+      <div className="mt-3 space-y-2">
+        {isAudio && (
+          <Waveform recordingId={recording.id} duration={recording.duration_seconds} height={48} />
+        )}
         {isAudio ? (
           <audio controls className="w-full">
             <source src={fileUrl} type="audio/webm" />
@@ -1,6 +1,7 @@
 import { useState } from 'react';
+import Waveform from './Waveform';
 
-export default function TrimModal({ duration, onClose, onTrim }) {
+export default function TrimModal({ recordingId, duration, onClose, onTrim }) {
   const [startTime, setStartTime] = useState(0);
   const [endTime, setEndTime] = useState(duration || 0);
 
@@ -19,6 +20,15 @@ export default function TrimModal({ duration, onClose, onTrim }) {
         <h2 className="text-xl font-bold text-white mb-4">Découper l'enregistrement</h2>
         
         <form onSubmit={handleSubmit} className="space-y-4">
+          {recordingId && (
+            <Waveform
+              recordingId={recordingId}
+              duration={duration}
+              selection={{ start: startTime, end: endTime }}
+              height={64}
+            />
+          )}
+
           <div>
             <label className="block text-sm font-medium text-slate-300 mb-2">
               Temps de début (secondes)
@@ -0,0 +1,127 @@
+import { useEffect, useRef, useState } from 'react';
+import { getPeaks } from '../api';
+
+// Résolutions disponibles côté API (pics par seconde)
+const ZOOM_LEVELS = [1, 10, 100];
+
+/**
+ * Choisit la résolution la plus grossière donnant au moins un pic par pixel
+ */
+function pickZoom(duration, width) {
+  if (!duration) return 10;
+  return ZOOM_LEVELS.find((zoom) => duration * zoom >= width) || ZOOM_LEVELS[ZOOM_LEVELS.length - 1];
+}
+
+/**
+ * Forme d'onde d'un enregistrement dessinée à partir des pics précalculés
+ * (quelques kilo-octets au lieu du fichier audio)
+ *
+ * - selection: { start, end } en secondes, zone mise en évidence (découpage)
+ * - currentTime: position de lecture
+ * - onSeek: appelé avec le temps cliqué
+ */
+export default function Waveform({ recordingId, duration, selection, currentTime, onSeek, height = 80 }) {
+  const containerRef = useRef(null);
+  const canvasRef = useRef(null);
+  const [width, setWidth] = useState(0);
+  const [data, setData] = useState(null);
+  const [error, setError] = useState(false);
+
+  // Largeur disponible
+  useEffect(() => {
+    const container = containerRef.current;
+    if (!container) return;
+    const observer = new ResizeObserver(([entry]) => setWidth(Math.floor(entry.contentRect.width)));
+    observer.observe(container);
+    return () => observer.disconnect();
+  }, []);
+
+  const zoom = pickZoom(duration, width);
+  const measured = width > 0;
+
+  // Chargement des pics (rechargés si la durée change, ex. après un découpage)
+  useEffect(() => {
+    if (!recordingId || !measured) return;
+    let cancelled = false;
+    getPeaks(recordingId, zoom)
+      .then((peaks) => {
+        if (!cancelled) {
+          setData(peaks);
+          setError(false);
+        }
+      })
+      .catch(() => {
+        if (!cancelled) setError(true);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [recordingId, zoom, duration, measured]);
+
+  // Dessin
+  useEffect(() => {
+    const canvas = canvasRef.current;
+    if (!canvas || !data || !width) return;
+    const ratio = window.devicePixelRatio || 1;
+    canvas.width = width * ratio;
+    canvas.height = height * ratio;
+    const ctx = canvas.getContext('2d');
+    ctx.scale(ratio, ratio);
+    ctx.clearRect(0, 0, width, height);
+
+    const peaks = data.peaks;
+    const count = peaks.length / 2;
+    const total = duration || count / data.zoom;
+    const middle = height / 2;
+    const toX = (seconds) => (total ? (seconds / total) * width : 0);
+
+    if (selection) {
+      ctx.fillStyle = 'rgba(99, 102, 241, 0.25)';
+      ctx.fillRect(toX(selection.start), 0, toX(selection.end) - toX(selection.start), height);
+    }
+
+    // Un trait vertical par pixel: min/max des pics couverts par la colonne
+    ctx.fillStyle = '#818cf8';
+    const perPixel = count / width;
+    for (let x = 0; x < width; x++) {
+      const first = Math.floor(x * perPixel);
+      const last = Math.max(first + 1, Math.floor((x + 1) * perPixel));
+      let min = 127;
+      let max = -128;
+      for (let i = first; i < last && i < count; i++) {
+        min = Math.min(min, peaks[2 * i]);
+        max = Math.max(max, peaks[2 * i + 1]);
+      }
+      if (min > max) continue;
+      const top = middle - (max / 128) * middle;
+      const bottom = middle - (min / 128) * middle;
+      ctx.fillRect(x, top, 1, Math.max(1, bottom - top));
+    }
+
+    if (currentTime != null) {
+      ctx.fillStyle = '#f8fafc';
+      ctx.fillRect(toX(currentTime), 0, 1, height);
+    }
+  }, [data, width, height, duration, selection, currentTime]);
+
+  const handleClick = (e) => {
+    if (!onSeek || !duration) return;
+    const rect = e.currentTarget.getBoundingClientRect();
+    onSeek(((e.clientX - rect.left) / rect.width) * duration);
+  };
+
+  return (
+    <div ref={containerRef} className="w-full">
+      {error ? (
+        <div className="text-xs text-slate-500 text-center py-2">Forme d'onde non disponible</div>
+      ) : (
+        <canvas
+          ref={canvasRef}
+          onClick={handleClick}
+          style={{ width: '100%', height }}
+          className={onSeek ? 'cursor-pointer' : ''}
+        />
+      )}
+    </div>
+  );
+}
@@ -1,7 +1,8 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
 import { getRecording, processRecording, trimRecording, downloadRecording } from '../api';
 import TrimModal from '../components/TrimModal';
+import Waveform from '../components/Waveform';
 
 export default function RecordingDetail() {
   const { id } = useParams();
@@ -9,6 +10,8 @@ export default function RecordingDetail() {
   const [recording, setRecording] = useState(null);
   const [loading, setLoading] = useState(true);
   const [showTrimModal, setShowTrimModal] = useState(false);
+  const [currentTime, setCurrentTime] = useState(0);
+  const audioRef = useRef(null);
   const [processing, setProcessing] = useState(false);
 
   useEffect(() => {
@@ -134,8 +137,21 @@ export default function RecordingDetail() {
           {/* Audio Player */}
           <div className="p-6 border-b border-slate-700">
             <h2 className="text-lg font-semibold text-white mb-4">Lecteur audio</h2>
-            <div className="bg-slate-900/50 p-4 rounded-lg">
-              <audio controls className="w-full">
+            <div className="bg-slate-900/50 p-4 rounded-lg space-y-3">
+              <Waveform
+                recordingId={recording.id}
+                duration={recording.duration_seconds}
+                currentTime={currentTime}
+                onSeek={(time) => {
+                  if (audioRef.current) audioRef.current.currentTime = time;
+                }}
+              />
+              <audio
+                ref={audioRef}
+                controls
+                className="w-full"
+                onTimeUpdate={(e) => setCurrentTime(e.currentTarget.currentTime)}
+              >
                 <source src={fileUrl} type={`audio/${recording.format}`} />
                 Votre navigateur ne supporte pas l'élément audio.
               </audio>
@@ -229,6 +245,16 @@ export default function RecordingDetail() {
                 <span className="text-slate-400">Format:</span>
                 <span className="text-white font-medium">{recording.format?.toUpperCase()}</span>
               </div>
+              {recording.codec && (
+                <div className="flex justify-between">
+                  <span className="text-slate-400">Audio:</span>
+                  <span className="text-white font-medium">
+                    {recording.codec} · {(recording.sample_rate / 1000).toLocaleString('fr-FR')} kHz
+                    {recording.channels && ` · ${recording.channels === 1 ? 'mono' : recording.channels === 2 ? 'stéréo' : `${recording.channels} canaux`}`}
+                    {recording.bit_rate && ` · ${Math.round(recording.bit_rate / 1000)} kb/s`}
+                  </span>
+                </div>
+              )}
               <div className="flex justify-between">
                 <span className="text-slate-400">Taille:</span>
                 <span className="text-white font-medium">{formatFileSize(recording.file_size)}</span>
@@ -250,6 +276,7 @@ export default function RecordingDetail() {
         {/* Trim Modal */}
         {showTrimModal && (
           <TrimModal
+            recordingId={recording.id}
             duration={recording.duration_seconds}
             onClose={() => setShowTrimModal(false)}
             onTrim={handleTrim}
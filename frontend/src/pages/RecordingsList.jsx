@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import { getRecordings, deleteRecording } from '../api';
+import { getRecordings, getRecordingsPage, deleteRecording } from '../api';
 
 export default function RecordingsList() {
   const [recordings, setRecordings] = useState([]);
@@ -8,16 +8,20 @@ export default function RecordingsList() {
   const [error, setError] = useState('');
   const [filter, setFilter] = useState('all');
   const [searchTerm, setSearchTerm] = useState('');
+  const [nextPage, setNextPage] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadRecordings();
-  }, []);
+  }, [filter]);
 
   const loadRecordings = async () => {
     try {
       setLoading(true);
-      const data = await getRecordings();
+      // Filtre par type appliqué côté serveur
+      const data = await getRecordings(filter === 'all' ? {} : { type: filter });
       setRecordings(data.results || data);
+      setNextPage(data.next || null);
     } catch (err) {
       setError('Erreur lors du chargement des enregistrements');
       console.error(err);
@@ -26,6 +30,20 @@ export default function RecordingsList() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextPage) return;
+    try {
+      setLoadingMore(true);
+      const data = await getRecordingsPage(nextPage);
+      setRecordings((current) => [...current, ...data.results]);
+      setNextPage(data.next || null);
+    } catch (err) {
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDelete = async (id) => {
     if (!window.confirm('Êtes-vous sûr de vouloir supprimer cet enregistrement ?')) {
       return;
@@ -45,9 +63,7 @@ export default function RecordingsList() {
   };
 
   const filteredRecordings = recordings.filter(r => {
-    const matchesFilter = filter === 'all' || r.type === filter;
-    const matchesSearch = !searchTerm || r.title?.toLowerCase().includes(searchTerm.toLowerCase());
-    return matchesFilter && matchesSearch;
+    return !searchTerm || r.title?.toLowerCase().includes(searchTerm.toLowerCase());
   });
 
   if (loading) {
@@ -187,6 +203,18 @@ export default function RecordingsList() {
           </div>
         )}
 
+        {nextPage && (
+          <div className="mt-8 text-center">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-6 py-3 bg-slate-700 hover:bg-slate-600 disabled:opacity-50 rounded-lg text-white font-medium transition-colors"
+            >
+              {loadingMore ? 'Chargement...' : 'Charger plus'}
+            </button>
+          </div>
+        )}
+
         {/* Stats */}
         {recordings.length > 0 && (
           <div className="mt-12 p-6 bg-slate-800/50 backdrop-blur border border-slate-700 rounded-xl">
@@ -14,6 +14,8 @@ export default function Settings() {
     naming_template: '{type}-{date}-{time}',
     vad_sensitivity: 2,
     silence_threshold_seconds: 5.0,
+    energy_prefilter_enabled: false,
+    energy_floor_dbfs: -60,
     email_alerts_enabled: false,
     email_host: '',
     email_port: 587,
@@ -319,6 +321,34 @@ export default function Settings() {
                   <p className="text-xs text-slate-400 mt-2">Durée minimale pour signaler une anomalie</p>
                 </div>
               </div>
+
+              <div className="bg-slate-700/50 p-4 rounded-lg">
+                <label className="flex items-center gap-3 cursor-pointer">
+                  <input
+                    type="checkbox"
+                    checked={settings.energy_prefilter_enabled}
+                    onChange={(e) => handleChange('energy_prefilter_enabled', e.target.checked)}
+                    className="w-5 h-5 rounded bg-slate-900 border border-slate-600 cursor-pointer"
+                  />
+                  <span className="text-white font-medium">Pré-filtre d'énergie (ignorer les silences évidents)</span>
+                </label>
+              </div>
+
+              {settings.energy_prefilter_enabled && (
+                <div>
+                  <label className="block text-sm font-semibold text-white mb-3">
+                    Plancher de bruit (dBFS)
+                  </label>
+                  <input
+                    type="number"
+                    step="1"
+                    value={settings.energy_floor_dbfs}
+                    onChange={(e) => handleChange('energy_floor_dbfs', parseFloat(e.target.value))}
+                    className="w-full px-4 py-3 rounded-lg bg-slate-900 border border-slate-700 text-white focus:outline-none focus:ring-2 focus:ring-indigo-500"
+                  />
+                  <p className="text-xs text-slate-400 mt-2">Les trames sous ce niveau sont marquées silence sans passer par le VAD</p>
+                </div>
+              )}
             </div>
           )}
 
@@ -24,7 +24,7 @@ export default function SilenceDetection() {
         getRecordings(),
         getSettings(),
       ]);
-      setRecordings((recordingsData.results || recordingsData).filter(r => r.flagged || r.vad_report));
+      setRecordings((recordingsData.results || recordingsData).filter(r => r.flagged || r.silence_percentage !== null));
       setSettings({
         vad_sensitivity: settingsData.vad_sensitivity || 2,
         silence_threshold_seconds: settingsData.silence_threshold_seconds || 5.0,
@@ -193,15 +193,15 @@ export default function SilenceDetection() {
                             <span>{new Date(recording.created_at).toLocaleDateString('fr-FR')}</span>
                           </div>
 
-                          {recording.vad_report && (
+                          {recording.silence_percentage !== null && (
                             <div className="bg-slate-900/50 p-3 rounded text-xs space-y-1">
                               <div className="flex justify-between text-slate-300">
                                 <span>Silence détecté:</span>
-                                <span className="text-yellow-400 font-semibold">{recording.vad_report.silence_percentage}%</span>
+                                <span className="text-yellow-400 font-semibold">{recording.silence_percentage}%</span>
                               </div>
-                              {recording.vad_report.unnatural_silences && recording.vad_report.unnatural_silences.length > 0 && (
+                              {recording.unnatural_silence_count > 0 && (
                                 <div className="text-red-400 font-semibold">
-                                  {recording.vad_report.unnatural_silences.length} anomalie(s) détectée(s)
+                                  {recording.unnatural_silence_count} anomalie(s) détectée(s)
                                 </div>
                               )}
                             </div>
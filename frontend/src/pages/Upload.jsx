@@ -1,6 +1,6 @@
 import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { uploadRecording } from '../api';
+import { uploadRecordingResumable } from '../api';
 
 export default function Upload() {
   const [file, setFile] = useState(null);
@@ -9,6 +9,7 @@ export default function Upload() {
   const [format, setFormat] = useState('mp3');
   const [error, setError] = useState('');
   const [uploading, setUploading] = useState(false);
+  const [progress, setProgress] = useState(0);
   const [dragActive, setDragActive] = useState(false);
   const navigate = useNavigate();
 
@@ -61,16 +62,18 @@ export default function Upload() {
 
     setError('');
     setUploading(true);
+    setProgress(0);
 
     try {
-      await uploadRecording(file, {
+      await uploadRecordingResumable(file, {
         title: title || file.name,
         type: recordingType,
         format,
-      });
+      }, setProgress);
       navigate('/recordings');
     } catch (err) {
-      setError(err.response?.data?.detail || 'Erreur lors de l\'upload');
+      const data = err.response?.data;
+      setError(data?.detail || data?.error || data?.filename?.[0] || 'Erreur lors de l\'upload');
     } finally {
       setUploading(false);
     }
@@ -215,7 +218,7 @@ export default function Upload() {
             {uploading ? (
               <div className="flex items-center justify-center gap-2">
                 <div className="w-5 h-5 border-2 border-white border-t-transparent rounded-full animate-spin"></div>
-                Upload en cours...
+                Upload en cours... {Math.round(progress * 100)}%
               </div>
             ) : (
               '📤 Uploader'